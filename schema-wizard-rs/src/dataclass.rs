@@ -344,11 +344,12 @@ pub fn parse_dataclass(name: &str, typ: &schema::Type) -> (HashMap<String, Datac
 pub struct SchemaPrinter {
     lines: Vec<String>,
     level: usize,
+    slots: bool,
 }
 
 impl SchemaPrinter {
-    pub fn print(defs: &Defs, main: &Dataclass) -> String {
-        let mut printer = SchemaPrinter { lines: vec![], level: 0 };
+    pub fn print(defs: &Defs, main: &Dataclass, slots: bool) -> String {
+        let mut printer = SchemaPrinter { lines: vec![], level: 0, slots };
 
         // header
         printer.add_line("from dataclasses import dataclass, field".into());
@@ -356,6 +357,17 @@ impl SchemaPrinter {
         printer.add_line("from enum import Enum".into());
         printer.add_line("from typing import *".into());
         printer.add_line("from dataclass_wizard import JSONWizard, json_field  # type: ignore".into());
+        if slots {
+            printer.add_line("from dataclass_wizard.class_helper import call_meta_initializer_if_needed  # type: ignore".into());
+            printer.add_line("def slotted_dataclass(cls):".into());
+            printer.level += 1;
+            printer.add_line("# dataclass(slots=True) builds a new class and only gives it the right".into());
+            printer.add_line("# __qualname__ afterwards, so the Meta of nested classes is bound again here.".into());
+            printer.add_line("cls = dataclass(slots=True)(cls)".into());
+            printer.add_line("call_meta_initializer_if_needed(cls)".into());
+            printer.add_line("return cls".into());
+            printer.level -= 1;
+        }
 
         // sort the definitions
         let order = DefsSorter::compute_order(defs);
@@ -380,7 +392,11 @@ impl SchemaPrinter {
     }
 
     fn run_dataclass(&mut self, dataclass: &Dataclass) {
-        self.add_line(format!("@dataclass"));
+        if self.slots {
+            self.add_line(format!("@slotted_dataclass"));
+        } else {
+            self.add_line(format!("@dataclass"));
+        }
         self.add_line(format!("class {}(JSONWizard):", dataclass.name));
         self.level += 1;
 
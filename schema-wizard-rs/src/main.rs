@@ -10,6 +10,10 @@ pub struct Args {
 
     #[clap(short = 'o', long, value_name = "output")]
     pub output: Option<std::path::PathBuf>,
+
+    /// Generate slotted dataclasses, which take much less memory per instance
+    #[clap(long)]
+    pub slots: bool,
 }
 
 fn get_reader(input: &Option<std::path::PathBuf>) -> Box<dyn std::io::Read> {
@@ -35,6 +39,6 @@ fn main() {
 
     let top: schema::TopLevel = serde_json::from_str(&input).unwrap();
     let (defs, dc) = dataclass::parse_top("top", &top);
-    let s = dataclass::SchemaPrinter::print(&defs, &dc);
+    let s = dataclass::SchemaPrinter::print(&defs, &dc, args.slots);
     write!(outfile, "{}", s).unwrap();
 }
@@ -0,0 +1,368 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Iterable, Optional
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+
+# Extensions used when writing converted files, keyed by music21 format name.
+# "pickle" is music21's own serialized format, which converter.thaw reads back.
+outputExtensions: dict[str, str] = {
+    "musicxml": ".musicxml",
+    "midi": ".mid",
+    "pickle": ".p",
+}
+
+# Stands for stdin as an input path, and for stdout as an output path.
+stdio = "-"
+
+
+@dataclass
+class ConversionResult:
+    path: str
+    ok: bool
+    seconds: float
+    # Number of pitched notes in the result, counting each note of a chord.
+    notes: int = 0
+    outputPath: Optional[str] = None
+    # Whether the score came out of the cache instead of being converted.
+    cached: bool = False
+    # Only set when the conversion failed.
+    errorType: Optional[str] = None
+    errorMessage: Optional[str] = None
+    errorTraceback: Optional[str] = None
+
+
+@dataclass
+class BatchReport:
+    # In the same order as the input files, regardless of scheduling.
+    results: list[ConversionResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failures(self) -> list[ConversionResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def notes(self) -> int:
+        return sum(r.notes for r in self.results)
+
+    @property
+    def filesPerSecond(self) -> float:
+        return len(self.results) / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def notesPerSecond(self) -> float:
+        return self.notes / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "files": len(self.results),
+            "failures": len(self.failures),
+            "notes": self.notes,
+            "cacheHits": sum(r.cached for r in self.results),
+            "seconds": self.seconds,
+            "filesPerSecond": self.filesPerSecond,
+            "notesPerSecond": self.notesPerSecond,
+        }
+
+    def toDict(self) -> dict:
+        return {
+            "summary": self.summary(),
+            "results": [asdict(r) for r in self.results],
+        }
+
+
+def findInputs(paths: Iterable[str]) -> list[tuple[str, Optional[str]]]:
+    # Directories are searched recursively for .json files.
+    # The order is made deterministic by sorting the files of each directory.
+    # Each file comes with the directory it was found in from paths,
+    # or None if it was given itself.
+    found: list[tuple[str, Optional[str]]] = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append((path, None))
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.endswith(".json"):
+                    found.append((os.path.join(root, filename), path))
+    return found
+
+
+def outputPathFor(
+    path: str, root: Optional[str], outputDir: str, outputFormat: str
+) -> str:
+    # Files found in a directory keep their place below it, so that files
+    # of the same name in different subdirectories do not overwrite each other.
+    if path == stdio:
+        name = "stdin"
+    elif root is not None:
+        name = os.path.relpath(path, root)
+    else:
+        name = os.path.basename(path)
+    stem = os.path.splitext(name)[0]
+    return os.path.join(outputDir, stem + outputExtensions[outputFormat])
+
+
+def countNotes(sc) -> int:
+    return sum(len(n.pitches) for n in sc.recurse().notes)
+
+
+def formatFromPath(path: str) -> Optional[str]:
+    for outputFormat, extension in outputExtensions.items():
+        if path.endswith(extension):
+            return outputFormat
+    return None
+
+
+def scoreBytes(sc, outputFormat: str) -> bytes:
+    # music21 only writes to files, so the result goes through a temporary one.
+    with tempfile.TemporaryDirectory() as directory:
+        tmp = os.path.join(directory, "score" + outputExtensions[outputFormat])
+        writeScore(sc, outputFormat, tmp)
+        with open(tmp, "rb") as f:
+            return f.read()
+
+
+def writeScore(sc, outputFormat: str, path: str) -> None:
+    from music21 import converter
+
+    if path == stdio:
+        sys.stdout.buffer.write(scoreBytes(sc, outputFormat))
+        sys.stdout.buffer.flush()
+    elif outputFormat == "pickle":
+        converter.freeze(sc, fmt="pickle", fp=path)
+    else:
+        sc.write(outputFormat, fp=path)
+
+
+def convertFile(
+    path: str,
+    outputDir: Optional[str] = None,
+    outputFormat: str = "musicxml",
+    cacheDir: Optional[str] = None,
+    cacheBytes: int = 1 << 30,
+    outputPath: Optional[str] = None,
+) -> ConversionResult:
+    # Never raises: any failure is recorded in the result instead.
+    # The input path and outputPath may be stdio, outputPath overrides outputDir.
+
+    # music21 is only imported once there is something to convert,
+    # so that e.g. --help does not wait for it. It is not part of the timing.
+    from music21 import converter
+    import convert  # registers MNXConverter with music21
+    from scorecache import ScoreCache
+
+    start = time.perf_counter()
+    cached = False
+    try:
+        source = sys.stdin.read() if path == stdio else path
+        if cacheDir is not None:
+            cache = ScoreCache(cacheDir, cacheBytes)
+            sc = cache.parse(source)
+            cached = cache.hits > 0
+        else:
+            if path != stdio:
+                with open(path, "r") as f:
+                    source = f.read()
+            sc = converter.parse(source, format="mnx")
+        if outputPath is None and outputDir is not None:
+            outputPath = outputPathFor(path, None, outputDir, outputFormat)
+        if outputPath is not None:
+            writeScore(sc, outputFormat, outputPath)
+        return ConversionResult(
+            path=path,
+            ok=True,
+            seconds=time.perf_counter() - start,
+            notes=countNotes(sc),
+            outputPath=outputPath,
+            cached=cached,
+        )
+    except Exception as ex:
+        return ConversionResult(
+            path=path,
+            ok=False,
+            seconds=time.perf_counter() - start,
+            errorType=type(ex).__name__,
+            errorMessage=str(ex),
+            errorTraceback=traceback.format_exc(),
+        )
+
+
+def convertAll(
+    paths: Iterable[str],
+    jobs: Optional[int] = None,
+    outputDir: Optional[str] = None,
+    outputFormat: str = "musicxml",
+    cacheDir: Optional[str] = None,
+    cacheBytes: int = 1 << 30,
+    outputPath: Optional[str] = None,
+    progress: Optional[Callable[[ConversionResult], None]] = None,
+) -> BatchReport:
+    """
+    Convert every MNX file in paths (files or directories) over a pool of jobs processes.
+    jobs=None uses one process per CPU and jobs=1 converts in this process, as does
+    a single file. With a cacheDir, converted scores are kept in a ScoreCache shared
+    by all processes. A single file can be written to outputPath instead of outputDir,
+    and stdio stands for stdin as an input and for stdout as outputPath.
+    progress is called with each result as soon as it and those before it are done.
+    """
+    options = (outputDir, outputFormat, cacheDir, cacheBytes)
+    paths = list(paths)
+    found = [(stdio, None)] if paths == [stdio] else findInputs(paths)
+    inputs = [path for path, _ in found]
+    if outputPath is not None and len(inputs) != 1:
+        raise ValueError("An output path can only be given for a single input.")
+    outputPaths = [outputPath] * len(inputs)
+    if outputPath is None and outputDir is not None:
+        # Checked before converting anything, since two inputs written
+        # to the same file would leave only one of them.
+        outputPaths = [outputPathFor(p, r, outputDir, outputFormat) for p, r in found]
+        seen: dict[str, str] = {}
+        for path, out in zip(inputs, outputPaths):
+            other = seen.setdefault(os.path.normcase(os.path.abspath(out)), path)
+            if other != path:
+                raise ValueError(f"{other} and {path} would both be written to {out}.")
+        for directory in sorted({os.path.dirname(out) for out in outputPaths}):
+            os.makedirs(directory, exist_ok=True)
+    elif outputDir is not None:
+        os.makedirs(outputDir, exist_ok=True)
+
+    start = time.perf_counter()
+    results: list[Optional[ConversionResult]] = [None] * len(inputs)
+    if jobs == 1 or len(inputs) == 1:
+        for i, path in enumerate(inputs):
+            results[i] = convertFile(path, *options, outputPaths[i])
+            if progress is not None:
+                progress(results[i])
+    else:
+        # Largest files are submitted first so that a big file picked up
+        # at the very end does not leave every other worker idle.
+        def size(i: int) -> int:
+            try:
+                return os.path.getsize(inputs[i])
+            except OSError:
+                return 0
+
+        order = sorted(range(len(inputs)), key=size, reverse=True)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {
+                i: pool.submit(convertFile, inputs[i], *options, outputPaths[i])
+                for i in order
+            }
+            for i in range(len(inputs)):
+                try:
+                    results[i] = futures[i].result()
+                except BrokenProcessPool as ex:
+                    # A worker died (e.g. killed for running out of memory), which
+                    # fails every file the pool still had, not just its own.
+                    results[i] = ConversionResult(
+                        path=inputs[i],
+                        ok=False,
+                        seconds=0.0,
+                        errorType=type(ex).__name__,
+                        errorMessage=str(ex),
+                    )
+                if progress is not None:
+                    progress(results[i])
+
+    return BatchReport(
+        results=[r for r in results if r is not None],
+        seconds=time.perf_counter() - start,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Convert MNX files or directories of MNX files in parallel."
+    )
+    parser.add_argument(
+        "paths", nargs="+", help=f"MNX files or directories, or {stdio} for stdin"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="worker processes (default: CPUs)"
+    )
+    parser.add_argument("-o", "--output-dir", default=None)
+    parser.add_argument(
+        "--output",
+        default=None,
+        help=f"output file for a single input, or {stdio} for stdout "
+        "(the default for stdin)",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        default=None,
+        choices=sorted(outputExtensions),
+        help="output format (default: from --output, or musicxml)",
+    )
+    parser.add_argument(
+        "--cache", default=None, help="directory to keep converted scores in"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=1024, help="cache size limit in MB"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="print the full report as JSON"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="only report failures and totals"
+    )
+    args = parser.parse_args(argv)
+    if stdio in args.paths and len(args.paths) > 1:
+        parser.error(f"{stdio} (stdin) cannot be combined with other inputs")
+
+    if args.paths == [stdio] and args.output is None and args.output_dir is None:
+        args.output = stdio
+    if args.format is None:
+        args.format = args.output and formatFromPath(args.output) or "musicxml"
+    # With the score on stdout, everything else goes to stderr.
+    out = sys.stderr if args.output == stdio else sys.stdout
+
+    def progress(r: ConversionResult) -> None:
+        if not r.ok:
+            print(f"{r.path}: {r.errorType}: {r.errorMessage}", file=sys.stderr)
+        elif not args.quiet and not args.json:
+            written = f" -> {r.outputPath}" if r.outputPath not in (None, stdio) else ""
+            cached = " (cached)" if r.cached else ""
+            print(
+                f"{r.path}: {r.seconds * 1000:.0f} ms{cached}, {r.notes} notes{written}",
+                file=out,
+            )
+
+    try:
+        report = convertAll(
+            args.paths,
+            args.jobs,
+            args.output_dir,
+            args.format,
+            args.cache,
+            args.cache_size << 20,
+            args.output,
+            progress,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if args.json:
+        print(json.dumps(report.toDict(), indent=2), file=out)
+    else:
+        s = report.summary()
+        print(
+            f"{s['files']} files ({s['failures']} failed, {s['cacheHits']} cached), "
+            f"{s['notes']} notes "
+            f"in {s['seconds']:.2f}s: "
+            f"{s['filesPerSecond']:.1f} files/s, {s['notesPerSecond']:.0f} notes/s",
+            file=out,
+        )
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
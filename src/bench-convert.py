@@ -0,0 +1,237 @@
+# Times each stage of a conversion separately, over the examples and over
+# scaled-up copies of them:
+#   decode     JSON text to dicts (json.loads)
+#   construct  dicts to mnx.Top (mnx.decoders, falling back to the dataclass wizard)
+#   build      mnx.Top to music21 objects (MNXConverter.buildScore)
+#   link       ties, slurs and beams (MNXConverter.linkAll)
+#   export     music21 to MusicXML, in memory
+#
+# Usage (from src/):
+#   python3 bench-convert.py [files or directories...] --scale 1 --scale 16 --json out.json
+#   python3 bench-convert.py --json new.json --baseline old.json
+#
+# Writing the results of two revisions with --json and passing one of them as
+# --baseline when running the other prints the change of every stage.
+
+from typing import Any, Optional
+import argparse
+import copy
+import datetime
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from music21.musicxml.m21ToXml import GeneralObjectExporter
+import music21
+import convert
+import mnx.decoders
+
+from batch import findInputs
+
+stages = ["decode", "construct", "build", "link", "export"]
+
+
+def scaleDocument(d: dict, times: int) -> dict:
+    """
+    Repeats the measures of every part (and of global) the given number of times.
+    Ids are suffixed in each copy, along with every reference to them.
+    """
+    if times == 1:
+        return d
+    ids: set[str] = set()
+
+    def collectIds(o: Any) -> None:
+        if isinstance(o, dict):
+            for k, v in o.items():
+                if k == "id" and isinstance(v, str):
+                    ids.add(v)
+                collectIds(v)
+        elif isinstance(o, list):
+            for e in o:
+                collectIds(e)
+
+    def renamed(o: Any, suffix: str) -> Any:
+        if isinstance(o, dict):
+            return {k: renamed(v, suffix) for k, v in o.items()}
+        if isinstance(o, list):
+            return [renamed(e, suffix) for e in o]
+        if isinstance(o, str) and o in ids:
+            return o + suffix
+        return o
+
+    collectIds(d)
+    out = copy.deepcopy(d)
+    measures = d["global"]["measures"]
+    out["global"]["measures"] = measures * times
+    for inPart, outPart in zip(d["parts"], out["parts"]):
+        outPart["measures"] = [
+            renamed(m, f"-{i}" if i else "")
+            for i in range(times)
+            for m in inPart["measures"]
+        ]
+    return out
+
+
+def countEvents(o: Any) -> int:
+    if isinstance(o, dict):
+        return (o.get("type") == "event") + sum(countEvents(v) for v in o.values())
+    if isinstance(o, list):
+        return sum(countEvents(e) for e in o)
+    return 0
+
+
+def runOnce(s: str, export: bool) -> dict[str, float]:
+    times: dict[str, float] = {}
+    start = time.perf_counter()
+
+    def lap(stage: str) -> None:
+        nonlocal start
+        now = time.perf_counter()
+        times[stage] = now - start
+        start = now
+
+    d = json.loads(s)
+    lap("decode")
+    top = mnx.decoders.topFromDict(d)
+    lap("construct")
+    conv = convert.MNXConverter()
+    sc = conv.buildScore(top)
+    lap("build")
+    conv.linkAll()
+    lap("link")
+    if export:
+        GeneralObjectExporter(sc).parse()
+        lap("export")
+    return times
+
+
+def benchmark(path: str, scale: int, repeat: int, export: bool) -> dict:
+    with open(path, "r") as f:
+        d = scaleDocument(json.load(f), scale)
+    s = json.dumps(d)
+    result: dict[str, Any] = {
+        "file": path,
+        "scale": scale,
+        "bytes": len(s),
+        "events": countEvents(d),
+    }
+    runs: list[dict[str, float]] = []
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            runs.append(runOnce(s, export))
+    except Exception as ex:
+        result["error"] = f"{type(ex).__name__}: {ex}"
+        return result
+
+    # The minimum is the most stable number to compare; the median shows the noise.
+    result["stages"] = {
+        stage: {
+            "min": min(r[stage] for r in runs),
+            "median": statistics.median(r[stage] for r in runs),
+        }
+        for stage in stages
+        if stage in runs[0]
+    }
+    result["total"] = min(sum(r.values()) for r in runs)
+    return result
+
+
+def gitRevision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def printResults(results: list[dict], baseline: Optional[dict]) -> None:
+    old = {}
+    if baseline is not None:
+        old = {(r["file"], r["scale"]): r for r in baseline["results"]}
+    header = "".join(f"{stage:>11}" for stage in stages)
+    print(f"{'file':<48}{'scale':>6}{'events':>8}{header}{'total':>11}  (ms)")
+    for r in results:
+        name = r["file"].rsplit("/", 1)[-1]
+        line = f"{name:<48}{r['scale']:>6}{r['events']:>8}"
+        if "error" in r:
+            print(f"{line}  {r['error']}")
+            continue
+        for stage in stages:
+            t = r["stages"].get(stage)
+            line += f"{t['min'] * 1000:>11.2f}" if t else f"{'-':>11}"
+        line += f"{r['total'] * 1000:>11.2f}"
+        print(line)
+
+        prev = old.get((r["file"], r["scale"]))
+        if prev is not None and "error" not in prev:
+            change = ""
+            for stage in stages:
+                t, p = r["stages"].get(stage), prev["stages"].get(stage)
+                change += (
+                    f"{t['min'] / p['min'] - 1:>+11.0%}"
+                    if t and p and p["min"] > 0
+                    else f"{'-':>11}"
+                )
+            change += f"{r['total'] / prev['total'] - 1:>+11.0%}"
+            print(f"{'  vs baseline':<62}{change}")
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Time each stage of MNX to music21 conversion."
+    )
+    parser.add_argument("paths", nargs="*", default=["../examples"])
+    parser.add_argument(
+        "--scale",
+        type=int,
+        action="append",
+        help="repeat the measures of each file this many times (can be given more than once)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="runs per file")
+    parser.add_argument("--no-export", action="store_true")
+    parser.add_argument("--json", default=None, help="write the results to this file")
+    parser.add_argument(
+        "--baseline", default=None, help="results of another run to compare with"
+    )
+    args = parser.parse_args(argv)
+
+    # The converter warns about what it cannot convert on every run.
+    logging.getLogger(convert.__name__).setLevel(logging.ERROR)
+
+    results = [
+        benchmark(path, scale, args.repeat, not args.no_export)
+        for path, _ in findInputs(args.paths)
+        for scale in args.scale or [1]
+    ]
+
+    baseline = None
+    if args.baseline is not None:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    printResults(results, baseline)
+
+    if args.json is not None:
+        report = {
+            "revision": gitRevision(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "music21": music21.__version__,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
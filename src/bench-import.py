@@ -0,0 +1,104 @@
+# Times the imports a short run of the tools pays for, each in a fresh interpreter,
+# and checks that the modules that convert nothing do not import music21.
+#
+#   startup    the interpreter alone
+#   import     the statement itself, as timed inside the interpreter
+#
+# Exits with 1 if any of the modules expected to leave music21 alone imported it.
+#
+# Usage (from src/):
+#   python3 bench-import.py [--repeat N] [--json out.json]
+
+from typing import Any, Optional
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+helloWorld = "../examples/example_hello_world.json"
+
+# (name, statement, whether it may import music21)
+targets: list[tuple[str, str, bool]] = [
+    ("mnx", "import mnx", False),
+    ("mnx.decoders", "import mnx.decoders", False),
+    ("mnxdocument", "import mnxdocument", False),
+    ("metadata", "import metadata", False),
+    ("batch", "import batch", False),
+    ("server", "import server", False),
+    (
+        "decode",
+        f"import mnxdocument; mnxdocument.decodeDocument(open({helloWorld!r}).read())",
+        False,
+    ),
+    ("scan", f"import metadata; metadata.scanFile({helloWorld!r})", False),
+    ("convert", "import convert", True),
+    (
+        "first conversion",
+        "import convert; from music21 import converter; "
+        f"converter.parse(open({helloWorld!r}).read(), format='mnx')",
+        True,
+    ),
+]
+
+# Prints how long the statement took and whether music21 got imported.
+probe = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "music21": "music21" in sys.modules}}))
+"""
+
+
+def run(statement: str) -> tuple[float, float, bool]:
+    # Returns (seconds for the whole process, seconds for the statement, music21 imported).
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", probe.format(statement=statement)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    total = time.perf_counter() - start
+    result = json.loads(out.splitlines()[-1])
+    return total, result["seconds"], result["music21"]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time cold imports of the converter.")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per statement")
+    parser.add_argument("--json", default=None, help="write the results to this file")
+    args = parser.parse_args(argv)
+
+    startup = statistics.median(run("pass")[0] for _ in range(args.repeat))
+    print(f"{'statement':<20} {'import ms':>10} {'process ms':>11}  music21")
+    print(f"{'startup':<20} {'':>10} {startup * 1000:>11.0f}")
+    results: list[dict[str, Any]] = []
+    failed = []
+    for name, statement, allowed in targets:
+        runs = [run(statement) for _ in range(args.repeat)]
+        total = statistics.median(r[0] for r in runs)
+        seconds = statistics.median(r[1] for r in runs)
+        music21 = any(r[2] for r in runs)
+        if music21 and not allowed:
+            failed.append(name)
+        print(
+            f"{name:<20} {seconds * 1000:>10.0f} {total * 1000:>11.0f}  "
+            + ("yes" if music21 else "no")
+        )
+        results.append(
+            {"name": name, "seconds": seconds, "process": total, "music21": music21}
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"startup": startup, "results": results}, f, indent=2)
+    for name in failed:
+        print(f"{name} should not import music21", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# Measures how much memory a decoded mnx.Top takes, per event.
+#
+# The mnx classes are slotted. For comparison, every decoded document is also
+# copied into plain dataclasses with the same fields, which is how the classes
+# were laid out before (one __dict__ per instance).
+#
+# Usage (from src/):
+#   python3 bench-memory.py [files...]
+
+from typing import Any
+import dataclasses
+import json
+import sys
+import tracemalloc
+
+import mnx
+import mnx.decoders
+
+defaultInputs = ["../examples/bach_minuet.json", "../examples/liszt.json"]
+
+dictTwins: dict[type, type] = {}
+
+
+def toDictLayout(o: Any) -> Any:
+    # Copies a decoded tree into unslotted dataclasses, sharing all leaf values.
+    if isinstance(o, list):
+        return [toDictLayout(e) for e in o]
+    if not dataclasses.is_dataclass(o):
+        return o
+    cls = type(o)
+    if cls not in dictTwins:
+        names = [f.name for f in dataclasses.fields(cls)]
+        dictTwins[cls] = dataclasses.make_dataclass(cls.__name__, names)
+    return dictTwins[cls](
+        *[toDictLayout(getattr(o, f.name)) for f in dataclasses.fields(cls)]
+    )
+
+
+def countInstances(o: Any) -> tuple[int, int]:
+    # Returns (events, dataclass instances) in a decoded tree.
+    if isinstance(o, list):
+        counts = [countInstances(e) for e in o]
+        return sum(c[0] for c in counts), sum(c[1] for c in counts)
+    if not dataclasses.is_dataclass(o):
+        return 0, 0
+    events = 1 if isinstance(o, mnx.DefEvent) else 0
+    instances = 1
+    for f in dataclasses.fields(o):
+        e, i = countInstances(getattr(o, f.name))
+        events += e
+        instances += i
+    return events, instances
+
+
+def measure(build) -> tuple[Any, int]:
+    # Returns the result of build() and the bytes still allocated for it afterwards.
+    # build() runs once beforehand so that caches filled on first use are not counted.
+    build()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def main(paths: list[str]) -> None:
+    print(
+        f"{'file':<48} {'events':>7} {'objects':>8} "
+        f"{'dict B/event':>13} {'slots B/event':>14} {'saved':>6}"
+    )
+    for path in paths:
+        with open(path, "r") as f:
+            d = json.load(f)
+        top, slotsBytes = measure(lambda: mnx.decoders.topFromDict(d))
+        twin, dictBytes = measure(lambda: toDictLayout(top))
+        events, instances = countInstances(top)
+        name = path.rsplit("/", 1)[-1]
+        print(
+            f"{name:<48} {events:>7} {instances:>8} "
+            f"{dictBytes / events:>13.0f} {slotsBytes / events:>14.0f} "
+            f"{1 - slotsBytes / dictBytes:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or defaultInputs)
@@ -19,68 +19,434 @@ from music21 import (
 )
 
 import music21
-from typing import Optional, cast, Union, Tuple, Callable, TypeAlias
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    Callable,
+    Iterable,
+    Optional,
+    cast,
+    Union,
+    Tuple,
+    NamedTuple,
+    TextIO,
+)
+import io
+import json
+import pathlib
+import pickle
 import mnx
+import mnx.decoders
+import mnx.tables
+import mnxstream
+import mnxwriter
+from mnxdocument import beamEventIds, decodeDocument, measureFromDict, selectDocument
+import lazyscore
+from profiling import ConversionProfile
+from scorepickle import ScorePickler, gcPaused, restoreSites
 import logging
 
 log = logging.getLogger(__name__)
 
-# A deferred task takes in an object and decides whether to perform the task.
-# If the task has been performed, return True, so the scheduler can remove it from the queue.
-Deferred: TypeAlias = Callable[[music21.Music21Object], bool]
+# Duration templates keyed by (base, dots), shared by every conversion in the process.
+# A DurationTuple is immutable and already knows its type, dots and quarterLength,
+# so those only get computed once per distinct note value.
+durationTemplates: dict[Tuple[str, int], duration.DurationTuple] = {}
+
+
+def getDurationTemplate(base: str, dots: int) -> duration.DurationTuple:
+    template = durationTemplates.get((base, dots))
+    if template is None:
+        durationType = mnx.tables.durationTypes.get(base)
+        if durationType is None:
+            raise ValueError(f"MNX has {base} but music21 only supports up to 2048th")
+        template = duration.durationTupleFromTypeDots(durationType, dots)
+        durationTemplates[(base, dots)] = template
+    return template
+
+
+def stampDuration(template: duration.DurationTuple) -> duration.Duration:
+    # Each music21 object needs a Duration of its own since the Duration
+    # keeps a reference to its client, but the template is shared.
+    # Pass the result to the note's constructor so it does not build a default one first.
+    return duration.Duration(template)
+
+
+class PitchTemplate(NamedTuple):
+    """Immutable pitch state shared between all notes with the same MNX pitch."""
+
+    step: str
+    octave: int
+    # music21 accidental name, or None if the note has no accidental at all
+    accidental: Optional[str]
+    # accidental display type, or None to keep music21's default
+    displayType: Optional[str]
+    midi: int
+
+
+# Pitch templates keyed by (step, octave, alter, accidental_display.show),
+# shared by every conversion in the process.
+# Music21 pitches are mutable, so each note still gets its own pitch.Pitch,
+# but everything about it is only worked out once per distinct key.
+pitchTemplates: dict[Tuple[str, int, Optional[int], bool], PitchTemplate] = {}
+
+
+def getPitchTemplate(
+    step: str, octave: int, alter: Optional[int], show: bool
+) -> PitchTemplate:
+    key = (step, octave, alter, show)
+    template = pitchTemplates.get(key)
+    if template is None:
+        acc: Optional[pitch.Accidental] = None
+        if alter is not None:
+            acc = pitch.Accidental(alter)
+
+        # handle the marking for accidental display
+        displayType: Optional[str] = None
+        if show:
+            if acc is None:
+                acc = pitch.Accidental(0)
+            displayType = "always"
+
+        p = pitch.Pitch(step=step, octave=octave, accidental=acc)
+        template = PitchTemplate(
+            step=step,
+            octave=octave,
+            accidental=None if acc is None else acc.name,
+            displayType=displayType,
+            midi=p.midi,
+        )
+        pitchTemplates[key] = template
+    return template
+
+
+def stampPitch(template: PitchTemplate) -> pitch.Pitch:
+    # Pass the result to the note's constructor so it does not build a default one first.
+    if template.accidental is None:
+        return pitch.Pitch(step=template.step, octave=template.octave)
+    acc = pitch.Accidental(template.accidental)
+    if template.displayType is not None:
+        acc.displayType = template.displayType
+    return pitch.Pitch(step=template.step, octave=template.octave, accidental=acc)
 
 
 class MNXConverter(converter.subConverters.SubConverter):
     registerFormats = ("mnx",)
     registerInputExtensions = ("json",)
+    registerOutputExtensions = ("json",)
 
     # Maps MNX object IDs to corresponding Music21Object we created (usually notes or chords)
     idMappings: dict[str, music21.Music21Object]
 
     globalInfo: mnx.Top.Global
 
-    # List of tasks that have been deferred to further in the score.
-    tasks: list[Deferred]
-
-    def addTask(self, task: Deferred):
-        self.tasks.append(task)
+    # Cross-references collected while building the parts.
+    # Their targets may live further in the score (or even in another part),
+    # so they are only resolved by linkAll once every part has been built.
+    tieLinks: list[Tuple[note.Note, mnx.DefEvent.Note.Tie]]
+    slurLinks: list[Tuple[note.GeneralNote, mnx.DefEvent.Slur]]
+    beamLinks: list[mnx.DefBeam]
+
+    # Set by enableProfiling. Through music21, a conversion can be profiled with
+    # converter.parse(..., format="mnx", profile=True), and profileJson=path
+    # writes the report to a file as well.
+    profile: Optional[ConversionProfile] = None
+
+    # Methods timed when profiling: the MNX constructs and the link steps.
+    profiledMethods = (
+        "parsePart",
+        "parseMeasure",
+        "parseSequence",
+        "parseEvent",
+        "parseNote",
+        "processBeam",
+        "queueTie",
+        "queueSlur",
+        "linkAll",
+        "linkTie",
+        "linkSlur",
+    )
+
+    def enableProfiling(self) -> ConversionProfile:
+        # The profiled methods are only wrapped on this instance,
+        # so converters that do not profile run exactly as before.
+        if self.profile is None:
+            self.profile = ConversionProfile()
+            for name in self.profiledMethods:
+                setattr(self, name, self.profile.wrap(name, getattr(self, name)))
+        else:
+            self.profile.reset()
+        return self.profile
 
-    def runAllTasks(self, obj: music21.Music21Object):
-        for ident, obj in self.idMappings.items():
-            self.runTasks(obj)
+    def startProfile(self) -> None:
+        if self.keywords.get("profile") or self.keywords.get("profileJson"):
+            self.enableProfiling()
+        elif self.profile is not None:
+            self.profile.reset()
 
-    def runTasks(self, obj: music21.Music21Object):
-        doneIndices = [i for i, task in enumerate(self.tasks) if task(obj)]
-        for idx in reversed(doneIndices):
-            self.tasks.pop(idx)
+    def stopProfile(self) -> None:
+        path = self.keywords.get("profileJson")
+        if self.profile is not None and path:
+            self.profile.dump(path)
 
     def parseData(self, strData: str, number: int | None = None) -> None:
-        # Parse JSON
-        top = mnx.Top.from_json(strData)
+        self.startProfile()
+
+        # Parse JSON. With converter.parse(..., format="mnx", cacheDecoded=True),
+        # documents already decoded in this process come from topCache.
+        top = decodeDocument(
+            strData,
+            self.keywords.get("parts"),
+            self.keywords.get("measures"),
+            self.keywords.get("cacheDecoded", False),
+        )
+
+        # With jobs=N, the parts are converted in N worker processes. An executor
+        # passed as executor=... is used instead of a new pool, with one task
+        # per part unless jobs says otherwise.
+        executor = self.keywords.get("executor")
+        jobs = self.keywords.get("jobs", 1 if executor is None else len(top.parts))
+        if self.isSelective():
+            # Only part of the document is wanted, see selectDocument.
+            sc = self.buildScore(top)
+            self.linkSelection()
+        elif self.keywords.get("lazy"):
+            # Measures are converted and linked when first looked at, see lazyscore.py.
+            sc = self.buildLazyScore(top)
+        else:
+            if (jobs > 1 or executor is not None) and len(top.parts) > 1:
+                sc = self.buildScoreInParallel(top, strData, jobs, executor)
+            else:
+                sc = self.buildScore(top)
+
+            # Now that every event exists, resolve ties, slurs and beams in one sweep.
+            self.linkAll()
+
+        # Done. Put the result in self.stream.
+        self.stream = sc
+        self.stopProfile()
+
+    def isSelective(self) -> bool:
+        # Set through converter.parse(..., format="mnx", parts=[...], measures=(first, last)).
+        return (
+            self.keywords.get("parts") is not None
+            or self.keywords.get("measures") is not None
+        )
+
+    def buildScore(self, top: mnx.Top) -> stream.Score:
+        # Creates all the music21 objects. Ties, slurs and beams are only queued
+        # and still need a call to linkAll.
         assert top.mnx.version == 1, "MNXConverter only supports MNX version 1."
 
         # Initialize stuff
-        self.globalInfo = top.global_
-        self.idMappings = {}
-        self.tasks = []
+        self.startScore(top.global_)
 
-        # Walk through the parts to populate notes in measures in voices in parts
+        # Walk through the parts to populate notes in measures in voices in parts.
+        # Streams are filled with coreInsert at offsets we compute ourselves,
+        # and each stream is finalized once with coreElementsChanged.
         sc = stream.Score()
         for inPart in top.parts:
             outPart = self.parsePart(inPart)
-            sc.append(outPart)
+            sc.coreInsert(0.0, outPart, ignoreSort=True)
+        sc.coreElementsChanged()
+        return sc
 
-        assert len(self.tasks) == 0, "Tasks not empty. Something went wrong."
+    def buildScoreInParallel(
+        self,
+        top: mnx.Top,
+        strData: str,
+        jobs: int,
+        executor: Optional[Executor] = None,
+    ) -> stream.Score:
+        # Same as buildScore, but the parts are converted in worker processes
+        # (see convertPartsInWorker). Whatever links the workers could not resolve
+        # on their own, because they cross into parts of another worker,
+        # are left queued for linkAll.
+        assert top.mnx.version == 1, "MNXConverter only supports MNX version 1."
+        self.startScore(top.global_)
+
+        # Parts are dealt out in turn, so that every worker gets a similar share
+        # of a score whose sections have parts of different sizes.
+        # Each worker is only sent its own parts, see selectDocument.
+        count = len(top.parts)
+        groups = [list(range(i, count, jobs)) for i in range(min(jobs, count))]
+        document = json.loads(strData)
+        ownExecutor = executor is None
+        if executor is None:
+            executor = ProcessPoolExecutor(len(groups))
+        try:
+            futures = [
+                executor.submit(
+                    convertPartsInWorker,
+                    json.dumps(selectDocument(document, parts=list(group))),
+                    group,
+                )
+                for group in groups
+            ]
+            parts: dict[int, stream.Part] = {}
+            for future in futures:
+                self.mergeWorkerResult(future.result(), parts)
+        finally:
+            if ownExecutor:
+                executor.shutdown()
 
-        # Done. Put the result in self.stream.
+        sc = stream.Score()
+        for i in range(count):
+            sc.coreInsert(0.0, parts[i], ignoreSort=True)
+        sc.coreElementsChanged()
+        return sc
+
+    def buildLazyScore(self, top: mnx.Top) -> stream.Score:
+        # Same as buildScore, but every measure is left empty until it is first
+        # looked at, and linking is left to lazyscore.MeasureLoader.
+        assert top.mnx.version == 1, "MNXConverter only supports MNX version 1."
+        self.startScore(top.global_)
+        assert self.globalInfo.measures is not None
+        loader = lazyscore.MeasureLoader(self, top)
+
+        sc = stream.Score()
+        for p, inPart in enumerate(top.parts):
+            outPart = loader.part(p)
+            self.parsePartInfo(inPart, outPart)
+            assert inPart.measures is not None
+            assert len(inPart.measures) == len(self.globalInfo.measures)
+            offset = 0.0
+            for m, (inMeas, globalMeas) in enumerate(
+                zip(inPart.measures, self.globalInfo.measures)
+            ):
+                outMeas = loader.shell((p, m), inMeas, globalMeas)
+                outPart.coreInsert(offset, outMeas, ignoreSort=True)
+                offset += outMeas.duration.quarterLength
+            outPart.coreElementsChanged()
+            sc.coreInsert(0.0, outPart, ignoreSort=True)
+        sc.coreElementsChanged()
+        return sc
+
+    def mergeWorkerResult(self, data: bytes, parts: dict[int, stream.Part]) -> None:
+        with gcPaused():
+            outParts, idMappings, tieLinks, slurLinks, beamLinks = pickle.loads(data)
+            for i, outPart in outParts:
+                restoreSites(outPart)
+                parts[i] = outPart
+        for ident, obj in idMappings.items():
+            if ident in self.idMappings:
+                raise KeyError(
+                    ident, obj, "Identifier already exists in the ID mapping."
+                )
+        self.idMappings.update(idMappings)
+        self.tieLinks += tieLinks
+        self.slurLinks += slurLinks
+        self.beamLinks += beamLinks
+
+    def parseFile(
+        self, filePath, number: int | None = None, **keywords
+    ) -> stream.Score:
+        # music21 keeps what it reads from a path in a scratch pickle, keyed by
+        # the path alone (see converter.PickleFilter), and hands it out to every
+        # later parse of the file. A selection would be taken for the whole score,
+        # and a lazy score would be stored fully converted.
+        if self.keywords.get("lazy") or self.isSelective():
+            raise ValueError(
+                "lazy, parts and measures only apply to MNX text, since music21 "
+                "caches what it reads from a path: pass the contents of the file instead."
+            )
+        # Files are read incrementally rather than loaded as a whole first,
+        # unless its parts go to worker processes.
+        parallel = (
+            self.keywords.get("jobs", 1) > 1
+            or self.keywords.get("executor") is not None
+        )
+        if parallel:
+            with open(filePath, "r") as f:
+                self.parseData(f.read())
+            return self.stream
+        self.startProfile()
+        with open(filePath, "r") as f:
+            self.parseStream(f)
+        self.stopProfile()
+        return self.stream
+
+    def parseStream(self, f: TextIO) -> None:
+        # Same as parseData, but the document is read measure by measure with mnxstream.
+        # Each measure is decoded, converted and released before the next one is read,
+        # so apart from the resulting score only global.measures is kept around.
+        # This needs global to come before parts in the document, which is the usual order.
+        self.startScore(mnx.Top.Global(measures=[]))
+        assert self.globalInfo.measures is not None
+        globalDone = False
+        version: Optional[int] = None
+
+        sc = stream.Score()
+        outPart = stream.Part()
+        offset = 0.0
+        index = 0
+        for kind, value in mnxstream.readEvents(f):
+            if kind == "mnx":
+                version = mnx.decoders.fromDict(mnx.Top.Mnx, value).version
+            elif kind == "globalMeasure":
+                globalMeas = mnx.decoders.fromDict(mnx.Top.Global.Measure, value)
+                self.globalInfo.measures.append(globalMeas)
+            elif kind == "global":
+                rest = mnx.decoders.fromDict(mnx.Top.Global, {**value, "measures": []})
+                self.globalInfo.styles = rest.styles
+                globalDone = True
+            elif kind == "partStart":
+                outPart = stream.Part()
+                offset = 0.0
+                index = 0
+            elif kind == "partMeasure":
+                if not globalDone:
+                    raise ValueError(
+                        "Reading MNX incrementally needs global to come before parts."
+                    )
+                assert index < len(self.globalInfo.measures)
+                outMeas = self.parseMeasure(
+                    measureFromDict(value), self.globalInfo.measures[index]
+                )
+                outPart.coreInsert(offset, outMeas, ignoreSort=True)
+                offset += outMeas.duration.quarterLength
+                index += 1
+            elif kind == "partEnd":
+                assert index == len(self.globalInfo.measures)
+                self.parsePartInfo(mnx.decoders.fromDict(mnx.Top.Part, value), outPart)
+                outPart.coreElementsChanged()
+                sc.coreInsert(0.0, outPart, ignoreSort=True)
+        sc.coreElementsChanged()
+
+        assert version == 1, "MNXConverter only supports MNX version 1."
+
+        self.linkAll()
         self.stream = sc
 
+    def write(
+        self,
+        obj: music21.Music21Object,
+        fmt: Optional[str],
+        fp: Union[str, pathlib.Path, TextIO, None] = None,
+        subformats: Iterable[str] = (),
+        **keywords,
+    ) -> Union[pathlib.Path, TextIO]:
+        # The reverse of parseData, see mnxwriter.py: sc.write("mnx", fp=...).
+        # The document is written measure by measure as it is produced,
+        # to a path, a text file object (which is left open) or a temporary file.
+        if fp is None:
+            fp = self.getTemporaryFile(subformats)
+        if isinstance(fp, (str, pathlib.Path)):
+            with open(fp, "w") as f:
+                mnxwriter.writeScore(cast(stream.Stream, obj), f)
+            return pathlib.Path(fp)
+        mnxwriter.writeScore(cast(stream.Stream, obj), fp)
+        return fp
+
+    def startScore(self, globalInfo: mnx.Top.Global) -> None:
+        self.globalInfo = globalInfo
+        self.idMappings = {}
+        self.tieLinks = []
+        self.slurLinks = []
+        self.beamLinks = []
+
     def parsePart(self, inPart: mnx.Top.Part) -> stream.Part:
         outPart = stream.Part()
-        self.setId(outPart, inPart.id)
-
-        outPart.partName = inPart.name
-        outPart.partAbbreviation = inPart.short_name
+        self.parsePartInfo(inPart, outPart)
 
         assert (
             inPart.measures is not None
@@ -90,18 +456,32 @@ class MNXConverter(converter.subConverters.SubConverter):
         ), "global.measures is not required but that does not make sense semantically"
         assert len(inPart.measures) == len(self.globalInfo.measures)
 
+        offset = 0.0
         for inMeas, globalMeas in zip(inPart.measures, self.globalInfo.measures):
             outMeas = self.parseMeasure(inMeas, globalMeas)
-            outPart.append(outMeas)
+            outPart.coreInsert(offset, outMeas, ignoreSort=True)
+            offset += outMeas.duration.quarterLength
+        outPart.coreElementsChanged()
+        return outPart
+
+    def parsePartInfo(self, inPart: mnx.Top.Part, outPart: stream.Part) -> None:
+        self.setId(outPart, inPart.id)
+
+        outPart.partName = inPart.name
+        outPart.partAbbreviation = inPart.short_name
 
         # TODO: handle .staves
         # TODO: handle .smufl_font
-        return outPart
 
     def parseMeasure(
-        self, inMeas: mnx.Top.Part.Measure, globalMeas: mnx.Top.Global.Measure
+        self,
+        inMeas: mnx.Top.Part.Measure,
+        globalMeas: mnx.Top.Global.Measure,
+        outMeas: Optional[stream.Measure] = None,
     ) -> stream.Measure:
-        outMeas = stream.Measure()
+        # Fills outMeas if given, e.g. a lazyscore.LazyMeasure.
+        if outMeas is None:
+            outMeas = stream.Measure()
 
         if globalMeas.number is not None:
             outMeas.number = globalMeas.number
@@ -110,11 +490,11 @@ class MNXConverter(converter.subConverters.SubConverter):
             k = key.KeySignature(globalMeas.key.fifths)
             # TODO: handle class_
             # TODO: handle color
-            outMeas.append(k)
+            outMeas.coreInsert(0.0, k, ignoreSort=True)
 
         if globalMeas.time is not None:
             t = meter.TimeSignature(f"{globalMeas.time.count}/{globalMeas.time.unit}")
-            outMeas.append(t)
+            outMeas.coreInsert(0.0, t, ignoreSort=True)
 
         # I gave up on implementing these jumps.
         # See MNXConverter.parseMeasureLocation for an explanation.
@@ -133,7 +513,7 @@ class MNXConverter(converter.subConverters.SubConverter):
                     # offset=self.parseMeasureLocation(inTempo.location)[1],
                     # offset=self.parseFraction(inTempo.location),
                 )
-                outMeas.append(outTempo)
+                outMeas.coreInsert(0.0, outTempo, ignoreSort=True)
 
         # TODO: handle globalMeas.index
         # I could never figure out what this was supposed to represent.
@@ -150,53 +530,62 @@ class MNXConverter(converter.subConverters.SubConverter):
             bl = bar.Barline(type=globalMeas.barline.type)
             outMeas.rightBarline = bl
 
-        # Parse each voice within the measure
-        for seq in inMeas.sequences:
-            v = self.parseSequence(seq)
-            outMeas.append(v)
-
-        # Add beams to the notes
-        # TODO: Handle beams across barlines (as it stands right now,
-        #       the event lookups fail because things from the future measures aren't available.)
+        # Parse each voice within the measure.
+        # If the measure has only one voice, there is no need to have a stream.Voice object.
+        if len(inMeas.sequences) == 1:
+            self.parseSequence(inMeas.sequences[0], outMeas)
+        else:
+            for seq in inMeas.sequences:
+                v = stream.Voice()
+                self.parseSequence(seq, v)
+                v.coreElementsChanged()
+                outMeas.coreInsert(0.0, v, ignoreSort=True)
+
+        # Beams are added to the notes during linking, since a beam
+        # may cross barlines and refer to events from future measures.
         if inMeas.beams is not None:
-            for b in inMeas.beams:
-                b = mnx.DefBeam.from_dict(b)
-                self.processBeam(b, 1)
+            self.beamLinks += inMeas.beams
 
         if inMeas.clefs is not None:
             for inClef in inMeas.clefs:
                 outClef = self.parseClef(inClef)
-                outMeas.insert(outClef)
+                outMeas.coreInsert(outClef.offset, outClef, ignoreSort=True)
 
         # TODO: handle globalMeas.ending
 
-        # If the measure has only one voice, there is no need to have a stream.Voice object.
-        return outMeas.flattenUnnecessaryVoices()
+        outMeas.coreElementsChanged()
+        return outMeas
 
-    def parseSequence(self, inSeq: mnx.Top.Part.Measure.Sequence) -> stream.Voice:
-        outVoice = stream.Voice()
+    def parseSequence(
+        self, inSeq: mnx.Top.Part.Measure.Sequence, outStream: stream.Stream
+    ) -> None:
+        # Events are inserted into outStream (a voice, or the measure itself)
+        # with coreInsert, so the caller has to call coreElementsChanged afterwards.
+        offset = 0.0
 
         # handle content, which is a list of events or something similar
         for obj in inSeq.content:
             if isinstance(obj, mnx.DefEvent):
                 n = self.parseEvent(obj)
-                outVoice.append(n)
+                outStream.coreInsert(offset, n, ignoreSort=True)
+                offset += n.duration.quarterLength
+            elif isinstance(obj, mnx.Top.Part.Measure.Sequence.ContentChoice4):
+                # Space: nothing happens in this voice for a while.
+                offset += self.parseSpaceLength(obj)
 
             # TODO: handle ContentChoice1 -> Grace note
             # TODO: handle ContentChoice2 -> Tuplet
             # TODO: handle ContentChoice3 -> Octave shift
-            # TODO: handle ContentChoice4 -> Space
             # TODO: handle ContentChoice5 -> Dynamic
 
         # TODO: handle .staff
         # TODO: handle .voice
         # TODO: handle .orient
-        return outVoice
 
     def parseEvent(self, inEvent: mnx.DefEvent) -> note.GeneralNote:
         assert inEvent.type == "event", "Wrong event type"
         assert inEvent.duration is not None, "An event should have a duration specified"
-        dur = self.parseNoteValue(inEvent.duration)
+        dur = self.parseNoteValueTemplate(inEvent.duration)
         outNote: note.GeneralNote | None = None
 
         assert (
@@ -212,8 +601,7 @@ class MNXConverter(converter.subConverters.SubConverter):
             # Get all the notes
             allNotes = []
             for inNote in inEvent.notes:
-                n = self.parseNote(inNote)
-                n.duration = dur
+                n = self.parseNote(inNote, dur)
                 allNotes.append(n)
             assert (
                 len(allNotes) > 0
@@ -228,9 +616,8 @@ class MNXConverter(converter.subConverters.SubConverter):
                 )  # this will replace the note's ID, but the mapping remains
             else:
                 # chord
-                c = chord.Chord(allNotes)
+                c = chord.Chord(allNotes, duration=stampDuration(dur))
                 self.setId(c, inEvent.id)  # associate the chord with event
-                c.duration = dur
                 outNote = c
 
         elif inEvent.rest is not None:
@@ -239,8 +626,7 @@ class MNXConverter(converter.subConverters.SubConverter):
                 inEvent.notes is None
             ), "It does not make sense to specify notes and rest at the same time."
 
-            r = note.Rest()
-            r.duration = dur
+            r = note.Rest(duration=stampDuration(dur))
             self.setId(r, inEvent.id)
             outNote = r
 
@@ -252,32 +638,19 @@ class MNXConverter(converter.subConverters.SubConverter):
             if inEvent.markings.soft_accent is not None:
                 raise ValueError("Music21 doesn't have support for soft accent.")
                 # or I simply could not find an equivalent one.
-            if inEvent.markings.accent is not None:
-                outNote.articulations.append(articulations.Accent())
-            if inEvent.markings.strong_accent is not None:
-                outNote.articulations.append(articulations.StrongAccent())
-
-            # MNX has a field for breath symbol, but it does not specify what those are.
-            # Music21 supports 'comma', 'tick', or None.
-            # I'm going to assume 'comma' and 'tick' are what MNX intended.
-            if inEvent.markings.breath is not None:
-                a = articulations.BreathMark()
-                a.symbol = inEvent.markings.breath
+            for field, articulationClass in mnx.tables.articulationFields:
+                marking = getattr(inEvent.markings, field)
+                if marking is None:
+                    continue
+                a = articulationClass()
+                if isinstance(a, articulations.BreathMark):
+                    # MNX has a field for breath symbol, but it does not
+                    # specify what those are. Music21 supports 'comma', 'tick',
+                    # or None. I'm going to assume 'comma' and 'tick' are what
+                    # MNX intended.
+                    a.symbol = marking
                 outNote.articulations.append(a)
 
-            if inEvent.markings.staccato is not None:
-                outNote.articulations.append(articulations.Staccato())
-            if inEvent.markings.staccatissimo is not None:
-                outNote.articulations.append(articulations.Staccatissimo())
-            if inEvent.markings.spiccato is not None:
-                outNote.articulations.append(articulations.Spiccato())
-            if inEvent.markings.tenuto is not None:
-                outNote.articulations.append(articulations.Tenuto())
-            if inEvent.markings.unstress is not None:
-                outNote.articulations.append(articulations.Unstress())
-            if inEvent.markings.stress is not None:
-                outNote.articulations.append(articulations.Stress())
-
             # Interestingly enough, MNX does not seem to have support for
             # multi-note tremolos?
             if inEvent.markings.tremolo is not None:
@@ -297,117 +670,154 @@ class MNXConverter(converter.subConverters.SubConverter):
 
         return outNote
 
-    def queueSlur(self, start: note.GeneralNote, slur: mnx.DefEvent.Slur):
-        def task(end: music21.Music21Object) -> bool:
-            # We add slur as soon as the target note is found.
-            if end.id != slur.target:
-                return False
-            assert isinstance(
-                end, note.GeneralNote
-            ), "Target note needs to actually be a note"
-
-            # Need to make a separate copy because
-            # otherwise start.sites contains the slur itself.
-            sites = list(start.sites)
-
-            # There are two kinds of slurs: Slurs that are tied from an event to another event,
-            # and slurs that are additionally associated with specific notes.
-            # I don't think Music21 supports the second kind.
-            sp = spanner.Slur()
-            if slur.start_note is None:
-                assert (
-                    slur.end_note is None
-                ), "Slurs at specific notes must have both start_note and end_note"
-                sp.addSpannedElements(start)
-                sp.addSpannedElements(end)
+    def linkAll(self) -> None:
+        for start, tie_ in self.tieLinks:
+            self.linkTie(start, tie_)
+        for start, slur in self.slurLinks:
+            self.linkSlur(start, slur)
+        for b in self.beamLinks:
+            self.processBeam(b)
+
+        self.tieLinks = []
+        self.slurLinks = []
+        self.beamLinks = []
+
+    def linkLocal(self, isReady: Optional[Callable[[str], bool]] = None) -> None:
+        # Same as linkAll, but only for links whose targets are all ready,
+        # by default those that exist already. The others stay queued.
+        if isReady is None:
+            isReady = self.idMappings.__contains__
+        tieLinks, slurLinks, beamLinks = self.tieLinks, self.slurLinks, self.beamLinks
+        self.tieLinks, self.slurLinks, self.beamLinks = [], [], []
+        for start, tie_ in tieLinks:
+            if isReady(cast(str, tie_.target)):
+                self.linkTie(start, tie_)
             else:
-                assert (
-                    slur.end_note is not None
-                ), "Slurs at specific notes must have both start_note and end_note"
-                log.warning(
-                    f"Specific-note slur from {slur.start_note} to {slur.end_note} is omitted."
-                )
-                # sp.addSpannedElements(self.lookup(slur.start_note))
-                # sp.addSpannedElements(self.lookup(slur.end_note))
-                sp.addSpannedElements(start)
-                sp.addSpannedElements(end)
-
-            # MNX did not document lineType, but it seems to be
-            # directly inspired by MusicXML.
-            sp.lineType = slur.line_type
-
-            if slur.side is not None:
-                sp.placement = {"up": "above", "down": "below"}[slur.side]
-
-            # TODO: Handle .side_end (not sure what it means).
-
-            # TODO: Handle incomplete slur with .location (can't find how Music21 represents this).
-
-            # Now actually add the slur.
-            for site in sites:
-                site.append(sp)
-            return True
-
+                self.tieLinks.append((start, tie_))
+        for start, slur in slurLinks:
+            if isReady(cast(str, slur.target)):
+                self.linkSlur(start, slur)
+            else:
+                self.slurLinks.append((start, slur))
+        for b in beamLinks:
+            if all(isReady(ident) for ident in beamEventIds(b)):
+                self.processBeam(b)
+            else:
+                self.beamLinks.append(b)
+
+    def linkSelection(self) -> None:
+        # Same as linkAll for a selection of the document (see selectDocument).
+        # Ties and slurs leading out of the selection are left out,
+        # and beams only keep the events inside it.
+        self.linkLocal()
+        left = len(self.tieLinks) + len(self.slurLinks)
+        if left:
+            log.info(f"{left} ties and slurs leading out of the selection are omitted.")
+        # parseNote has already started the ties. Slurs are only created
+        # when linked, so there is nothing to undo for them.
+        for start, _ in self.tieLinks:
+            if start.tie is not None and start.tie.type == "continue":
+                start.tie = tie.Tie("stop")
+            else:
+                start.tie = None
+        beamLinks = self.beamLinks
+        self.tieLinks, self.slurLinks, self.beamLinks = [], [], []
+        for b in beamLinks:
+            trimmed = self.trimBeam(b)
+            if trimmed is not None:
+                self.processBeam(trimmed)
+
+    def trimBeam(self, inBeam: mnx.DefBeam) -> Optional[mnx.DefBeam]:
+        # The part of a beam made of events that have been converted, if any.
+        events = [e for e in inBeam.events if e in self.idMappings]
+        if len(events) < min(2, len(inBeam.events)):
+            # Nothing left to beam together.
+            return None
+        inner = [t for n in inBeam.inner or () if (t := self.trimBeam(n)) is not None]
+        hooks = [h for h in inBeam.hooks or () if h.event in self.idMappings]
+        return mnx.DefBeam(events=events, hooks=hooks or None, inner=inner or None)
+
+    def queueSlur(self, start: note.GeneralNote, slur: mnx.DefEvent.Slur) -> None:
         if slur.target is None:
             log.warning(f"An incomplete slur is omitted.")
         else:
-            self.addTask(task)
+            self.slurLinks.append((start, slur))
+
+    def linkSlur(self, start: note.GeneralNote, slur: mnx.DefEvent.Slur) -> None:
+        assert slur.target is not None
+        end = self.lookup(slur.target)
+        assert isinstance(
+            end, note.GeneralNote
+        ), "Target note needs to actually be a note"
+
+        # There are two kinds of slurs: Slurs that are tied from an event to another event,
+        # and slurs that are additionally associated with specific notes.
+        # I don't think Music21 supports the second kind.
+        sp = spanner.Slur()
+        if slur.start_note is None:
+            assert (
+                slur.end_note is None
+            ), "Slurs at specific notes must have both start_note and end_note"
+            sp.addSpannedElements(start)
+            sp.addSpannedElements(end)
+        else:
+            assert (
+                slur.end_note is not None
+            ), "Slurs at specific notes must have both start_note and end_note"
+            log.warning(
+                f"Specific-note slur from {slur.start_note} to {slur.end_note} is omitted."
+            )
+            # sp.addSpannedElements(self.lookup(slur.start_note))
+            # sp.addSpannedElements(self.lookup(slur.end_note))
+            sp.addSpannedElements(start)
+            sp.addSpannedElements(end)
+
+        # MNX did not document lineType, but it seems to be
+        # directly inspired by MusicXML.
+        sp.lineType = slur.line_type
+
+        if slur.side is not None:
+            sp.placement = mnx.tables.slurPlacements[slur.side]
+
+        # TODO: Handle .side_end (not sure what it means).
+
+        # TODO: Handle incomplete slur with .location (can't find how Music21 represents this).
+
+        # Now actually add the slur next to its starting note.
+        # Only the active site is used: start.sites also contains voices that
+        # have since been flattened away and the storage of other spanners.
+        site = start.activeSite
+        assert site is not None, "Slur start should already be placed in a stream"
+        site.insert(start.getOffsetBySite(site), sp)
+
+    def parseSpaceLength(
+        self, inSpace: mnx.Top.Part.Measure.Sequence.ContentChoice4
+    ) -> float:
+        template = self.parseNoteValueTemplate(inSpace.duration.duration)
+        return inSpace.duration.multiple * template.quarterLength
 
     def parseNoteValue(self, inDur: mnx.DefNoteValue) -> duration.Duration:
-        # In Music21, duration types are defined in duration.py:137.
-        # It seems like MNX takes inspiration directly from this.
-        mnxToM21Type: dict[str, str] = {
-            "duplex-maxima": "duplex-maxima",
-            "maxima": "maxima",
-            "longa": "longa",
-            "breve": "breve",
-            "whole": "whole",
-            "half": "half",
-            "quarter": "quarter",
-            "eighth": "eighth",
-            "16th": "16th",
-            "32nd": "32nd",
-            "64th": "64th",
-            "128th": "128th",
-            "256th": "256th",
-            "512th": "512th",
-            "1024th": "1024th",
-            "2048th": "2048th",
-        }
-        if inDur.base == "4096th":
-            raise ValueError("MNX has 4096th but music21 only supports up to 2048th")
-
-        return duration.Duration(
-            type=mnxToM21Type[inDur.base],
-            dots=0 if inDur.dots is None else inDur.dots,
-        )
+        return stampDuration(self.parseNoteValueTemplate(inDur))
 
-    def parseNote(self, inNote: mnx.DefEvent.Note) -> note.Note:
-        outNote = note.Note()
-        self.setId(outNote, inNote.id)
+    def parseNoteValueTemplate(self, inDur: mnx.DefNoteValue) -> duration.DurationTuple:
+        return getDurationTemplate(inDur.base, 0 if inDur.dots is None else inDur.dots)
 
-        # handle the pitch
-        outNote.pitch = pitch.Pitch(step=inNote.pitch.step, octave=inNote.pitch.octave)
-
-        if inNote.pitch.alter is not None:
-            outNote.pitch.accidental = pitch.Accidental(inNote.pitch.alter)
-
-        # handle the marking for accidental display
-        if inNote.accidental_display is not None:
-            if inNote.accidental_display.show:
-                if outNote.pitch.accidental is None:
-                    outNote.pitch.accidental = pitch.Accidental(0)
-                outNote.pitch.accidental.displayType = "always"
+    def parseNote(
+        self, inNote: mnx.DefEvent.Note, dur: duration.DurationTuple
+    ) -> note.Note:
+        outNote = note.Note(
+            stampPitch(self.parsePitchTemplate(inNote)), duration=stampDuration(dur)
+        )
+        self.setId(outNote, inNote.id)
 
         # handle ties
         if inNote.tie is not None:
             assert (
                 inNote.tie.target is not None
             ), "It does not make sense for a tie to have no ending target."
-            # TODO: Figure out the bug. There's a very strange bug where
-            #       if I move this portion of code into the queued task instead,
-            #       some tie.Tie('start') never seems to get successfully assigned,
-            #       causing some ties to be lost. This version here works, though.
+            # The start of the tie is assigned right away. Only the end is
+            # resolved during linking, or the start is taken back by
+            # linkSelection if the end is not converted.
             if outNote.tie is not None and outNote.tie.type != "start":
                 outNote.tie = tie.Tie("continue")
             else:
@@ -424,75 +834,77 @@ class MNXConverter(converter.subConverters.SubConverter):
 
         return outNote
 
-    def queueTie(self, start: note.GeneralNote, tie_: mnx.DefEvent.Note.Tie) -> None:
-        def task(end: music21.Music21Object):
-            if end.id != tie_.target:
-                return False
-            assert isinstance(
-                end, note.GeneralNote
-            ), "Target note needs to actually be a note"
+    def parsePitchTemplate(self, inNote: mnx.DefEvent.Note) -> PitchTemplate:
+        show = inNote.accidental_display is not None and inNote.accidental_display.show
+        return getPitchTemplate(
+            inNote.pitch.step, inNote.pitch.octave, inNote.pitch.alter, show
+        )
 
-            if end.tie is not None and end.tie.type != "stop":
-                end.tie = tie.Tie("continue")
-            else:
-                end.tie = tie.Tie("stop")
-
-            return True
-
-        self.addTask(task)
-
-    def processBeam(self, inBeam: mnx.DefBeam, level: int) -> None:
-        # Add full beams
-        assert len(
-            inBeam.events
-        ), "A beam must consist of at least one events; use a hook instead."
-        eventIds = [
-            eventId
-            for eventId in inBeam.events
-            if isinstance(self.lookup(eventId), note.NotRest)
-        ]
-        for i, eventId in enumerate(eventIds):
-            event = cast(note.NotRest, self.lookup(eventId))
-
-            beamType: str
-            if i == 0:
-                beamType = "start"
-            elif i == len(eventIds) - 1:
-                beamType = "stop"
-            else:
-                beamType = "continue"
-            event.beams.append(beam.Beam(type=beamType, number=level))
+    def queueTie(self, start: note.Note, tie_: mnx.DefEvent.Note.Tie) -> None:
+        self.tieLinks.append((start, tie_))
 
-        # Add inner beams
-        if inBeam.inner is not None:
-            assert (
-                inBeam.hooks is None
-            ), "It does not make sense for inner beams and hooks to be specified at the same level."
-            for n in inBeam.inner:
-                n = mnx.DefBeam.from_dict(n)
-                self.processBeam(n, level + 1)
-
-        # Add hooks
-        if inBeam.hooks is not None:
-            assert (
-                inBeam.inner is None
-            ), "It does not make sense for inner beams and hooks to be specified at the same level."
-            for hook in inBeam.hooks:
-                n = self.lookup(hook.event)
-                assert isinstance(n, note.NotRest)
-                n.beams.append(
-                    beam.Beam(
-                        type="partial", direction=hook.direction, number=level + 1
+    def linkTie(self, start: note.Note, tie_: mnx.DefEvent.Note.Tie) -> None:
+        assert tie_.target is not None
+        end = self.lookup(tie_.target)
+        assert isinstance(
+            end, note.GeneralNote
+        ), "Target note needs to actually be a note"
+
+        if end.tie is not None and end.tie.type != "stop":
+            end.tie = tie.Tie("continue")
+        else:
+            end.tie = tie.Tie("stop")
+
+    def processBeam(self, inBeam: mnx.DefBeam) -> None:
+        # The levels are walked depth first with a stack rather than recursion,
+        # so that every note gets its beams in order of level, however deep.
+        stack = [(inBeam, 1)]
+        while stack:
+            inBeam, level = stack.pop()
+
+            # Add full beams
+            assert len(
+                inBeam.events
+            ), "A beam must consist of at least one events; use a hook instead."
+            events = [
+                event
+                for event in map(self.lookup, inBeam.events)
+                if isinstance(event, note.NotRest)
+            ]
+            last = len(events) - 1
+            for i, event in enumerate(events):
+                beamType: str
+                if i == 0:
+                    beamType = "start"
+                elif i == last:
+                    beamType = "stop"
+                else:
+                    beamType = "continue"
+                event.beams.append(beam.Beam(type=beamType, number=level))
+
+            # Add inner beams
+            if inBeam.inner is not None:
+                assert (
+                    inBeam.hooks is None
+                ), "It does not make sense for inner beams and hooks to be specified at the same level."
+                stack += [(n, level + 1) for n in reversed(inBeam.inner)]
+
+            # Add hooks
+            if inBeam.hooks is not None:
+                assert (
+                    inBeam.inner is None
+                ), "It does not make sense for inner beams and hooks to be specified at the same level."
+                for hook in inBeam.hooks:
+                    n = self.lookup(hook.event)
+                    assert isinstance(n, note.NotRest)
+                    n.beams.append(
+                        beam.Beam(
+                            type="partial", direction=hook.direction, number=level + 1
+                        )
                     )
-                )
 
     def parseClef(self, inClef: mnx.Top.Part.Measure.Clef) -> clef.Clef:
-        signToClefType: dict[str, clef.Clef] = {
-            "C": clef.CClef(),
-            "F": clef.FClef(),
-            "G": clef.GClef(),
-        }
-        outClef = signToClefType[inClef.clef.sign]
+        outClef = mnx.tables.clefClasses[inClef.clef.sign]()
 
         # How to specify clef position isn't clear from the MNX spec.
         # My understanding is that 0 refers to the center line, -1 refers to
@@ -571,7 +983,6 @@ class MNXConverter(converter.subConverters.SubConverter):
 
         obj.id = ident
         self.idMappings[ident] = obj
-        self.runTasks(obj)
 
     def lookup(self, ident: str) -> music21.Music21Object:
         if ident not in self.idMappings:
@@ -579,6 +990,32 @@ class MNXConverter(converter.subConverters.SubConverter):
         return self.idMappings[ident]
 
 
+def convertPartsInWorker(strData: str, indices: list[int]) -> bytes:
+    """
+    Converts an MNX document cut down to the parts at the given indices of
+    the whole document, for MNXConverter.buildScoreInParallel, and links
+    everything that stays within them. Returns the parts pickled together with
+    their indices, their ids and the links still queued, so that these keep
+    pointing at the same objects once unpickled by the parent.
+    """
+    conv = MNXConverter()
+    top = decodeDocument(strData)
+    assert len(top.parts) == len(indices)
+    conv.startScore(top.global_)
+    outParts = [(i, conv.parsePart(inPart)) for i, inPart in zip(indices, top.parts)]
+    conv.linkLocal()
+    payload = (
+        outParts,
+        conv.idMappings,
+        conv.tieLinks,
+        conv.slurLinks,
+        conv.beamLinks,
+    )
+    buf = io.BytesIO()
+    ScorePickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(payload)
+    return buf.getvalue()
+
+
 converter.registerSubConverter(MNXConverter)
 
 if __name__ == "__main__":
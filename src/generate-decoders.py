@@ -0,0 +1,243 @@
+# Generates mnx/decoders.py: straight-line dict-to-dataclass decoders
+# for every class in mnx/__init__.py.
+#
+# The decoders are generated from the dataclasses themselves rather than from
+# mnx-schema.json, so they follow the manual fixes described in the README
+# and produce exactly what the dataclass wizard would.
+#
+# Usage (from src/), after regenerating mnx/__init__.py:
+#   python3 generate-decoders.py > mnx/decoders.py
+#   black mnx/decoders.py
+
+from typing import Any, Literal, Union, get_args, get_origin
+import dataclasses
+import sys
+
+from dataclass_wizard.class_helper import get_meta  # type: ignore
+import mnx
+
+NoneType = type(None)
+
+# Fields left untyped in mnx/__init__.py only because the dataclass wizard cannot
+# decode recursive types (see README), with the types they really hold.
+# The __post_init__ of their classes gives them these types after the wizard.
+typedFields: dict[tuple[type, str], Any] = {
+    (mnx.DefBeam, "inner"): list[mnx.DefBeam],
+    (mnx.Top.Part.Measure, "beams"): list[mnx.DefBeam],
+}
+
+
+def fieldType(cls: type, f: dataclasses.Field) -> Any:
+    # The type of the field, without the Optional around it.
+    t = typedFields.get((cls, f.name), f.type)
+    if get_origin(t) is Union and NoneType in get_args(t):
+        (t,) = [a for a in get_args(t) if a is not NoneType]
+    return t
+
+
+def isDataclass(t: Any) -> bool:
+    return isinstance(t, type) and dataclasses.is_dataclass(t)
+
+
+def collectClasses() -> list[type]:
+    # Every dataclass in the mnx module, including nested ones, in definition order.
+    found: list[type] = []
+
+    def visit(cls: type) -> None:
+        if cls in found:
+            return
+        found.append(cls)
+        for value in vars(cls).values():
+            if isDataclass(value):
+                visit(value)
+
+    for value in vars(mnx).values():
+        if isDataclass(value) and value.__module__ == mnx.__name__:
+            visit(value)
+    return found
+
+
+def className(cls: type) -> str:
+    return "_" + cls.__qualname__.replace(".", "")
+
+
+def decoderName(cls: type) -> str:
+    return "decode" + cls.__qualname__.replace(".", "")
+
+
+class Generator:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        # Module-level constants: literal and key sets go before the decoders,
+        # union dispatch tables after them since they refer to the decoders.
+        self.constants: list[str] = []
+        self.tables: list[str] = []
+        self.constantNames: dict[str, str] = {}
+
+    def constant(self, prefix: str, value: str) -> str:
+        if value not in self.constantNames:
+            name = f"_{prefix}{len(self.constantNames)}"
+            self.constantNames[value] = name
+            target = self.tables if prefix == "union" else self.constants
+            target.append(f"{name} = {value}")
+        return self.constantNames[value]
+
+    def check(self, t: Any, var: str, indent: str) -> str:
+        """
+        Emits lines that check or convert the JSON value in var into type t.
+        Returns the expression holding the decoded value.
+        """
+        origin = get_origin(t)
+        if t is int or t is str or t is bool:
+            self.lines.append(f"{indent}if type({var}) is not {t.__name__}:")
+            self.lines.append(f"{indent}    raise DecodeError({var})")
+            return var
+        if origin is Literal:
+            values = get_args(t)
+            literals = self.constant("literals", f"frozenset({values!r})")
+            kinds = sorted({type(v).__name__ for v in values})
+            assert len(kinds) == 1, "Mixed literal types are not supported"
+            self.lines.append(
+                f"{indent}if type({var}) is not {kinds[0]} or {var} not in {literals}:"
+            )
+            self.lines.append(f"{indent}    raise DecodeError({var})")
+            return var
+        if isDataclass(t):
+            return f"{decoderName(t)}({var})"
+        if t is list or origin is list:
+            self.lines.append(f"{indent}if type({var}) is not list:")
+            self.lines.append(f"{indent}    raise DecodeError({var})")
+            args = get_args(t)
+            if not args:
+                # Untyped list: elements are kept as they are.
+                return f"list({var})"
+            elem = args[0]
+            if isDataclass(elem):
+                return f"[{decoderName(elem)}(e) for e in {var}]"
+            if get_origin(elem) is Union:
+                table = self.unionTable(elem)
+                return f"[{table}[e['type']](e) for e in {var}]"
+            # List of plain values: check each of them.
+            self.lines.append(f"{indent}for e in {var}:")
+            self.check(elem, "e", indent + "    ")
+            return f"list({var})"
+        raise NotImplementedError(f"Unsupported type {t!r}")
+
+    def unionTable(self, t: Any) -> str:
+        # Tagged unions are told apart by their "type" field,
+        # just like the tag_key setting on mnx.Top does for the dataclass wizard.
+        entries = []
+        for member in get_args(t):
+            assert isDataclass(member), "Only unions of dataclasses are supported"
+            tag = get_meta(member).tag
+            assert tag is not None, f"{member.__qualname__} has no tag"
+            entries.append(f"{tag!r}: {decoderName(member)}")
+        return self.constant("union", "{" + ", ".join(entries) + "}")
+
+    def decoder(self, cls: type) -> None:
+        fields = [f for f in dataclasses.fields(cls) if f.init]
+        keys = tuple(f.json.keys[0] for f in fields)
+        keySet = self.constant("keys", f"frozenset({keys!r})")
+
+        self.lines.append("")
+        self.lines.append("")
+        self.lines.append(f"def {decoderName(cls)}(d: dict) -> {cls.__qualname__}:")
+        self.lines.append(f"    if type(d) is not dict or not {keySet}.issuperset(d):")
+        self.lines.append("        raise DecodeError(d)")
+        if any(f.default is not dataclasses.MISSING for f in fields):
+            self.lines.append("    get = d.get")
+        args = []
+        for f, key in zip(fields, keys):
+            t = fieldType(cls, f)
+            required = f.default is dataclasses.MISSING
+            var = f"v_{f.name}"
+            if required:
+                self.lines.append(f"    {var} = d[{key!r}]")
+                expr = self.check(t, var, "    ")
+                if expr != var:
+                    self.lines.append(f"    {var} = {expr}")
+            else:
+                self.lines.append(f"    {var} = get({key!r})")
+                self.lines.append(f"    if {var} is not None:")
+                start = len(self.lines)
+                expr = self.check(t, var, "        ")
+                if expr != var:
+                    self.lines.append(f"        {var} = {expr}")
+                if len(self.lines) == start:
+                    self.lines.append("        pass")
+            args.append((f.name, var))
+        # Filling in the fields directly gives the same object as calling __init__,
+        # at about half the cost: the only __post_init__ methods decode typedFields,
+        # which are decoded here already.
+        self.lines.append(f"    o = _new({className(cls)})")
+        if "__slots__" in vars(cls):
+            for name, var in args:
+                self.lines.append(f"    o.{name} = {var}")
+        else:
+            items = ", ".join(f"{name!r}: {var}" for name, var in args)
+            self.lines.append(f"    o.__dict__ = {{{items}}}")
+        self.lines.append("    return o")
+
+    def run(self) -> str:
+        classes = collectClasses()
+        for cls in classes:
+            self.decoder(cls)
+
+        out = [
+            "# This file is generated by generate-decoders.py. Do not edit by hand.",
+            "#",
+            "# Straight-line decoders from JSON dicts to the dataclasses in mnx/__init__.py.",
+            "# They only accept input that the dataclass wizard would decode as is",
+            "# and raise DecodeError on anything else (missing or unknown keys, values",
+            "# that would need converting, ...). Use fromDict and topFromJson, which",
+            "# fall back to the dataclass wizard in that case.",
+            "",
+            "from typing import Any, Callable, Type, TypeVar",
+            "import json",
+            "",
+            "from . import "
+            + ", ".join(sorted({c.__qualname__.split(".")[0] for c in classes})),
+            "",
+            'T = TypeVar("T")',
+            "_new = object.__new__",
+            "",
+            "",
+            "class DecodeError(ValueError):",
+            "    pass",
+            "",
+            "",
+        ]
+        out += [f"{className(c)} = {c.__qualname__}" for c in classes]
+        out += [""]
+        out += self.constants
+        out += self.lines
+        out += ["", ""]
+        out += self.tables
+        out += [
+            "",
+            "",
+            "decoders: dict[type, Callable[[dict], Any]] = {",
+            *[f"    {c.__qualname__}: {decoderName(c)}," for c in classes],
+            "}",
+            "",
+            "",
+            "def fromDict(cls: Type[T], d: dict) -> T:",
+            "    try:",
+            "        return decoders[cls](d)",
+            "    except (DecodeError, KeyError, TypeError, AttributeError):",
+            "        return cls.from_dict(d)  # type: ignore",
+            "",
+            "",
+            "def topFromDict(d: dict) -> Top:",
+            "    return fromDict(Top, d)",
+            "",
+            "",
+            "def topFromJson(s: str) -> Top:",
+            "    return topFromDict(json.loads(s))",
+            "",
+        ]
+        return "\n".join(out)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(Generator().run())
@@ -0,0 +1,188 @@
+# Generates mnx/encoders.py: straight-line dataclass-to-JSON encoders
+# for every class in mnx/__init__.py, the counterpart of mnx/decoders.py.
+#
+# Each encoder returns the JSON text of one object, with the keys from the
+# schema and without the fields that are None. to_json goes through the
+# dataclass wizard's to_dict and json.dumps instead, which takes several
+# times as long as decoding.
+#
+# Usage (from src/), after regenerating mnx/__init__.py:
+#   python3 generate-encoders.py > mnx/encoders.py
+#   black mnx/encoders.py
+
+from typing import Any, Literal, Union, get_args, get_origin
+import dataclasses
+import importlib
+import sys
+
+import mnx
+
+# Shared with the decoder generator, so both cover the same classes.
+decoderGenerator = importlib.import_module("generate-decoders")
+collectClasses = decoderGenerator.collectClasses
+isDataclass = decoderGenerator.isDataclass
+fieldType = decoderGenerator.fieldType
+
+# Classes whose measures writeTop writes one at a time, rather than
+# building the text of all of them first.
+streamedClasses = (mnx.Top.Global, mnx.Top.Part)
+
+
+writeTopSource = """
+
+def writeTop(o: Top, f: TextIO) -> None:
+    # The same document as toJson(o), but the measures of global and of each
+    # part are written one at a time, after the other fields of their object.
+    f.write('{"global":')
+    writeObject(f, encodeTopGlobalHead(o.global_), o.global_.measures, encodeTopGlobalMeasure)
+    f.write(',"mnx":' + encodeTopMnx(o.mnx) + ',"parts":[')
+    for i, part in enumerate(o.parts):
+        if i:
+            f.write(",")
+        writeObject(f, encodeTopPartHead(part), part.measures, encodeTopPartMeasure)
+    f.write("]")
+    if o.scores is not None:
+        f.write(',"scores":' + _any(o.scores))
+    if o.layouts is not None:
+        f.write(',"layouts":' + _any(o.layouts))
+    f.write("}")
+
+
+def writeObject(
+    f: TextIO, head: str, measures: Optional[list], encode: Callable[[Any], str]
+) -> None:
+    # head is the text of the object without its measures, e.g. '{"id":"P1"}'.
+    if measures is None:
+        f.write(head)
+        return
+    f.write(head[:-1] + ("," if head != "{}" else "") + '"measures":[')
+    for i, m in enumerate(measures):
+        f.write("," + encode(m) if i else encode(m))
+    f.write("]}")
+"""
+
+
+def encoderName(cls: type) -> str:
+    return "encode" + cls.__qualname__.replace(".", "")
+
+
+class Generator:
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+
+    def value(self, t: Any, var: str) -> str:
+        # The expression that encodes the value in var, of type t.
+        origin = get_origin(t)
+        if t is bool:
+            return f'("true" if {var} else "false")'
+        if t is int:
+            return f"_int({var})"
+        if t is str:
+            return f"_str({var})"
+        if origin is Literal:
+            kinds = {type(v) for v in get_args(t)}
+            assert len(kinds) == 1, "Mixed literal types are not supported"
+            return self.value(kinds.pop(), var)
+        if isDataclass(t):
+            return f"{encoderName(t)}({var})"
+        if t is list or origin is list:
+            args = get_args(t)
+            if not args:
+                # Untyped list: anything JSON can hold.
+                return f"_any({var})"
+            elem = args[0]
+            if isDataclass(elem):
+                item = f"{encoderName(elem)}(e)"
+            elif get_origin(elem) is Union:
+                # Tagged unions carry their tag as a field, so any member will do.
+                item = "encoders[type(e)](e)"
+            else:
+                item = self.value(elem, "e")
+            return f'"[" + ",".join([{item} for e in {var}]) + "]"'
+        raise NotImplementedError(f"Unsupported type {t!r}")
+
+    def encoder(self, cls: type, name: str, skip: tuple[str, ...] = ()) -> None:
+        fields = [f for f in dataclasses.fields(cls) if f.name not in skip]
+        self.lines.append("")
+        self.lines.append("")
+        self.lines.append(f"def {name}(o: {cls.__qualname__}) -> str:")
+        if not fields:
+            self.lines.append('    return "{}"')
+            return
+        self.lines.append("    p = []")
+        for f in fields:
+            t = fieldType(cls, f)
+            prefix = f'"{f.json.keys[0]}":'
+            self.lines.append(f"    v = o.{f.name}")
+            self.lines.append("    if v is not None:")
+            self.lines.append(f"        p.append({prefix!r} + {self.value(t, 'v')})")
+        self.lines.append('    return "{" + ",".join(p) + "}"')
+
+    def run(self) -> str:
+        classes = collectClasses()
+        for cls in classes:
+            self.encoder(cls, encoderName(cls))
+        for cls in streamedClasses:
+            # The other fields, for writeTop to write before the measures.
+            self.encoder(cls, encoderName(cls) + "Head", ("measures",))
+
+        out = [
+            "# This file is generated by generate-encoders.py. Do not edit by hand.",
+            "#",
+            "# Straight-line encoders from the dataclasses in mnx/__init__.py to JSON text,",
+            "# with the keys from the schema and without the fields that are None.",
+            "# Use toJson, or writeTop to write a whole document to a text file",
+            "# one measure at a time.",
+            "",
+            "from json.encoder import encode_basestring_ascii as _str",
+            "from typing import Any, Callable, Optional, TextIO",
+            "import dataclasses",
+            "import json",
+            "",
+            "from . import "
+            + ", ".join(sorted({c.__qualname__.split(".")[0] for c in classes})),
+            "",
+            "_int = int.__repr__",
+            '_encoder = json.JSONEncoder(separators=(",", ":"))',
+            "",
+            "",
+            "class EncoderTable(dict):",
+            "    # Subclasses, such as the frozen classes of topcache,",
+            "    # use the encoder of the first class they derive from that has one.",
+            "    def __missing__(self, cls: type) -> Callable[[Any], str]:",
+            "        for base in cls.__mro__[1:]:",
+            "            if base in self:",
+            "                self[cls] = self[base]",
+            "                return self[cls]",
+            '        raise TypeError(f"Cannot encode {cls.__name__} as MNX.")',
+            "",
+            "",
+            "def _any(o: Any) -> str:",
+            "    if isinstance(o, (list, tuple)):",
+            '        return "[" + ",".join([_any(e) for e in o]) + "]"',
+            "    if dataclasses.is_dataclass(o):",
+            "        return encoders[type(o)](o)",
+            "    return _encoder.encode(o)",
+        ]
+        out += self.lines
+        out += [
+            "",
+            "",
+            "encoders: dict[type, Callable[[Any], str]] = EncoderTable(",
+            "    {",
+            *[f"        {c.__qualname__}: {encoderName(c)}," for c in classes],
+            "    }",
+            ")",
+            "",
+            "",
+            "def toJson(o: Any) -> str:",
+            "    return _any(o)",
+            "",
+            "",
+        ]
+        out += writeTopSource.splitlines()
+        return "\n".join(out)
+
+
+if __name__ == "__main__":
+    sys.stdout.write(Generator().run())
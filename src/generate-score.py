@@ -0,0 +1,317 @@
+# Generates large random MNX documents for stress-testing the converter.
+#
+# The score is built out of the mnx dataclasses one measure at a time, and each
+# measure is written out before the next one is generated, so documents of
+# hundreds of megabytes take no more memory than a small one.
+# The same seed and settings always give the same document.
+#
+# Usage (from src/):
+#   python3 generate-score.py -o big.json --parts 4 --measures 20000 --seed 1
+#
+# Every event and note gets an id derived from its position, e.g. p0m12v1e3 is
+# the fourth event of the second voice of measure 12 in the first part,
+# and p0m12v1e3n0 its first note. Ties and slurs may cross barlines.
+
+from dataclasses import dataclass
+from typing import Any, Optional, TextIO
+import argparse
+import dataclasses
+import random
+import sys
+
+import mnx
+from mnx.encoders import toJson
+
+# Durations are counted in 32nd notes.
+noteValues: dict[int, tuple[str, int]] = {
+    32: ("whole", 0),
+    24: ("half", 1),
+    16: ("half", 0),
+    12: ("quarter", 1),
+    8: ("quarter", 0),
+    6: ("eighth", 1),
+    4: ("eighth", 0),
+    2: ("16th", 0),
+    1: ("32nd", 0),
+}
+beamCounts: dict[int, int] = {6: 1, 4: 1, 2: 2, 1: 3}
+
+# Rhythms for one beamed beat, by beat length. Runs of 16ths and 32nds become
+# inner beams; a lone 16th next to a dotted eighth becomes a hook.
+beamedBeats: dict[int, list[list[int]]] = {
+    8: [[4, 4], [2, 2, 2, 2], [4, 2, 2], [2, 2, 4], [6, 2], [2, 6], [1, 1, 2, 4]],
+    12: [[4, 4, 4], [2, 2, 4, 4], [4, 2, 2, 4], [6, 2, 4], [4, 4, 2, 1, 1]],
+}
+
+times: list[tuple[int, int]] = [(4, 4), (3, 4), (2, 4), (6, 8)]
+steps = "CDEFGAB"
+
+
+@dataclass
+class Settings:
+    seed: int = 0
+    parts: int = 2
+    measures: int = 32
+    # Sequences in every measure of a part.
+    voices: int = 1
+    # Probabilities, per event unless noted otherwise.
+    chords: float = 0.2
+    ties: float = 0.05
+    slurs: float = 0.1
+    rests: float = 0.05
+    # Per beat.
+    beams: float = 0.5
+    # Per measure.
+    timeChanges: float = 0.02
+    keyChanges: float = 0.02
+
+
+@dataclass
+class VoiceState:
+    # Diatonic position of the last note, octave * 7 + step.
+    position: int
+    # Where the last note was tied to, and its pitch.
+    tieTarget: Optional[str] = None
+    tiePitch: Optional[mnx.DefEvent.Note.Pitch] = None
+    # Event the open slur ends on, if any.
+    slurTarget: Optional[str] = None
+
+
+class ScoreGenerator:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.random = random.Random(settings.seed)
+        self.events = 0
+
+    def run(self, f: TextIO) -> None:
+        s = self.settings
+        globalMeasures = [self.makeGlobalMeasure(i) for i in range(s.measures)]
+        # Length of each measure in 32nds, and of its beats. Beats are dotted
+        # quarters in compound time and quarters otherwise.
+        lengths: list[tuple[int, int]] = []
+        count, unit = 4, 4
+        for m in globalMeasures:
+            if m.time is not None:
+                count, unit = m.time.count, m.time.unit
+            compound = unit == 8 and count % 3 == 0
+            lengths.append((count * 32 // unit, 12 if compound else 8))
+
+        f.write('{"mnx":' + toJson(mnx.Top.Mnx(version=1)))
+        f.write(',"global":{"measures":[')
+        f.write(",".join(toJson(m) for m in globalMeasures))
+        f.write(']},"parts":[')
+        for p in range(s.parts):
+            if p:
+                f.write(",")
+            part = mnx.Top.Part(id=f"P{p + 1}", name=f"Part {p + 1}")
+            f.write(toJson(part)[:-1] + ',"measures":[')
+            voices = [
+                VoiceState(position=(5 if p % 2 == 0 else 3) * 7 - 3 * v)
+                for v in range(s.voices)
+            ]
+            for m in range(s.measures):
+                if m:
+                    f.write(",")
+                f.write(toJson(self.makeMeasure(p, m, lengths, voices)))
+            f.write("]}")
+        f.write("]}")
+
+    def makeGlobalMeasure(self, index: int) -> mnx.Top.Global.Measure:
+        s = self.settings
+        measure = mnx.Top.Global.Measure()
+        if index == 0 or self.random.random() < s.timeChanges:
+            count, unit = self.random.choice(times)
+            measure.time = mnx.Top.Global.Measure.Time(count=count, unit=unit)
+        if index == 0 or self.random.random() < s.keyChanges:
+            measure.key = mnx.Top.Global.Measure.Key(fifths=self.random.randint(-5, 5))
+        return measure
+
+    def makeMeasure(
+        self,
+        p: int,
+        m: int,
+        lengths: list[tuple[int, int]],
+        voices: list[VoiceState],
+    ) -> mnx.Top.Part.Measure:
+        measure = mnx.Top.Part.Measure(sequences=[], beams=[])
+        if m == 0:
+            sign, position = ("G", -2) if p % 2 == 0 else ("F", 2)
+            clef = mnx.Top.Part.Measure.Clef.Clef(sign=sign, staff_position=position)
+            measure.clefs = [mnx.Top.Part.Measure.Clef(clef=clef)]
+        nextMeasure = m + 1 < len(lengths)
+        for v, voice in enumerate(voices):
+            prefix = f"p{p}m{m}v{v}e"
+            rhythm, groups = self.makeRhythm(*lengths[m])
+            content: list[Any] = []
+            for i, units in enumerate(rhythm):
+                # Where ties and slurs starting at this event can end.
+                if i + 1 < len(rhythm):
+                    following = f"{prefix}{i + 1}"
+                elif nextMeasure:
+                    following = f"p{p}m{m + 1}v{v}e0"
+                else:
+                    following = None
+                content.append(
+                    self.makeEvent(f"{prefix}{i}", units, voice, following, rhythm, i)
+                )
+            measure.sequences.append(mnx.Top.Part.Measure.Sequence(content=content))
+            for start, end in groups:
+                ids = [f"{prefix}{i}" for i in range(start, end)]
+                measure.beams.append(self.makeBeam(ids, rhythm[start:end], 1))
+        if not measure.beams:
+            measure.beams = None
+        self.events += sum(len(seq.content) for seq in measure.sequences)
+        return measure
+
+    def makeRhythm(
+        self, length: int, beat: int
+    ) -> tuple[list[int], list[tuple[int, int]]]:
+        # Returns the durations of the events in a measure, and the ranges
+        # of events that are beamed together.
+        rhythm: list[int] = []
+        groups: list[tuple[int, int]] = []
+        remaining = length
+        while remaining > 0:
+            if remaining < beat:
+                rhythm.append(remaining)
+                remaining = 0
+            elif self.random.random() < self.settings.beams:
+                start = len(rhythm)
+                rhythm += self.random.choice(beamedBeats[beat])
+                groups.append((start, len(rhythm)))
+                remaining -= beat
+            else:
+                # One note for one or two beats.
+                units = beat
+                if remaining >= 2 * beat and self.random.random() < 0.3:
+                    units = 2 * beat
+                rhythm.append(units)
+                remaining -= units
+        return rhythm, groups
+
+    def makeEvent(
+        self,
+        ident: str,
+        units: int,
+        voice: VoiceState,
+        following: Optional[str],
+        rhythm: list[int],
+        index: int,
+    ) -> mnx.DefEvent:
+        s = self.settings
+        base, dots = noteValues[units]
+        event = mnx.DefEvent(
+            type="event",
+            id=ident,
+            duration=mnx.DefNoteValue(base=base, dots=dots or None),
+        )
+
+        tied = voice.tieTarget is not None
+        slurEnd = voice.slurTarget == ident
+        if slurEnd:
+            voice.slurTarget = None
+        inBeam = units in beamCounts
+        if not tied and not slurEnd and not inBeam and self.random.random() < s.rests:
+            event.rest = mnx.DefEvent.Rest()
+            return event
+
+        # The first note continues a tie or walks on from the last note.
+        pitches: list[mnx.DefEvent.Note.Pitch]
+        if tied and voice.tiePitch is not None:
+            pitches = [voice.tiePitch]
+        else:
+            voice.position = min(
+                max(voice.position + self.random.randint(-3, 3), 21), 45
+            )
+            pitches = [self.makePitch(voice.position)]
+        voice.tieTarget = voice.tiePitch = None
+        if self.random.random() < s.chords:
+            for interval in self.random.sample([2, 4, 5, 7], self.random.randint(1, 3)):
+                pitches.append(self.makePitch(voice.position + interval))
+
+        event.notes = [
+            mnx.DefEvent.Note(pitch=pitch, id=f"{ident}n{j}")
+            for j, pitch in enumerate(pitches)
+        ]
+
+        if following is not None and self.random.random() < s.ties:
+            event.notes[0].tie = mnx.DefEvent.Note.Tie(target=f"{following}n0")
+            voice.tieTarget = following
+            voice.tiePitch = pitches[0]
+        if (
+            following is not None
+            and voice.slurTarget is None
+            and self.random.random() < s.slurs
+        ):
+            # Slurs end a few events later, or at the start of the next measure.
+            span = self.random.randint(1, 4)
+            if index + span < len(rhythm):
+                target = ident[: ident.rindex("e") + 1] + str(index + span)
+            else:
+                target = following
+            event.slurs = [mnx.DefEvent.Slur(target=target)]
+            voice.slurTarget = target
+        return event
+
+    def makePitch(self, position: int) -> mnx.DefEvent.Note.Pitch:
+        pitch = mnx.DefEvent.Note.Pitch(
+            step=steps[position % 7], octave=position // 7  # type: ignore
+        )
+        if self.random.random() < 0.1:
+            pitch.alter = self.random.choice([-1, 1])
+        return pitch
+
+    def makeBeam(self, ids: list[str], rhythm: list[int], level: int) -> mnx.DefBeam:
+        # Events with more beams than this level form inner beams,
+        # or hooks when they are on their own.
+        beam = mnx.DefBeam(events=ids)
+        runs: list[tuple[int, int]] = []
+        for i, units in enumerate(rhythm):
+            if beamCounts[units] > level:
+                if runs and runs[-1][1] == i:
+                    runs[-1] = (runs[-1][0], i + 1)
+                else:
+                    runs.append((i, i + 1))
+        if any(end - start > 1 for start, end in runs):
+            beam.inner = [
+                self.makeBeam(ids[start:end], rhythm[start:end], level + 1)
+                for start, end in runs
+                if end - start > 1
+            ]
+        elif runs:
+            beam.hooks = [
+                mnx.DefBeam.Hook(
+                    direction="right" if start == 0 else "left", event=ids[start]
+                )
+                for start, _ in runs
+            ]
+        return beam
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    defaults = Settings()
+    parser = argparse.ArgumentParser(description="Generate a random MNX document.")
+    parser.add_argument("-o", "--output", default=None, help="default: stdout")
+    for field in dataclasses.fields(Settings):
+        parser.add_argument(
+            f"--{field.name}", type=field.type, default=getattr(defaults, field.name)
+        )
+    args = parser.parse_args(argv)
+    settings = Settings(
+        **{f.name: getattr(args, f.name) for f in dataclasses.fields(Settings)}
+    )
+
+    generator = ScoreGenerator(settings)
+    if args.output is None:
+        generator.run(sys.stdout)
+    else:
+        with open(args.output, "w") as f:
+            generator.run(f)
+            size = f.tell()
+        print(
+            f"{args.output}: {generator.events} events, {size} bytes", file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,152 @@
+# Generates mnx/tables.py: the constant tables between the enums and markings
+# of mnx-schema.json and their music21 counterparts, for the converter and the writer.
+#
+# The values come from the schema, and the music21 side is found by name
+# wherever music21 follows MNX (note values, clef signs, articulations).
+# Whatever music21 has no counterpart for is left out of the tables, so the
+# converter can tell it apart with a single lookup.
+#
+# Usage (from src/), after updating mnx-schema.json:
+#   python3 generate-tables.py > mnx/tables.py
+#   black mnx/tables.py
+
+from typing import Any
+import dataclasses
+import json
+import sys
+
+from music21 import articulations, clef, duration
+import mnx
+
+schemaPath = "../mnx-schema.json"
+
+# The only enum whose values music21 spells differently.
+slurPlacements = {"up": "above", "down": "below"}
+
+# The markings that become an articulation, in the order the converter
+# has always added them to a note.
+articulationOrder = [
+    "accent",
+    "strongAccent",
+    "breath",
+    "staccato",
+    "staccatissimo",
+    "spiccato",
+    "tenuto",
+    "unstress",
+    "stress",
+]
+
+# Those whose articulation is not named after them. These carry more than
+# the articulation itself, so they are left out of markingNames.
+otherArticulations = {"breath": articulations.BreathMark}
+
+
+def fieldNames(cls: type) -> dict[str, str]:
+    # The MNX key of each field of an mnx dataclass, and the field's name.
+    return {f.json.keys[0]: f.name for f in dataclasses.fields(cls)}
+
+
+def durationType(base: str) -> str:
+    # duplexMaxima is spelled duplex-maxima in music21.
+    return "".join("-" + c.lower() if c.isupper() else c for c in base)
+
+
+def music21Name(cls: type) -> str:
+    return f"{cls.__module__.removeprefix('music21.')}.{cls.__name__}"
+
+
+def mapping(name: str, annotation: str, items: list[tuple[str, str]]) -> list[str]:
+    lines = [f"{name}: Mapping[{annotation}] = MappingProxyType(", "    {"]
+    lines += [f"        {k}: {v}," for k, v in items]
+    lines += ["    }", ")"]
+    return lines
+
+
+def run() -> str:
+    with open(schemaPath) as f:
+        schema: dict[str, Any] = json.load(f)
+    defs = schema["$defs"]
+    partMeasure = schema["properties"]["parts"]["items"]["properties"]["measures"]
+    clefSchema = partMeasure["items"]["properties"]["clefs"]["items"]
+    markingSchema = defs["event"]["properties"]["markings"]
+
+    bases = defs["note-value"]["properties"]["base"]["enum"]
+    types = [(b, durationType(b)) for b in bases]
+    types = [(b, t) for b, t in types if t in duration.typeToDuration]
+
+    signs = clefSchema["properties"]["clef"]["properties"]["sign"]["enum"]
+    clefClasses = [(s, getattr(clef, s + "Clef")) for s in signs]
+
+    # Markings that are nothing but the articulation of the same name.
+    fields = fieldNames(mnx.DefEvent.Markings)
+    plain = {}
+    for key, value in markingSchema["properties"].items():
+        cls = getattr(articulations, key[0].upper() + key[1:], None)
+        if value.get("required") or not isinstance(cls, type):
+            continue
+        if issubclass(cls, articulations.Articulation):
+            plain[key] = cls
+    assert set(plain) | set(otherArticulations) == set(
+        articulationOrder
+    ), "The articulation markings have changed"
+    ordered = [
+        (fields[k], k, plain[k] if k in plain else otherArticulations[k])
+        for k in articulationOrder
+    ]
+
+    sides = defs["slur-side"]["enum"]
+    assert set(sides) == set(slurPlacements), "The slur sides have changed"
+
+    out = [
+        "# This file is generated by generate-tables.py from mnx-schema.json.",
+        "# Do not edit by hand.",
+        "#",
+        "# Constant tables between MNX values and their music21 counterparts.",
+        "# Values that music21 has no counterpart for are left out.",
+        "",
+        "from types import MappingProxyType",
+        "from typing import Mapping",
+        "",
+        "from music21 import articulations, clef",
+        "",
+        "# The music21 duration type of each MNX note value base, from the longest.",
+    ]
+    out += mapping("durationTypes", "str, str", [(repr(b), repr(t)) for b, t in types])
+    out += ["", "# The reverse of durationTypes."]
+    out += mapping("noteValueBases", "str, str", [(repr(t), repr(b)) for b, t in types])
+    out += ["", "# The music21 clef class of each MNX clef sign."]
+    out += mapping(
+        "clefClasses",
+        "str, type[clef.Clef]",
+        [(repr(s), music21Name(c)) for s, c in clefClasses],
+    )
+    out += [
+        "",
+        "# The markings that become a music21 articulation, in the order they are",
+        "# added to a note, as (field of mnx.DefEvent.Markings, articulation class).",
+        "# Breath marks also take the breath symbol.",
+        "articulationFields: tuple[tuple[str, type[articulations.Articulation]], ...] = (",
+    ]
+    out += [f"    ({f!r}, {music21Name(c)})," for f, _, c in ordered]
+    out += [")", "", "# The MNX marking of the articulations that are nothing more."]
+    out += mapping(
+        "markingNames",
+        "type[articulations.Articulation], str",
+        [(music21Name(c), repr(k)) for _, k, c in ordered if k in plain],
+    )
+    out += ["", "# The music21 placement of each MNX slur side."]
+    out += mapping(
+        "slurPlacements",
+        "str, str",
+        [(repr(s), repr(slurPlacements[s])) for s in sides],
+    )
+    out += ["", "# The reverse of slurPlacements."]
+    out += mapping(
+        "slurSides", "str, str", [(repr(slurPlacements[s]), repr(s)) for s in sides]
+    )
+    return "\n".join(out) + "\n"
+
+
+if __name__ == "__main__":
+    sys.stdout.write(run())
@@ -0,0 +1,290 @@
+from typing import Any, Optional
+from music21 import duration, stream
+from music21.common.numberTools import opFrac
+import convert
+import mnx
+
+# Scores whose measures are only converted when something looks inside them,
+# see converter.parse(..., format="mnx", lazy=True).
+#
+# Every part (a LazyPart) gets all of its measures right away, as LazyMeasure objects that
+# already know their number, offset and duration but are otherwise empty.
+# The first time music21 reads the contents of one, the measure is converted,
+# along with every measure it shares a tie, slur or beam with, so that all of
+# its links can be resolved. It then turns into a plain stream.Measure.
+# Links whose other ends are not converted yet stay queued in the converter.
+# Taking a range out of a part or the score with measures(first, last) only
+# converts those measures, and the few before them that set the key, time
+# signature, tempo and clefs that music21 copies to the start of the range.
+#
+# Call materialize to convert everything left at once, e.g. before handing
+# the score to code that should not pay for conversion on first access.
+
+
+def guarded(name: str) -> property:
+    # Stream keeps its contents in these attributes; reading one converts the measure.
+    def get(self: "LazyMeasure") -> Any:
+        d = self.__dict__
+        loader = d.get("mnxLoader")
+        if loader is not None and not loader.busy:
+            loader.complete(self)
+        return d[name]
+
+    def set(self: "LazyMeasure", value: Any) -> None:
+        self.__dict__[name] = value
+
+    return property(get, set)
+
+
+class LazyMeasure(stream.Measure):
+    _elements = guarded("_elements")
+    _endElements = guarded("_endElements")
+    _offsetDict = guarded("_offsetDict")
+
+    mnxLoader: "MeasureLoader"
+    mnxLocation: tuple[int, int]
+
+    def materialize(self) -> None:
+        if "mnxLoader" in self.__dict__:
+            self.mnxLoader.complete(self)
+
+    # Copies get the converted contents. The loader is not copied along.
+    def __deepcopy__(self, memo: Optional[dict] = None) -> stream.Measure:
+        self.materialize()
+        return self.__deepcopy__(memo)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        self.materialize()
+        return self.__reduce_ex__(protocol)
+
+
+class LazyPart(stream.Part):
+    mnxLoader: "MeasureLoader"
+    mnxPart: int
+
+    def measures(
+        self, numberStart: Any, numberEnd: Any, **keywords: Any
+    ) -> stream.Stream:
+        loader = self.__dict__.get("mnxLoader")
+        if loader is None or loader.busy:
+            return super().measures(numberStart, numberEnd, **keywords)
+        allMeasures = list(self.getElementsByClass(stream.Measure))
+        matches = self._getMeasureNumberListByStartEnd(
+            numberStart,
+            numberEnd,
+            indicesNotNumbers=keywords.get("indicesNotNumbers", False),
+        )
+        if matches:
+            first = next(i for i, m in enumerate(allMeasures) if m is matches[0])
+            loader.loadContext(self.mnxPart, first)
+        for outMeas in matches:
+            if isinstance(outMeas, LazyMeasure):
+                outMeas.materialize()
+        # The measures in between, still unconverted, look empty meanwhile.
+        # They have none of what is looked for anyway, see loadContext.
+        loader.busy = True
+        try:
+            excerpt = super().measures(numberStart, numberEnd, **keywords)
+        finally:
+            loader.busy = False
+        # The excerpt is made with self.__class__, but is complete.
+        excerpt.__class__ = stream.Part
+        return excerpt
+
+    def materialize(self) -> None:
+        # Afterwards, the part is a plain stream.Part.
+        if "mnxLoader" in self.__dict__:
+            self.mnxLoader.completeAll()
+        else:
+            self.__class__ = stream.Part
+
+    # Copies get the converted contents. The loader is not copied along.
+    def __deepcopy__(self, memo: Optional[dict] = None) -> stream.Part:
+        self.materialize()
+        return self.__deepcopy__(memo)
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        self.materialize()
+        return self.__reduce_ex__(protocol)
+
+
+class MeasureLoader:
+    def __init__(self, conv: "convert.MNXConverter", top: mnx.Top):
+        self.conv = conv
+        self.top = top
+        self.measures: dict[tuple[int, int], LazyMeasure] = {}
+        self.parts: list[LazyPart] = []
+        self.parsed: set[tuple[int, int]] = set()
+        # Set while converting, so that the converter can fill the measures.
+        self.busy = False
+        # Built on first use by buildIndex.
+        self.where: Optional[dict[str, tuple[int, int]]] = None
+        self.neighbors: dict[tuple[int, int], set[tuple[int, int]]] = {}
+
+    def part(self, p: int) -> LazyPart:
+        outPart = LazyPart()
+        outPart.mnxPart = p
+        outPart.mnxLoader = self
+        self.parts.append(outPart)
+        return outPart
+
+    def shell(
+        self,
+        location: tuple[int, int],
+        inMeas: mnx.Top.Part.Measure,
+        globalMeas: mnx.Top.Global.Measure,
+    ) -> LazyMeasure:
+        outMeas = LazyMeasure()
+        if globalMeas.number is not None:
+            outMeas.number = globalMeas.number
+        outMeas.duration = duration.Duration(self.measureLength(inMeas))
+        outMeas.mnxLocation = location
+        outMeas.mnxLoader = self
+        self.measures[location] = outMeas
+        return outMeas
+
+    def measureLength(self, inMeas: mnx.Top.Part.Measure) -> float:
+        # The duration MNXConverter.parseMeasure ends up with, without converting anything.
+        length = 0.0
+        for seq in inMeas.sequences:
+            offset = 0.0
+            for obj in seq.content:
+                if isinstance(obj, mnx.DefEvent) and obj.duration is not None:
+                    template = self.conv.parseNoteValueTemplate(obj.duration)
+                    offset = opFrac(offset + template.quarterLength)
+                elif isinstance(obj, mnx.Top.Part.Measure.Sequence.ContentChoice4):
+                    offset = opFrac(offset + self.conv.parseSpaceLength(obj))
+            length = max(length, offset)
+        for inClef in inMeas.clefs or ():
+            if inClef.position is not None:
+                length = max(length, self.conv.parseFraction(inClef.position.fraction))
+        return length
+
+    def buildIndex(self) -> None:
+        # Finds out which measures every id is in,
+        # and which measures are linked to each other.
+        self.where = where = {}
+        for p, inPart in enumerate(self.top.parts):
+            for m, inMeas in enumerate(inPart.measures or ()):
+                for event in self.events(inMeas):
+                    if event.id is not None:
+                        where[event.id] = (p, m)
+                    for inNote in event.notes or ():
+                        if inNote.id is not None:
+                            where[inNote.id] = (p, m)
+
+        for p, inPart in enumerate(self.top.parts):
+            for m, inMeas in enumerate(inPart.measures or ()):
+                targets: list[str] = []
+                for event in self.events(inMeas):
+                    for inNote in event.notes or ():
+                        if inNote.tie is not None and inNote.tie.target is not None:
+                            targets.append(inNote.tie.target)
+                    for slur in event.slurs or ():
+                        if slur.target is not None:
+                            targets.append(slur.target)
+                for b in inMeas.beams or ():
+                    # All the measures of a beam are needed to place any part of it.
+                    group = {(p, m)}
+                    for ident in convert.beamEventIds(b):
+                        if ident in where:
+                            group.add(where[ident])
+                    for location in group:
+                        self.neighbors.setdefault(location, set()).update(group)
+                for ident in targets:
+                    if ident in where and where[ident] != (p, m):
+                        self.neighbors.setdefault((p, m), set()).add(where[ident])
+                        self.neighbors.setdefault(where[ident], set()).add((p, m))
+
+    def events(self, inMeas: mnx.Top.Part.Measure) -> list[mnx.DefEvent]:
+        return [
+            obj
+            for seq in inMeas.sequences
+            for obj in seq.content
+            if isinstance(obj, mnx.DefEvent)
+        ]
+
+    def parse(self, location: tuple[int, int]) -> None:
+        if location in self.parsed:
+            return
+        self.parsed.add(location)
+        p, m = location
+        inMeas = self.top.parts[p].measures[m]  # type: ignore
+        globalMeas = self.top.global_.measures[m]  # type: ignore
+        self.conv.parseMeasure(inMeas, globalMeas, self.measures[location])
+
+    def loadContext(self, p: int, m: int) -> None:
+        # Converts the last measures of part p before measure m that set a key,
+        # time signature, tempo or clef: what stream.Stream.measures looks for
+        # before the first measure it returns, when that measure has none.
+        globalMeasures = self.top.global_.measures or []
+        inMeasures = self.top.parts[p].measures or []
+        for sets in (
+            lambda i: globalMeasures[i].key,
+            lambda i: globalMeasures[i].time,
+            lambda i: globalMeasures[i].tempos,
+            lambda i: inMeasures[i].clefs,
+        ):
+            for i in range(m - 1, -1, -1):
+                if sets(i):
+                    if (p, i) in self.measures:
+                        self.complete(self.measures[(p, i)])
+                    break
+
+    def isReady(self, ident: str) -> bool:
+        # Links to ids that do not exist at all are resolved right away,
+        # which raises the same error as a conversion that is not lazy.
+        assert self.where is not None
+        return ident in self.conv.idMappings or ident not in self.where
+
+    def complete(self, outMeas: LazyMeasure) -> None:
+        if self.where is None:
+            self.buildIndex()
+        location = outMeas.mnxLocation
+        self.busy = True
+        try:
+            for other in sorted({location} | self.neighbors.get(location, set())):
+                self.parse(other)
+            self.conv.linkLocal(self.isReady)
+        finally:
+            self.busy = False
+        self.finish(outMeas)
+
+    def completeAll(self) -> None:
+        self.busy = True
+        try:
+            for location in self.measures:
+                self.parse(location)
+            self.conv.linkAll()
+        finally:
+            self.busy = False
+        for outMeas in list(self.measures.values()):
+            if "mnxLoader" in outMeas.__dict__:
+                self.finish(outMeas)
+        # With every measure converted, the parts are plain stream.Part objects too.
+        for outPart in self.parts:
+            del outPart.__dict__["mnxLoader"]
+            del outPart.__dict__["mnxPart"]
+            outPart.__class__ = stream.Part
+        self.parts = []
+
+    def finish(self, outMeas: LazyMeasure) -> None:
+        # From now on, the measure is a plain stream.Measure with a duration of its own.
+        del self.measures[outMeas.mnxLocation]
+        del outMeas.__dict__["mnxLoader"]
+        del outMeas.__dict__["mnxLocation"]
+        outMeas.__class__ = stream.Measure
+        outMeas._unlinkedDuration = None
+
+
+def materialize(sc: stream.Score) -> stream.Score:
+    # Converts every measure of a lazy score that has not been converted yet.
+    loaders: list[MeasureLoader] = []
+    for part in sc.parts:
+        for outMeas in part.getElementsByClass(LazyMeasure):
+            loader = outMeas.__dict__.get("mnxLoader")
+            if loader is not None and loader not in loaders:
+                loaders.append(loader)
+    for loader in loaders:
+        loader.completeAll()
+    return sc
@@ -0,0 +1,166 @@
+from dataclasses import dataclass, field, asdict
+from typing import Iterable, Optional, Union
+import argparse
+import json
+import sys
+import time
+
+from batch import findInputs
+import mnx
+import mnx.decoders
+from topcache import topCache
+
+# Summaries of MNX documents for catalogs, without converting them.
+#
+# Only the global measures and the part headers are decoded: the events, which
+# are nearly all of a document, are parsed as JSON but never turned into mnx
+# objects, and music21 is not imported at all. A document already decoded by the
+# converter (see topcache) is summarized from the cached mnx.Top instead.
+#
+# Measures are given by index, starting from 1 like the measures of
+# converter.parse(..., measures=(first, last)), since measure numbers need not
+# be unique.
+
+
+@dataclass
+class PartSummary:
+    id: Optional[str]
+    name: Optional[str]
+    shortName: Optional[str]
+    staves: int
+    measures: int
+
+
+@dataclass
+class ScoreSummary:
+    version: int
+    measures: int
+    parts: list[PartSummary] = field(default_factory=list)
+    # (measure, fifths)
+    keys: list[tuple[int, int]] = field(default_factory=list)
+    # (measure, "count/unit")
+    times: list[tuple[int, str]] = field(default_factory=list)
+    # (measure, bpm, beat) where the beat is a note value such as "quarter.".
+    tempos: list[tuple[int, int, str]] = field(default_factory=list)
+    # (first measure, last measure, times); times is None unless given.
+    repeats: list[tuple[int, int, Optional[int]]] = field(default_factory=list)
+    # (measure, measures covered, numbers, open); open is None unless given.
+    endings: list[tuple[int, int, list[int], Optional[bool]]] = field(
+        default_factory=list
+    )
+    # (measure, type, location)
+    jumps: list[tuple[int, str, str]] = field(default_factory=list)
+    segnos: list[int] = field(default_factory=list)
+    fines: list[int] = field(default_factory=list)
+
+    def toDict(self) -> dict:
+        return asdict(self)
+
+
+def noteValueName(value: mnx.DefNoteValue) -> str:
+    return value.base + "." * (value.dots or 0)
+
+
+def summarize(
+    version: int,
+    globalInfo: mnx.Top.Global,
+    parts: Iterable[tuple[mnx.Top.Part, int]],
+) -> ScoreSummary:
+    globalMeasures = globalInfo.measures or []
+    summary = ScoreSummary(version, len(globalMeasures))
+    for inPart, measureCount in parts:
+        summary.parts.append(
+            PartSummary(
+                inPart.id,
+                inPart.name,
+                inPart.short_name,
+                inPart.staves or 1,
+                measureCount,
+            )
+        )
+
+    # Repeat ends without a start go back to the beginning, or to the last end.
+    repeatFrom = 1
+    for m, globalMeas in enumerate(globalMeasures, start=1):
+        if globalMeas.key is not None:
+            summary.keys.append((m, globalMeas.key.fifths))
+        if globalMeas.time is not None:
+            summary.times.append((m, f"{globalMeas.time.count}/{globalMeas.time.unit}"))
+        for tempo in globalMeas.tempos or ():
+            summary.tempos.append((m, tempo.bpm, noteValueName(tempo.value)))
+        if globalMeas.repeat_start is not None:
+            repeatFrom = m
+        if globalMeas.repeat_end is not None:
+            summary.repeats.append((repeatFrom, m, globalMeas.repeat_end.times))
+            repeatFrom = m + 1
+        if globalMeas.ending is not None:
+            ending = globalMeas.ending
+            summary.endings.append(
+                (m, ending.duration, list(ending.numbers or ()), ending.open)
+            )
+        if globalMeas.jump is not None:
+            jump = globalMeas.jump
+            summary.jumps.append((m, jump.type, jump.location))
+        if globalMeas.segno is not None:
+            summary.segnos.append(m)
+        if globalMeas.fine is not None:
+            summary.fines.append(m)
+    return summary
+
+
+def scanData(data: Union[str, bytes]) -> ScoreSummary:
+    """
+    Summarizes an MNX document: its parts, measure count, keys, times,
+    tempos and repeat structure.
+    """
+    top = topCache.get(topCache.key(data))
+    if top is not None:
+        return summarize(
+            top.mnx.version,
+            top.global_,
+            ((inPart, len(inPart.measures or ())) for inPart in top.parts),
+        )
+
+    d = json.loads(data)
+    globalInfo = mnx.decoders.fromDict(mnx.Top.Global, d["global"])
+    parts = []
+    for p in d["parts"]:
+        header = mnx.decoders.fromDict(mnx.Top.Part, {**p, "measures": []})
+        parts.append((header, len(p.get("measures") or ())))
+    return summarize(d["mnx"]["version"], globalInfo, parts)
+
+
+def scanFile(path: str) -> ScoreSummary:
+    with open(path, "rb") as f:
+        return scanData(f.read())
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Print the parts, keys, times, tempos and repeats of MNX files."
+    )
+    parser.add_argument("paths", nargs="+", help="MNX files or directories")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    paths = [path for path, _ in findInputs(args.paths)]
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            record = {"path": path, **scanFile(path).toDict()}
+        except Exception as e:
+            failed += 1
+            print(f"{path}: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        print(json.dumps(record))
+    seconds = time.perf_counter() - start
+    print(
+        f"{len(paths)} files ({failed} failed) in {seconds:.2f}s: "
+        f"{len(paths) / max(seconds, 1e-9):.0f} files/s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,16 @@ from datetime import date
 from enum import Enum
 from typing import *
 from dataclass_wizard import JSONWizard, json_field  # type: ignore
+from dataclass_wizard.class_helper import call_meta_initializer_if_needed  # type: ignore
+
+
+def slotted_dataclass(cls):
+    # dataclass(slots=True) builds a new class and only gives it the right
+    # __qualname__ afterwards, so the Meta of nested classes is bound again here.
+    cls = dataclass(slots=True)(cls)
+    call_meta_initializer_if_needed(cls)
+    return cls
+
 
 DefVoiceName: TypeAlias = str
 DefStaffSymbol: TypeAlias = Literal["bracket", "brace", "none"]
@@ -13,12 +23,12 @@ DefStemDirection: TypeAlias = Literal["up", "down"]
 DefId: TypeAlias = str
 
 
-@dataclass
+@slotted_dataclass
 class DefSystemLayoutContentChoice1(JSONWizard):
     class _(JSONWizard.Meta):
         tag = "staff"
 
-    @dataclass
+    @slotted_dataclass
     class Source(JSONWizard):
         # required fields:
         part: DefId = json_field(["part"])
@@ -38,7 +48,7 @@ class DefSystemLayoutContentChoice1(JSONWizard):
     symbol: Optional[DefStaffSymbol] = json_field(["symbol"], default=None)
 
 
-@dataclass
+@slotted_dataclass
 class DefSystemLayoutContentChoice0(JSONWizard):
     class _(JSONWizard.Meta):
         tag = "group"
@@ -65,7 +75,7 @@ DefUpOrDown: TypeAlias = Literal["up", "down"]
 DefPositiveInteger: TypeAlias = int
 
 
-@dataclass
+@slotted_dataclass
 class DefNoteValue(JSONWizard):
     # required fields:
     base: Literal[
@@ -94,12 +104,12 @@ class DefNoteValue(JSONWizard):
 DefSlurSide: TypeAlias = Literal["up", "down"]
 
 
-@dataclass
+@slotted_dataclass
 class DefEvent(JSONWizard):
     class _(JSONWizard.Meta):
         tag = "event"
 
-    @dataclass
+    @slotted_dataclass
     class Slur(JSONWizard):
         # required fields:
         # optional fields:
@@ -113,9 +123,9 @@ class DefEvent(JSONWizard):
         )
         side: Optional[DefSlurSide] = json_field(["side"], default=None)
 
-    @dataclass
+    @slotted_dataclass
     class Note(JSONWizard):
-        @dataclass
+        @slotted_dataclass
         class Tie(JSONWizard):
             # required fields:
             # optional fields:
@@ -124,13 +134,13 @@ class DefEvent(JSONWizard):
             )
             target: Optional[DefId] = json_field(["target"], default=None)
 
-        @dataclass
+        @slotted_dataclass
         class Perform(JSONWizard):
             # required fields:
             # optional fields:
             pass
 
-        @dataclass
+        @slotted_dataclass
         class Pitch(JSONWizard):
             # required fields:
             step: Literal["A", "B", "C", "D", "E", "F", "G"] = json_field(["step"])
@@ -138,7 +148,7 @@ class DefEvent(JSONWizard):
             # optional fields:
             alter: Optional[int] = json_field(["alter"], default=None)
 
-        @dataclass
+        @slotted_dataclass
         class AccidentalDisplay(JSONWizard):
             # required fields:
             show: bool = json_field(["show"])
@@ -159,7 +169,7 @@ class DefEvent(JSONWizard):
         )
         smufl_font: Optional[DefSmuflFont] = json_field(["smuflFont"], default=None)
 
-    @dataclass
+    @slotted_dataclass
     class Rest(JSONWizard):
         # required fields:
         # optional fields:
@@ -167,69 +177,69 @@ class DefEvent(JSONWizard):
             ["staffPosition"], default=None
         )
 
-    @dataclass
+    @slotted_dataclass
     class Markings(JSONWizard):
-        @dataclass
+        @slotted_dataclass
         class Staccatissimo(JSONWizard):
             # required fields:
             # optional fields:
             pass
 
-        @dataclass
+        @slotted_dataclass
         class StrongAccent(JSONWizard):
             # required fields:
             # optional fields:
             pointing: Optional[DefUpOrDown] = json_field(["pointing"], default=None)
 
-        @dataclass
+        @slotted_dataclass
         class SoftAccent(JSONWizard):
             # required fields:
             # optional fields:
             pass
 
-        @dataclass
+        @slotted_dataclass
         class Tremolo(JSONWizard):
             # required fields:
             marks: DefPositiveInteger = json_field(["marks"])
             # optional fields:
 
-        @dataclass
+        @slotted_dataclass
         class Tenuto(JSONWizard):
             # required fields:
             # optional fields:
             pass
 
-        @dataclass
+        @slotted_dataclass
         class Stress(JSONWizard):
             # required fields:
             # optional fields:
             pass
 
-        @dataclass
+        @slotted_dataclass
         class Accent(JSONWizard):
             # required fields:
             # optional fields:
             pointing: Optional[DefUpOrDown] = json_field(["pointing"], default=None)
 
-        @dataclass
+        @slotted_dataclass
         class Staccato(JSONWizard):
             # required fields:
             # optional fields:
             pass
 
-        @dataclass
+        @slotted_dataclass
         class Breath(JSONWizard):
             # required fields:
             # optional fields:
             symbol: Optional[str] = json_field(["symbol"], default=None)
 
-        @dataclass
+        @slotted_dataclass
         class Unstress(JSONWizard):
             # required fields:
             # optional fields:
             pass
 
-        @dataclass
+        @slotted_dataclass
         class Spiccato(JSONWizard):
             # required fields:
             # optional fields:
@@ -275,9 +285,9 @@ DefTupletDisplaySetting: TypeAlias = Literal["none", "inner", "both"]
 DefBeamList: TypeAlias = list
 
 
-@dataclass
+@slotted_dataclass
 class DefBeam(JSONWizard):
-    @dataclass
+    @slotted_dataclass
     class Hook(JSONWizard):
         # required fields:
         direction: Literal["left", "right"] = json_field(["direction"])
@@ -291,8 +301,18 @@ class DefBeam(JSONWizard):
     # inner: Optional[DefBeamList] = json_field(["inner"], default=None)
     inner: Optional[list] = json_field(["inner"], default=None)
 
+    def __post_init__(self):
+        # The dataclass wizard leaves the untyped inner beams as dicts.
+        self.inner = decodeBeamList(self.inner)
+
 
-@dataclass
+def decodeBeamList(beams: Optional[list]) -> Optional[list[DefBeam]]:
+    if beams is None:
+        return None
+    return [b if isinstance(b, DefBeam) else DefBeam.from_dict(b) for b in beams]
+
+
+@slotted_dataclass
 class DefNoteValueQuantity(JSONWizard):
     # required fields:
     multiple: DefPositiveInteger = json_field(["multiple"])
@@ -305,20 +325,20 @@ DefMeasureLocation: TypeAlias = str
 DefIntegerUnsigned: TypeAlias = int
 
 
-@dataclass
+@slotted_dataclass
 class Top(JSONWizard):
-    @dataclass
+    @slotted_dataclass
     class Global(JSONWizard):
-        @dataclass
+        @slotted_dataclass
         class Style(JSONWizard):
             # required fields:
             selector: str = json_field(["selector"])
             # optional fields:
             color: Optional[DefColor] = json_field(["color"], default=None)
 
-        @dataclass
+        @slotted_dataclass
         class Measure(JSONWizard):
-            @dataclass
+            @slotted_dataclass
             class Segno(JSONWizard):
                 # required fields:
                 location: DefMeasureLocation = json_field(["location"])
@@ -327,7 +347,7 @@ class Top(JSONWizard):
                 color: Optional[DefColor] = json_field(["color"], default=None)
                 glyph: Optional[DefSmuflGlyph] = json_field(["glyph"], default=None)
 
-            @dataclass
+            @slotted_dataclass
             class Barline(JSONWizard):
                 class _(JSONWizard.Meta):
                     tag = "regular"
@@ -348,14 +368,14 @@ class Top(JSONWizard):
                 ] = json_field(["type"])
                 # optional fields:
 
-            @dataclass
+            @slotted_dataclass
             class Time(JSONWizard):
                 # required fields:
                 unit: Literal[1, 2, 4, 8, 16, 32, 64, 128] = json_field(["unit"])
                 count: DefPositiveInteger = json_field(["count"])
                 # optional fields:
 
-            @dataclass
+            @slotted_dataclass
             class Tempo(JSONWizard):
                 # required fields:
                 bpm: int = json_field(["bpm"])
@@ -365,7 +385,7 @@ class Top(JSONWizard):
                     ["location"], default=None
                 )
 
-            @dataclass
+            @slotted_dataclass
             class Key(JSONWizard):
                 # required fields:
                 fifths: int = json_field(["fifths"])
@@ -373,7 +393,7 @@ class Top(JSONWizard):
                 class_: Optional[DefStyleClass] = json_field(["class"], default=None)
                 color: Optional[DefColor] = json_field(["color"], default=None)
 
-            @dataclass
+            @slotted_dataclass
             class Fine(JSONWizard):
                 # required fields:
                 location: DefMeasureLocation = json_field(["location"])
@@ -381,7 +401,7 @@ class Top(JSONWizard):
                 class_: Optional[DefStyleClass] = json_field(["class"], default=None)
                 color: Optional[DefColor] = json_field(["color"], default=None)
 
-            @dataclass
+            @slotted_dataclass
             class Ending(JSONWizard):
                 # required fields:
                 duration: int = json_field(["duration"])
@@ -391,13 +411,13 @@ class Top(JSONWizard):
                 open: Optional[bool] = json_field(["open"], default=None)
                 color: Optional[DefColor] = json_field(["color"], default=None)
 
-            @dataclass
+            @slotted_dataclass
             class RepeatStart(JSONWizard):
                 # required fields:
                 # optional fields:
                 pass
 
-            @dataclass
+            @slotted_dataclass
             class Jump(JSONWizard):
                 class _(JSONWizard.Meta):
                     tag = "dsalfine"
@@ -407,7 +427,7 @@ class Top(JSONWizard):
                 type: Literal["dsalfine", "segno"] = json_field(["type"])
                 # optional fields:
 
-            @dataclass
+            @slotted_dataclass
             class RepeatEnd(JSONWizard):
                 # required fields:
                 # optional fields:
@@ -435,20 +455,20 @@ class Top(JSONWizard):
         # optional fields:
         styles: Optional[list[Style]] = json_field(["styles"], default=None)
 
-    @dataclass
+    @slotted_dataclass
     class Layout(JSONWizard):
         # required fields:
         content: DefSystemLayoutContent = json_field(["content"])
         id: DefId = json_field(["id"])
         # optional fields:
 
-    @dataclass
+    @slotted_dataclass
     class Part(JSONWizard):
-        @dataclass
+        @slotted_dataclass
         class Measure(JSONWizard):
-            @dataclass
+            @slotted_dataclass
             class Clef(JSONWizard):
-                @dataclass
+                @slotted_dataclass
                 class Position(JSONWizard):
                     # required fields:
                     fraction: list[DefIntegerUnsigned] = json_field(["fraction"])
@@ -457,7 +477,7 @@ class Top(JSONWizard):
                         ["graceIndex"], default=None
                     )
 
-                @dataclass
+                @slotted_dataclass
                 class Clef(JSONWizard):
                     # required fields:
                     staff_position: DefStaffPosition = json_field(["staffPosition"])
@@ -475,9 +495,9 @@ class Top(JSONWizard):
                 # optional fields:
                 position: Optional[Position] = json_field(["position"], default=None)
 
-            @dataclass
+            @slotted_dataclass
             class Sequence(JSONWizard):
-                @dataclass
+                @slotted_dataclass
                 class ContentChoice5(JSONWizard):
                     class _(JSONWizard.Meta):
                         tag = "dynamic"
@@ -488,7 +508,7 @@ class Top(JSONWizard):
                     # optional fields:
                     glyph: Optional[DefSmuflGlyph] = json_field(["glyph"], default=None)
 
-                @dataclass
+                @slotted_dataclass
                 class ContentChoice2(JSONWizard):
                     class _(JSONWizard.Meta):
                         tag = "tuplet"
@@ -515,7 +535,7 @@ class Top(JSONWizard):
                         ["showValue"], default=None
                     )
 
-                @dataclass
+                @slotted_dataclass
                 class ContentChoice3(JSONWizard):
                     class _(JSONWizard.Meta):
                         tag = "octave-shift"
@@ -532,7 +552,7 @@ class Top(JSONWizard):
                         ["staff"], default=None
                     )
 
-                @dataclass
+                @slotted_dataclass
                 class ContentChoice4(JSONWizard):
                     class _(JSONWizard.Meta):
                         tag = "space"
@@ -542,7 +562,7 @@ class Top(JSONWizard):
                     type: Literal["space"] = json_field(["type"])
                     # optional fields:
 
-                @dataclass
+                @slotted_dataclass
                 class ContentChoice1(JSONWizard):
                     class _(JSONWizard.Meta):
                         tag = "grace"
@@ -582,6 +602,9 @@ class Top(JSONWizard):
             beams: Optional[DefBeamList] = json_field(["beams"], default=None)
             clefs: Optional[list[Clef]] = json_field(["clefs"], default=None)
 
+            def __post_init__(self):
+                self.beams = decodeBeamList(self.beams)
+
         # required fields:
         # optional fields:
         smufl_font: Optional[DefSmuflFont] = json_field(["smuflFont"], default=None)
@@ -591,15 +614,15 @@ class Top(JSONWizard):
         short_name: Optional[str] = json_field(["shortName"], default=None)
         staves: Optional[int] = json_field(["staves"], default=None)
 
-    @dataclass
+    @slotted_dataclass
     class Mnx(JSONWizard):
         # required fields:
         version: int = json_field(["version"])
         # optional fields:
 
-    @dataclass
+    @slotted_dataclass
     class Score(JSONWizard):
-        @dataclass
+        @slotted_dataclass
         class MultimeasureRest(JSONWizard):
             # required fields:
             start: DefMeasureNumber = json_field(["start"])
@@ -607,11 +630,11 @@ class Top(JSONWizard):
             # optional fields:
             label: Optional[str] = json_field(["label"], default=None)
 
-        @dataclass
+        @slotted_dataclass
         class Page(JSONWizard):
-            @dataclass
+            @slotted_dataclass
             class System(JSONWizard):
-                @dataclass
+                @slotted_dataclass
                 class LayoutChange(JSONWizard):
                     # required fields:
                     layout: DefId = json_field(["layout"])
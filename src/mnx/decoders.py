@@ -0,0 +1,1686 @@
+# This file is generated by generate-decoders.py. Do not edit by hand.
+#
+# Straight-line decoders from JSON dicts to the dataclasses in mnx/__init__.py.
+# They only accept input that the dataclass wizard would decode as is
+# and raise DecodeError on anything else (missing or unknown keys, values
+# that would need converting, ...). Use fromDict and topFromJson, which
+# fall back to the dataclass wizard in that case.
+
+from typing import Any, Callable, Type, TypeVar
+import json
+
+from . import (
+    DefBeam,
+    DefEvent,
+    DefNoteValue,
+    DefNoteValueQuantity,
+    DefSystemLayoutContentChoice0,
+    DefSystemLayoutContentChoice1,
+    Top,
+)
+
+T = TypeVar("T")
+_new = object.__new__
+
+
+class DecodeError(ValueError):
+    pass
+
+
+_DefSystemLayoutContentChoice1 = DefSystemLayoutContentChoice1
+_DefSystemLayoutContentChoice1Source = DefSystemLayoutContentChoice1.Source
+_DefSystemLayoutContentChoice0 = DefSystemLayoutContentChoice0
+_DefNoteValue = DefNoteValue
+_DefEvent = DefEvent
+_DefEventSlur = DefEvent.Slur
+_DefEventNote = DefEvent.Note
+_DefEventNoteTie = DefEvent.Note.Tie
+_DefEventNotePerform = DefEvent.Note.Perform
+_DefEventNotePitch = DefEvent.Note.Pitch
+_DefEventNoteAccidentalDisplay = DefEvent.Note.AccidentalDisplay
+_DefEventRest = DefEvent.Rest
+_DefEventMarkings = DefEvent.Markings
+_DefEventMarkingsStaccatissimo = DefEvent.Markings.Staccatissimo
+_DefEventMarkingsStrongAccent = DefEvent.Markings.StrongAccent
+_DefEventMarkingsSoftAccent = DefEvent.Markings.SoftAccent
+_DefEventMarkingsTremolo = DefEvent.Markings.Tremolo
+_DefEventMarkingsTenuto = DefEvent.Markings.Tenuto
+_DefEventMarkingsStress = DefEvent.Markings.Stress
+_DefEventMarkingsAccent = DefEvent.Markings.Accent
+_DefEventMarkingsStaccato = DefEvent.Markings.Staccato
+_DefEventMarkingsBreath = DefEvent.Markings.Breath
+_DefEventMarkingsUnstress = DefEvent.Markings.Unstress
+_DefEventMarkingsSpiccato = DefEvent.Markings.Spiccato
+_DefBeam = DefBeam
+_DefBeamHook = DefBeam.Hook
+_DefNoteValueQuantity = DefNoteValueQuantity
+_Top = Top
+_TopGlobal = Top.Global
+_TopGlobalStyle = Top.Global.Style
+_TopGlobalMeasure = Top.Global.Measure
+_TopGlobalMeasureSegno = Top.Global.Measure.Segno
+_TopGlobalMeasureBarline = Top.Global.Measure.Barline
+_TopGlobalMeasureTime = Top.Global.Measure.Time
+_TopGlobalMeasureTempo = Top.Global.Measure.Tempo
+_TopGlobalMeasureKey = Top.Global.Measure.Key
+_TopGlobalMeasureFine = Top.Global.Measure.Fine
+_TopGlobalMeasureEnding = Top.Global.Measure.Ending
+_TopGlobalMeasureRepeatStart = Top.Global.Measure.RepeatStart
+_TopGlobalMeasureJump = Top.Global.Measure.Jump
+_TopGlobalMeasureRepeatEnd = Top.Global.Measure.RepeatEnd
+_TopLayout = Top.Layout
+_TopPart = Top.Part
+_TopPartMeasure = Top.Part.Measure
+_TopPartMeasureClef = Top.Part.Measure.Clef
+_TopPartMeasureClefPosition = Top.Part.Measure.Clef.Position
+_TopPartMeasureClefClef = Top.Part.Measure.Clef.Clef
+_TopPartMeasureSequence = Top.Part.Measure.Sequence
+_TopPartMeasureSequenceContentChoice5 = Top.Part.Measure.Sequence.ContentChoice5
+_TopPartMeasureSequenceContentChoice2 = Top.Part.Measure.Sequence.ContentChoice2
+_TopPartMeasureSequenceContentChoice3 = Top.Part.Measure.Sequence.ContentChoice3
+_TopPartMeasureSequenceContentChoice4 = Top.Part.Measure.Sequence.ContentChoice4
+_TopPartMeasureSequenceContentChoice1 = Top.Part.Measure.Sequence.ContentChoice1
+_TopMnx = Top.Mnx
+_TopScore = Top.Score
+_TopScoreMultimeasureRest = Top.Score.MultimeasureRest
+_TopScorePage = Top.Score.Page
+_TopScorePageSystem = Top.Score.Page.System
+_TopScorePageSystemLayoutChange = Top.Score.Page.System.LayoutChange
+
+_keys0 = frozenset(("sources", "type", "labelref", "label", "symbol"))
+_literals1 = frozenset(("staff",))
+_literals2 = frozenset(("bracket", "brace", "none"))
+_keys3 = frozenset(("part", "stem", "staff", "label", "voice", "labelref"))
+_literals4 = frozenset(("up", "down"))
+_keys5 = frozenset(("type", "content", "label", "symbol"))
+_literals6 = frozenset(("group",))
+_keys7 = frozenset(("base", "dots"))
+_literals8 = frozenset(
+    (
+        "duplexMaxima",
+        "maxima",
+        "longa",
+        "breve",
+        "whole",
+        "half",
+        "quarter",
+        "eighth",
+        "16th",
+        "32nd",
+        "64th",
+        "128th",
+        "256th",
+        "512th",
+        "1024th",
+        "2048th",
+        "4096th",
+    )
+)
+_keys9 = frozenset(
+    (
+        "type",
+        "staff",
+        "stemDirection",
+        "duration",
+        "smuflFont",
+        "measure",
+        "rest",
+        "orient",
+        "id",
+        "markings",
+        "notes",
+        "slurs",
+    )
+)
+_literals10 = frozenset(("event",))
+_keys11 = frozenset(
+    ("target", "lineType", "sideEnd", "startNote", "endNote", "location", "side")
+)
+_keys12 = frozenset(
+    (
+        "pitch",
+        "class",
+        "perform",
+        "tie",
+        "staff",
+        "id",
+        "accidentalDisplay",
+        "smuflFont",
+    )
+)
+_keys13 = frozenset(("location", "target"))
+_keys14 = frozenset(())
+_keys15 = frozenset(("step", "octave", "alter"))
+_literals16 = frozenset(("A", "B", "C", "D", "E", "F", "G"))
+_keys17 = frozenset(("show", "editorial", "cautionary"))
+_keys18 = frozenset(("staffPosition",))
+_keys19 = frozenset(
+    (
+        "softAccent",
+        "staccato",
+        "tenuto",
+        "breath",
+        "unstress",
+        "strongAccent",
+        "accent",
+        "stress",
+        "tremolo",
+        "staccatissimo",
+        "spiccato",
+    )
+)
+_keys20 = frozenset(("pointing",))
+_keys21 = frozenset(("marks",))
+_keys22 = frozenset(("symbol",))
+_keys23 = frozenset(("events", "hooks", "inner"))
+_keys24 = frozenset(("direction", "event"))
+_literals25 = frozenset(("left", "right"))
+_keys26 = frozenset(("multiple", "duration"))
+_keys27 = frozenset(("global", "mnx", "parts", "scores", "layouts"))
+_keys28 = frozenset(("measures", "styles"))
+_keys29 = frozenset(("selector", "color"))
+_keys30 = frozenset(
+    (
+        "jump",
+        "fine",
+        "tempos",
+        "ending",
+        "number",
+        "barline",
+        "index",
+        "repeatStart",
+        "time",
+        "key",
+        "segno",
+        "repeatEnd",
+    )
+)
+_keys31 = frozenset(("location", "class", "color", "glyph"))
+_keys32 = frozenset(("type",))
+_literals33 = frozenset(
+    (
+        "regular",
+        "dotted",
+        "dashed",
+        "heavy",
+        "light-light",
+        "light-heavy",
+        "heavy-light",
+        "heavy-heavy",
+        "tick",
+        "short",
+        "none",
+    )
+)
+_keys34 = frozenset(("unit", "count"))
+_literals35 = frozenset((1, 2, 4, 8, 16, 32, 64, 128))
+_keys36 = frozenset(("bpm", "value", "location"))
+_keys37 = frozenset(("fifths", "class", "color"))
+_keys38 = frozenset(("location", "class", "color"))
+_keys39 = frozenset(("duration", "numbers", "class", "open", "color"))
+_keys40 = frozenset(("location", "type"))
+_literals41 = frozenset(("dsalfine", "segno"))
+_keys42 = frozenset(("times",))
+_keys43 = frozenset(("content", "id"))
+_keys45 = frozenset(("smuflFont", "id", "measures", "name", "shortName", "staves"))
+_keys46 = frozenset(("sequences", "beams", "clefs"))
+_keys47 = frozenset(("clef", "position"))
+_keys48 = frozenset(("fraction", "graceIndex"))
+_keys49 = frozenset(("staffPosition", "sign", "color", "glyph", "class", "octave"))
+_literals50 = frozenset(("C", "F", "G"))
+_keys51 = frozenset(("content", "staff", "voice", "orient"))
+_keys53 = frozenset(("type", "value", "glyph"))
+_literals54 = frozenset(("dynamic",))
+_keys55 = frozenset(
+    (
+        "inner",
+        "type",
+        "outer",
+        "content",
+        "staff",
+        "orient",
+        "bracket",
+        "showNumber",
+        "showValue",
+    )
+)
+_literals56 = frozenset(("tuplet",))
+_literals57 = frozenset(("yes", "no", "auto"))
+_literals58 = frozenset(("none", "inner", "both"))
+_keys59 = frozenset(("type", "value", "end", "orient", "staff"))
+_literals60 = frozenset(("octave-shift",))
+_keys61 = frozenset(("duration", "type"))
+_literals62 = frozenset(("space",))
+_keys63 = frozenset(("type", "content", "slash", "color", "class", "graceType"))
+_literals64 = frozenset(("grace",))
+_literals65 = frozenset(("makeTime", "stealFollowing", "stealPrevious"))
+_keys66 = frozenset(("version",))
+_keys67 = frozenset(("name", "multimeasureRests", "layout", "pages"))
+_keys68 = frozenset(("start", "duration", "label"))
+_keys69 = frozenset(("systems", "layout"))
+_keys70 = frozenset(("measure", "layoutChanges", "layout"))
+_keys71 = frozenset(("layout", "location"))
+
+
+def decodeDefSystemLayoutContentChoice1(d: dict) -> DefSystemLayoutContentChoice1:
+    if type(d) is not dict or not _keys0.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_sources = d["sources"]
+    if type(v_sources) is not list:
+        raise DecodeError(v_sources)
+    v_sources = [decodeDefSystemLayoutContentChoice1Source(e) for e in v_sources]
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals1:
+        raise DecodeError(v_type)
+    v_labelref = get("labelref")
+    if v_labelref is not None:
+        if type(v_labelref) is not str:
+            raise DecodeError(v_labelref)
+    v_label = get("label")
+    if v_label is not None:
+        if type(v_label) is not str:
+            raise DecodeError(v_label)
+    v_symbol = get("symbol")
+    if v_symbol is not None:
+        if type(v_symbol) is not str or v_symbol not in _literals2:
+            raise DecodeError(v_symbol)
+    o = _new(_DefSystemLayoutContentChoice1)
+    o.sources = v_sources
+    o.type = v_type
+    o.labelref = v_labelref
+    o.label = v_label
+    o.symbol = v_symbol
+    return o
+
+
+def decodeDefSystemLayoutContentChoice1Source(
+    d: dict,
+) -> DefSystemLayoutContentChoice1.Source:
+    if type(d) is not dict or not _keys3.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_part = d["part"]
+    if type(v_part) is not str:
+        raise DecodeError(v_part)
+    v_stem = get("stem")
+    if v_stem is not None:
+        if type(v_stem) is not str or v_stem not in _literals4:
+            raise DecodeError(v_stem)
+    v_staff = get("staff")
+    if v_staff is not None:
+        if type(v_staff) is not int:
+            raise DecodeError(v_staff)
+    v_label = get("label")
+    if v_label is not None:
+        if type(v_label) is not str:
+            raise DecodeError(v_label)
+    v_voice = get("voice")
+    if v_voice is not None:
+        if type(v_voice) is not str:
+            raise DecodeError(v_voice)
+    v_labelref = get("labelref")
+    if v_labelref is not None:
+        if type(v_labelref) is not str:
+            raise DecodeError(v_labelref)
+    o = _new(_DefSystemLayoutContentChoice1Source)
+    o.part = v_part
+    o.stem = v_stem
+    o.staff = v_staff
+    o.label = v_label
+    o.voice = v_voice
+    o.labelref = v_labelref
+    return o
+
+
+def decodeDefSystemLayoutContentChoice0(d: dict) -> DefSystemLayoutContentChoice0:
+    if type(d) is not dict or not _keys5.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals6:
+        raise DecodeError(v_type)
+    v_content = d["content"]
+    if type(v_content) is not list:
+        raise DecodeError(v_content)
+    v_content = list(v_content)
+    v_label = get("label")
+    if v_label is not None:
+        if type(v_label) is not str:
+            raise DecodeError(v_label)
+    v_symbol = get("symbol")
+    if v_symbol is not None:
+        if type(v_symbol) is not str or v_symbol not in _literals2:
+            raise DecodeError(v_symbol)
+    o = _new(_DefSystemLayoutContentChoice0)
+    o.type = v_type
+    o.content = v_content
+    o.label = v_label
+    o.symbol = v_symbol
+    return o
+
+
+def decodeDefNoteValue(d: dict) -> DefNoteValue:
+    if type(d) is not dict or not _keys7.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_base = d["base"]
+    if type(v_base) is not str or v_base not in _literals8:
+        raise DecodeError(v_base)
+    v_dots = get("dots")
+    if v_dots is not None:
+        if type(v_dots) is not int:
+            raise DecodeError(v_dots)
+    o = _new(_DefNoteValue)
+    o.base = v_base
+    o.dots = v_dots
+    return o
+
+
+def decodeDefEvent(d: dict) -> DefEvent:
+    if type(d) is not dict or not _keys9.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals10:
+        raise DecodeError(v_type)
+    v_staff = get("staff")
+    if v_staff is not None:
+        if type(v_staff) is not int:
+            raise DecodeError(v_staff)
+    v_stem_direction = get("stemDirection")
+    if v_stem_direction is not None:
+        if type(v_stem_direction) is not str or v_stem_direction not in _literals4:
+            raise DecodeError(v_stem_direction)
+    v_duration = get("duration")
+    if v_duration is not None:
+        v_duration = decodeDefNoteValue(v_duration)
+    v_smufl_font = get("smuflFont")
+    if v_smufl_font is not None:
+        if type(v_smufl_font) is not str:
+            raise DecodeError(v_smufl_font)
+    v_measure = get("measure")
+    if v_measure is not None:
+        if type(v_measure) is not bool:
+            raise DecodeError(v_measure)
+    v_rest = get("rest")
+    if v_rest is not None:
+        v_rest = decodeDefEventRest(v_rest)
+    v_orient = get("orient")
+    if v_orient is not None:
+        if type(v_orient) is not str:
+            raise DecodeError(v_orient)
+    v_id = get("id")
+    if v_id is not None:
+        if type(v_id) is not str:
+            raise DecodeError(v_id)
+    v_markings = get("markings")
+    if v_markings is not None:
+        v_markings = decodeDefEventMarkings(v_markings)
+    v_notes = get("notes")
+    if v_notes is not None:
+        if type(v_notes) is not list:
+            raise DecodeError(v_notes)
+        v_notes = [decodeDefEventNote(e) for e in v_notes]
+    v_slurs = get("slurs")
+    if v_slurs is not None:
+        if type(v_slurs) is not list:
+            raise DecodeError(v_slurs)
+        v_slurs = [decodeDefEventSlur(e) for e in v_slurs]
+    o = _new(_DefEvent)
+    o.type = v_type
+    o.staff = v_staff
+    o.stem_direction = v_stem_direction
+    o.duration = v_duration
+    o.smufl_font = v_smufl_font
+    o.measure = v_measure
+    o.rest = v_rest
+    o.orient = v_orient
+    o.id = v_id
+    o.markings = v_markings
+    o.notes = v_notes
+    o.slurs = v_slurs
+    return o
+
+
+def decodeDefEventSlur(d: dict) -> DefEvent.Slur:
+    if type(d) is not dict or not _keys11.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_target = get("target")
+    if v_target is not None:
+        if type(v_target) is not str:
+            raise DecodeError(v_target)
+    v_line_type = get("lineType")
+    if v_line_type is not None:
+        if type(v_line_type) is not str:
+            raise DecodeError(v_line_type)
+    v_side_end = get("sideEnd")
+    if v_side_end is not None:
+        if type(v_side_end) is not str or v_side_end not in _literals4:
+            raise DecodeError(v_side_end)
+    v_start_note = get("startNote")
+    if v_start_note is not None:
+        if type(v_start_note) is not str:
+            raise DecodeError(v_start_note)
+    v_end_note = get("endNote")
+    if v_end_note is not None:
+        if type(v_end_note) is not str:
+            raise DecodeError(v_end_note)
+    v_location = get("location")
+    if v_location is not None:
+        if type(v_location) is not str:
+            raise DecodeError(v_location)
+    v_side = get("side")
+    if v_side is not None:
+        if type(v_side) is not str or v_side not in _literals4:
+            raise DecodeError(v_side)
+    o = _new(_DefEventSlur)
+    o.target = v_target
+    o.line_type = v_line_type
+    o.side_end = v_side_end
+    o.start_note = v_start_note
+    o.end_note = v_end_note
+    o.location = v_location
+    o.side = v_side
+    return o
+
+
+def decodeDefEventNote(d: dict) -> DefEvent.Note:
+    if type(d) is not dict or not _keys12.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_pitch = d["pitch"]
+    v_pitch = decodeDefEventNotePitch(v_pitch)
+    v_class_ = get("class")
+    if v_class_ is not None:
+        if type(v_class_) is not str:
+            raise DecodeError(v_class_)
+    v_perform = get("perform")
+    if v_perform is not None:
+        v_perform = decodeDefEventNotePerform(v_perform)
+    v_tie = get("tie")
+    if v_tie is not None:
+        v_tie = decodeDefEventNoteTie(v_tie)
+    v_staff = get("staff")
+    if v_staff is not None:
+        if type(v_staff) is not int:
+            raise DecodeError(v_staff)
+    v_id = get("id")
+    if v_id is not None:
+        if type(v_id) is not str:
+            raise DecodeError(v_id)
+    v_accidental_display = get("accidentalDisplay")
+    if v_accidental_display is not None:
+        v_accidental_display = decodeDefEventNoteAccidentalDisplay(v_accidental_display)
+    v_smufl_font = get("smuflFont")
+    if v_smufl_font is not None:
+        if type(v_smufl_font) is not str:
+            raise DecodeError(v_smufl_font)
+    o = _new(_DefEventNote)
+    o.pitch = v_pitch
+    o.class_ = v_class_
+    o.perform = v_perform
+    o.tie = v_tie
+    o.staff = v_staff
+    o.id = v_id
+    o.accidental_display = v_accidental_display
+    o.smufl_font = v_smufl_font
+    return o
+
+
+def decodeDefEventNoteTie(d: dict) -> DefEvent.Note.Tie:
+    if type(d) is not dict or not _keys13.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_location = get("location")
+    if v_location is not None:
+        if type(v_location) is not str:
+            raise DecodeError(v_location)
+    v_target = get("target")
+    if v_target is not None:
+        if type(v_target) is not str:
+            raise DecodeError(v_target)
+    o = _new(_DefEventNoteTie)
+    o.location = v_location
+    o.target = v_target
+    return o
+
+
+def decodeDefEventNotePerform(d: dict) -> DefEvent.Note.Perform:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventNotePerform)
+    return o
+
+
+def decodeDefEventNotePitch(d: dict) -> DefEvent.Note.Pitch:
+    if type(d) is not dict or not _keys15.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_step = d["step"]
+    if type(v_step) is not str or v_step not in _literals16:
+        raise DecodeError(v_step)
+    v_octave = d["octave"]
+    if type(v_octave) is not int:
+        raise DecodeError(v_octave)
+    v_alter = get("alter")
+    if v_alter is not None:
+        if type(v_alter) is not int:
+            raise DecodeError(v_alter)
+    o = _new(_DefEventNotePitch)
+    o.step = v_step
+    o.octave = v_octave
+    o.alter = v_alter
+    return o
+
+
+def decodeDefEventNoteAccidentalDisplay(d: dict) -> DefEvent.Note.AccidentalDisplay:
+    if type(d) is not dict or not _keys17.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_show = d["show"]
+    if type(v_show) is not bool:
+        raise DecodeError(v_show)
+    v_editorial = get("editorial")
+    if v_editorial is not None:
+        if type(v_editorial) is not bool:
+            raise DecodeError(v_editorial)
+    v_cautionary = get("cautionary")
+    if v_cautionary is not None:
+        if type(v_cautionary) is not bool:
+            raise DecodeError(v_cautionary)
+    o = _new(_DefEventNoteAccidentalDisplay)
+    o.show = v_show
+    o.editorial = v_editorial
+    o.cautionary = v_cautionary
+    return o
+
+
+def decodeDefEventRest(d: dict) -> DefEvent.Rest:
+    if type(d) is not dict or not _keys18.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_staff_position = get("staffPosition")
+    if v_staff_position is not None:
+        if type(v_staff_position) is not int:
+            raise DecodeError(v_staff_position)
+    o = _new(_DefEventRest)
+    o.staff_position = v_staff_position
+    return o
+
+
+def decodeDefEventMarkings(d: dict) -> DefEvent.Markings:
+    if type(d) is not dict or not _keys19.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_soft_accent = get("softAccent")
+    if v_soft_accent is not None:
+        v_soft_accent = decodeDefEventMarkingsSoftAccent(v_soft_accent)
+    v_staccato = get("staccato")
+    if v_staccato is not None:
+        v_staccato = decodeDefEventMarkingsStaccato(v_staccato)
+    v_tenuto = get("tenuto")
+    if v_tenuto is not None:
+        v_tenuto = decodeDefEventMarkingsTenuto(v_tenuto)
+    v_breath = get("breath")
+    if v_breath is not None:
+        v_breath = decodeDefEventMarkingsBreath(v_breath)
+    v_unstress = get("unstress")
+    if v_unstress is not None:
+        v_unstress = decodeDefEventMarkingsUnstress(v_unstress)
+    v_strong_accent = get("strongAccent")
+    if v_strong_accent is not None:
+        v_strong_accent = decodeDefEventMarkingsStrongAccent(v_strong_accent)
+    v_accent = get("accent")
+    if v_accent is not None:
+        v_accent = decodeDefEventMarkingsAccent(v_accent)
+    v_stress = get("stress")
+    if v_stress is not None:
+        v_stress = decodeDefEventMarkingsStress(v_stress)
+    v_tremolo = get("tremolo")
+    if v_tremolo is not None:
+        v_tremolo = decodeDefEventMarkingsTremolo(v_tremolo)
+    v_staccatissimo = get("staccatissimo")
+    if v_staccatissimo is not None:
+        v_staccatissimo = decodeDefEventMarkingsStaccatissimo(v_staccatissimo)
+    v_spiccato = get("spiccato")
+    if v_spiccato is not None:
+        v_spiccato = decodeDefEventMarkingsSpiccato(v_spiccato)
+    o = _new(_DefEventMarkings)
+    o.soft_accent = v_soft_accent
+    o.staccato = v_staccato
+    o.tenuto = v_tenuto
+    o.breath = v_breath
+    o.unstress = v_unstress
+    o.strong_accent = v_strong_accent
+    o.accent = v_accent
+    o.stress = v_stress
+    o.tremolo = v_tremolo
+    o.staccatissimo = v_staccatissimo
+    o.spiccato = v_spiccato
+    return o
+
+
+def decodeDefEventMarkingsStaccatissimo(d: dict) -> DefEvent.Markings.Staccatissimo:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventMarkingsStaccatissimo)
+    return o
+
+
+def decodeDefEventMarkingsStrongAccent(d: dict) -> DefEvent.Markings.StrongAccent:
+    if type(d) is not dict or not _keys20.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_pointing = get("pointing")
+    if v_pointing is not None:
+        if type(v_pointing) is not str or v_pointing not in _literals4:
+            raise DecodeError(v_pointing)
+    o = _new(_DefEventMarkingsStrongAccent)
+    o.pointing = v_pointing
+    return o
+
+
+def decodeDefEventMarkingsSoftAccent(d: dict) -> DefEvent.Markings.SoftAccent:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventMarkingsSoftAccent)
+    return o
+
+
+def decodeDefEventMarkingsTremolo(d: dict) -> DefEvent.Markings.Tremolo:
+    if type(d) is not dict or not _keys21.issuperset(d):
+        raise DecodeError(d)
+    v_marks = d["marks"]
+    if type(v_marks) is not int:
+        raise DecodeError(v_marks)
+    o = _new(_DefEventMarkingsTremolo)
+    o.marks = v_marks
+    return o
+
+
+def decodeDefEventMarkingsTenuto(d: dict) -> DefEvent.Markings.Tenuto:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventMarkingsTenuto)
+    return o
+
+
+def decodeDefEventMarkingsStress(d: dict) -> DefEvent.Markings.Stress:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventMarkingsStress)
+    return o
+
+
+def decodeDefEventMarkingsAccent(d: dict) -> DefEvent.Markings.Accent:
+    if type(d) is not dict or not _keys20.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_pointing = get("pointing")
+    if v_pointing is not None:
+        if type(v_pointing) is not str or v_pointing not in _literals4:
+            raise DecodeError(v_pointing)
+    o = _new(_DefEventMarkingsAccent)
+    o.pointing = v_pointing
+    return o
+
+
+def decodeDefEventMarkingsStaccato(d: dict) -> DefEvent.Markings.Staccato:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventMarkingsStaccato)
+    return o
+
+
+def decodeDefEventMarkingsBreath(d: dict) -> DefEvent.Markings.Breath:
+    if type(d) is not dict or not _keys22.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_symbol = get("symbol")
+    if v_symbol is not None:
+        if type(v_symbol) is not str:
+            raise DecodeError(v_symbol)
+    o = _new(_DefEventMarkingsBreath)
+    o.symbol = v_symbol
+    return o
+
+
+def decodeDefEventMarkingsUnstress(d: dict) -> DefEvent.Markings.Unstress:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventMarkingsUnstress)
+    return o
+
+
+def decodeDefEventMarkingsSpiccato(d: dict) -> DefEvent.Markings.Spiccato:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_DefEventMarkingsSpiccato)
+    return o
+
+
+def decodeDefBeam(d: dict) -> DefBeam:
+    if type(d) is not dict or not _keys23.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_events = d["events"]
+    if type(v_events) is not list:
+        raise DecodeError(v_events)
+    for e in v_events:
+        if type(e) is not str:
+            raise DecodeError(e)
+    v_events = list(v_events)
+    v_hooks = get("hooks")
+    if v_hooks is not None:
+        if type(v_hooks) is not list:
+            raise DecodeError(v_hooks)
+        v_hooks = [decodeDefBeamHook(e) for e in v_hooks]
+    v_inner = get("inner")
+    if v_inner is not None:
+        if type(v_inner) is not list:
+            raise DecodeError(v_inner)
+        v_inner = [decodeDefBeam(e) for e in v_inner]
+    o = _new(_DefBeam)
+    o.events = v_events
+    o.hooks = v_hooks
+    o.inner = v_inner
+    return o
+
+
+def decodeDefBeamHook(d: dict) -> DefBeam.Hook:
+    if type(d) is not dict or not _keys24.issuperset(d):
+        raise DecodeError(d)
+    v_direction = d["direction"]
+    if type(v_direction) is not str or v_direction not in _literals25:
+        raise DecodeError(v_direction)
+    v_event = d["event"]
+    if type(v_event) is not str:
+        raise DecodeError(v_event)
+    o = _new(_DefBeamHook)
+    o.direction = v_direction
+    o.event = v_event
+    return o
+
+
+def decodeDefNoteValueQuantity(d: dict) -> DefNoteValueQuantity:
+    if type(d) is not dict or not _keys26.issuperset(d):
+        raise DecodeError(d)
+    v_multiple = d["multiple"]
+    if type(v_multiple) is not int:
+        raise DecodeError(v_multiple)
+    v_duration = d["duration"]
+    v_duration = decodeDefNoteValue(v_duration)
+    o = _new(_DefNoteValueQuantity)
+    o.multiple = v_multiple
+    o.duration = v_duration
+    return o
+
+
+def decodeTop(d: dict) -> Top:
+    if type(d) is not dict or not _keys27.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_global_ = d["global"]
+    v_global_ = decodeTopGlobal(v_global_)
+    v_mnx = d["mnx"]
+    v_mnx = decodeTopMnx(v_mnx)
+    v_parts = d["parts"]
+    if type(v_parts) is not list:
+        raise DecodeError(v_parts)
+    v_parts = [decodeTopPart(e) for e in v_parts]
+    v_scores = get("scores")
+    if v_scores is not None:
+        if type(v_scores) is not list:
+            raise DecodeError(v_scores)
+        v_scores = [decodeTopScore(e) for e in v_scores]
+    v_layouts = get("layouts")
+    if v_layouts is not None:
+        if type(v_layouts) is not list:
+            raise DecodeError(v_layouts)
+        v_layouts = [decodeTopLayout(e) for e in v_layouts]
+    o = _new(_Top)
+    o.global_ = v_global_
+    o.mnx = v_mnx
+    o.parts = v_parts
+    o.scores = v_scores
+    o.layouts = v_layouts
+    return o
+
+
+def decodeTopGlobal(d: dict) -> Top.Global:
+    if type(d) is not dict or not _keys28.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_measures = d["measures"]
+    if type(v_measures) is not list:
+        raise DecodeError(v_measures)
+    v_measures = [decodeTopGlobalMeasure(e) for e in v_measures]
+    v_styles = get("styles")
+    if v_styles is not None:
+        if type(v_styles) is not list:
+            raise DecodeError(v_styles)
+        v_styles = [decodeTopGlobalStyle(e) for e in v_styles]
+    o = _new(_TopGlobal)
+    o.measures = v_measures
+    o.styles = v_styles
+    return o
+
+
+def decodeTopGlobalStyle(d: dict) -> Top.Global.Style:
+    if type(d) is not dict or not _keys29.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_selector = d["selector"]
+    if type(v_selector) is not str:
+        raise DecodeError(v_selector)
+    v_color = get("color")
+    if v_color is not None:
+        if type(v_color) is not str:
+            raise DecodeError(v_color)
+    o = _new(_TopGlobalStyle)
+    o.selector = v_selector
+    o.color = v_color
+    return o
+
+
+def decodeTopGlobalMeasure(d: dict) -> Top.Global.Measure:
+    if type(d) is not dict or not _keys30.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_jump = get("jump")
+    if v_jump is not None:
+        v_jump = decodeTopGlobalMeasureJump(v_jump)
+    v_fine = get("fine")
+    if v_fine is not None:
+        v_fine = decodeTopGlobalMeasureFine(v_fine)
+    v_tempos = get("tempos")
+    if v_tempos is not None:
+        if type(v_tempos) is not list:
+            raise DecodeError(v_tempos)
+        v_tempos = [decodeTopGlobalMeasureTempo(e) for e in v_tempos]
+    v_ending = get("ending")
+    if v_ending is not None:
+        v_ending = decodeTopGlobalMeasureEnding(v_ending)
+    v_number = get("number")
+    if v_number is not None:
+        if type(v_number) is not int:
+            raise DecodeError(v_number)
+    v_barline = get("barline")
+    if v_barline is not None:
+        v_barline = decodeTopGlobalMeasureBarline(v_barline)
+    v_index = get("index")
+    if v_index is not None:
+        if type(v_index) is not int:
+            raise DecodeError(v_index)
+    v_repeat_start = get("repeatStart")
+    if v_repeat_start is not None:
+        v_repeat_start = decodeTopGlobalMeasureRepeatStart(v_repeat_start)
+    v_time = get("time")
+    if v_time is not None:
+        v_time = decodeTopGlobalMeasureTime(v_time)
+    v_key = get("key")
+    if v_key is not None:
+        v_key = decodeTopGlobalMeasureKey(v_key)
+    v_segno = get("segno")
+    if v_segno is not None:
+        v_segno = decodeTopGlobalMeasureSegno(v_segno)
+    v_repeat_end = get("repeatEnd")
+    if v_repeat_end is not None:
+        v_repeat_end = decodeTopGlobalMeasureRepeatEnd(v_repeat_end)
+    o = _new(_TopGlobalMeasure)
+    o.jump = v_jump
+    o.fine = v_fine
+    o.tempos = v_tempos
+    o.ending = v_ending
+    o.number = v_number
+    o.barline = v_barline
+    o.index = v_index
+    o.repeat_start = v_repeat_start
+    o.time = v_time
+    o.key = v_key
+    o.segno = v_segno
+    o.repeat_end = v_repeat_end
+    return o
+
+
+def decodeTopGlobalMeasureSegno(d: dict) -> Top.Global.Measure.Segno:
+    if type(d) is not dict or not _keys31.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_location = d["location"]
+    if type(v_location) is not str:
+        raise DecodeError(v_location)
+    v_class_ = get("class")
+    if v_class_ is not None:
+        if type(v_class_) is not str:
+            raise DecodeError(v_class_)
+    v_color = get("color")
+    if v_color is not None:
+        if type(v_color) is not str:
+            raise DecodeError(v_color)
+    v_glyph = get("glyph")
+    if v_glyph is not None:
+        if type(v_glyph) is not str:
+            raise DecodeError(v_glyph)
+    o = _new(_TopGlobalMeasureSegno)
+    o.location = v_location
+    o.class_ = v_class_
+    o.color = v_color
+    o.glyph = v_glyph
+    return o
+
+
+def decodeTopGlobalMeasureBarline(d: dict) -> Top.Global.Measure.Barline:
+    if type(d) is not dict or not _keys32.issuperset(d):
+        raise DecodeError(d)
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals33:
+        raise DecodeError(v_type)
+    o = _new(_TopGlobalMeasureBarline)
+    o.type = v_type
+    return o
+
+
+def decodeTopGlobalMeasureTime(d: dict) -> Top.Global.Measure.Time:
+    if type(d) is not dict or not _keys34.issuperset(d):
+        raise DecodeError(d)
+    v_unit = d["unit"]
+    if type(v_unit) is not int or v_unit not in _literals35:
+        raise DecodeError(v_unit)
+    v_count = d["count"]
+    if type(v_count) is not int:
+        raise DecodeError(v_count)
+    o = _new(_TopGlobalMeasureTime)
+    o.unit = v_unit
+    o.count = v_count
+    return o
+
+
+def decodeTopGlobalMeasureTempo(d: dict) -> Top.Global.Measure.Tempo:
+    if type(d) is not dict or not _keys36.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_bpm = d["bpm"]
+    if type(v_bpm) is not int:
+        raise DecodeError(v_bpm)
+    v_value = d["value"]
+    v_value = decodeDefNoteValue(v_value)
+    v_location = get("location")
+    if v_location is not None:
+        if type(v_location) is not str:
+            raise DecodeError(v_location)
+    o = _new(_TopGlobalMeasureTempo)
+    o.bpm = v_bpm
+    o.value = v_value
+    o.location = v_location
+    return o
+
+
+def decodeTopGlobalMeasureKey(d: dict) -> Top.Global.Measure.Key:
+    if type(d) is not dict or not _keys37.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_fifths = d["fifths"]
+    if type(v_fifths) is not int:
+        raise DecodeError(v_fifths)
+    v_class_ = get("class")
+    if v_class_ is not None:
+        if type(v_class_) is not str:
+            raise DecodeError(v_class_)
+    v_color = get("color")
+    if v_color is not None:
+        if type(v_color) is not str:
+            raise DecodeError(v_color)
+    o = _new(_TopGlobalMeasureKey)
+    o.fifths = v_fifths
+    o.class_ = v_class_
+    o.color = v_color
+    return o
+
+
+def decodeTopGlobalMeasureFine(d: dict) -> Top.Global.Measure.Fine:
+    if type(d) is not dict or not _keys38.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_location = d["location"]
+    if type(v_location) is not str:
+        raise DecodeError(v_location)
+    v_class_ = get("class")
+    if v_class_ is not None:
+        if type(v_class_) is not str:
+            raise DecodeError(v_class_)
+    v_color = get("color")
+    if v_color is not None:
+        if type(v_color) is not str:
+            raise DecodeError(v_color)
+    o = _new(_TopGlobalMeasureFine)
+    o.location = v_location
+    o.class_ = v_class_
+    o.color = v_color
+    return o
+
+
+def decodeTopGlobalMeasureEnding(d: dict) -> Top.Global.Measure.Ending:
+    if type(d) is not dict or not _keys39.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_duration = d["duration"]
+    if type(v_duration) is not int:
+        raise DecodeError(v_duration)
+    v_numbers = get("numbers")
+    if v_numbers is not None:
+        if type(v_numbers) is not list:
+            raise DecodeError(v_numbers)
+        for e in v_numbers:
+            if type(e) is not int:
+                raise DecodeError(e)
+        v_numbers = list(v_numbers)
+    v_class_ = get("class")
+    if v_class_ is not None:
+        if type(v_class_) is not str:
+            raise DecodeError(v_class_)
+    v_open = get("open")
+    if v_open is not None:
+        if type(v_open) is not bool:
+            raise DecodeError(v_open)
+    v_color = get("color")
+    if v_color is not None:
+        if type(v_color) is not str:
+            raise DecodeError(v_color)
+    o = _new(_TopGlobalMeasureEnding)
+    o.duration = v_duration
+    o.numbers = v_numbers
+    o.class_ = v_class_
+    o.open = v_open
+    o.color = v_color
+    return o
+
+
+def decodeTopGlobalMeasureRepeatStart(d: dict) -> Top.Global.Measure.RepeatStart:
+    if type(d) is not dict or not _keys14.issuperset(d):
+        raise DecodeError(d)
+    o = _new(_TopGlobalMeasureRepeatStart)
+    return o
+
+
+def decodeTopGlobalMeasureJump(d: dict) -> Top.Global.Measure.Jump:
+    if type(d) is not dict or not _keys40.issuperset(d):
+        raise DecodeError(d)
+    v_location = d["location"]
+    if type(v_location) is not str:
+        raise DecodeError(v_location)
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals41:
+        raise DecodeError(v_type)
+    o = _new(_TopGlobalMeasureJump)
+    o.location = v_location
+    o.type = v_type
+    return o
+
+
+def decodeTopGlobalMeasureRepeatEnd(d: dict) -> Top.Global.Measure.RepeatEnd:
+    if type(d) is not dict or not _keys42.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_times = get("times")
+    if v_times is not None:
+        if type(v_times) is not int:
+            raise DecodeError(v_times)
+    o = _new(_TopGlobalMeasureRepeatEnd)
+    o.times = v_times
+    return o
+
+
+def decodeTopLayout(d: dict) -> Top.Layout:
+    if type(d) is not dict or not _keys43.issuperset(d):
+        raise DecodeError(d)
+    v_content = d["content"]
+    if type(v_content) is not list:
+        raise DecodeError(v_content)
+    v_content = [_union44[e["type"]](e) for e in v_content]
+    v_id = d["id"]
+    if type(v_id) is not str:
+        raise DecodeError(v_id)
+    o = _new(_TopLayout)
+    o.content = v_content
+    o.id = v_id
+    return o
+
+
+def decodeTopPart(d: dict) -> Top.Part:
+    if type(d) is not dict or not _keys45.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_smufl_font = get("smuflFont")
+    if v_smufl_font is not None:
+        if type(v_smufl_font) is not str:
+            raise DecodeError(v_smufl_font)
+    v_id = get("id")
+    if v_id is not None:
+        if type(v_id) is not str:
+            raise DecodeError(v_id)
+    v_measures = get("measures")
+    if v_measures is not None:
+        if type(v_measures) is not list:
+            raise DecodeError(v_measures)
+        v_measures = [decodeTopPartMeasure(e) for e in v_measures]
+    v_name = get("name")
+    if v_name is not None:
+        if type(v_name) is not str:
+            raise DecodeError(v_name)
+    v_short_name = get("shortName")
+    if v_short_name is not None:
+        if type(v_short_name) is not str:
+            raise DecodeError(v_short_name)
+    v_staves = get("staves")
+    if v_staves is not None:
+        if type(v_staves) is not int:
+            raise DecodeError(v_staves)
+    o = _new(_TopPart)
+    o.smufl_font = v_smufl_font
+    o.id = v_id
+    o.measures = v_measures
+    o.name = v_name
+    o.short_name = v_short_name
+    o.staves = v_staves
+    return o
+
+
+def decodeTopPartMeasure(d: dict) -> Top.Part.Measure:
+    if type(d) is not dict or not _keys46.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_sequences = d["sequences"]
+    if type(v_sequences) is not list:
+        raise DecodeError(v_sequences)
+    v_sequences = [decodeTopPartMeasureSequence(e) for e in v_sequences]
+    v_beams = get("beams")
+    if v_beams is not None:
+        if type(v_beams) is not list:
+            raise DecodeError(v_beams)
+        v_beams = [decodeDefBeam(e) for e in v_beams]
+    v_clefs = get("clefs")
+    if v_clefs is not None:
+        if type(v_clefs) is not list:
+            raise DecodeError(v_clefs)
+        v_clefs = [decodeTopPartMeasureClef(e) for e in v_clefs]
+    o = _new(_TopPartMeasure)
+    o.sequences = v_sequences
+    o.beams = v_beams
+    o.clefs = v_clefs
+    return o
+
+
+def decodeTopPartMeasureClef(d: dict) -> Top.Part.Measure.Clef:
+    if type(d) is not dict or not _keys47.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_clef = d["clef"]
+    v_clef = decodeTopPartMeasureClefClef(v_clef)
+    v_position = get("position")
+    if v_position is not None:
+        v_position = decodeTopPartMeasureClefPosition(v_position)
+    o = _new(_TopPartMeasureClef)
+    o.clef = v_clef
+    o.position = v_position
+    return o
+
+
+def decodeTopPartMeasureClefPosition(d: dict) -> Top.Part.Measure.Clef.Position:
+    if type(d) is not dict or not _keys48.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_fraction = d["fraction"]
+    if type(v_fraction) is not list:
+        raise DecodeError(v_fraction)
+    for e in v_fraction:
+        if type(e) is not int:
+            raise DecodeError(e)
+    v_fraction = list(v_fraction)
+    v_grace_index = get("graceIndex")
+    if v_grace_index is not None:
+        if type(v_grace_index) is not int:
+            raise DecodeError(v_grace_index)
+    o = _new(_TopPartMeasureClefPosition)
+    o.fraction = v_fraction
+    o.grace_index = v_grace_index
+    return o
+
+
+def decodeTopPartMeasureClefClef(d: dict) -> Top.Part.Measure.Clef.Clef:
+    if type(d) is not dict or not _keys49.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_staff_position = d["staffPosition"]
+    if type(v_staff_position) is not int:
+        raise DecodeError(v_staff_position)
+    v_sign = d["sign"]
+    if type(v_sign) is not str or v_sign not in _literals50:
+        raise DecodeError(v_sign)
+    v_color = get("color")
+    if v_color is not None:
+        if type(v_color) is not str:
+            raise DecodeError(v_color)
+    v_glyph = get("glyph")
+    if v_glyph is not None:
+        if type(v_glyph) is not str:
+            raise DecodeError(v_glyph)
+    v_class_ = get("class")
+    if v_class_ is not None:
+        if type(v_class_) is not str:
+            raise DecodeError(v_class_)
+    v_octave = get("octave")
+    if v_octave is not None:
+        if type(v_octave) is not int:
+            raise DecodeError(v_octave)
+    o = _new(_TopPartMeasureClefClef)
+    o.staff_position = v_staff_position
+    o.sign = v_sign
+    o.color = v_color
+    o.glyph = v_glyph
+    o.class_ = v_class_
+    o.octave = v_octave
+    return o
+
+
+def decodeTopPartMeasureSequence(d: dict) -> Top.Part.Measure.Sequence:
+    if type(d) is not dict or not _keys51.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_content = d["content"]
+    if type(v_content) is not list:
+        raise DecodeError(v_content)
+    v_content = [_union52[e["type"]](e) for e in v_content]
+    v_staff = get("staff")
+    if v_staff is not None:
+        if type(v_staff) is not int:
+            raise DecodeError(v_staff)
+    v_voice = get("voice")
+    if v_voice is not None:
+        if type(v_voice) is not str:
+            raise DecodeError(v_voice)
+    v_orient = get("orient")
+    if v_orient is not None:
+        if type(v_orient) is not str:
+            raise DecodeError(v_orient)
+    o = _new(_TopPartMeasureSequence)
+    o.content = v_content
+    o.staff = v_staff
+    o.voice = v_voice
+    o.orient = v_orient
+    return o
+
+
+def decodeTopPartMeasureSequenceContentChoice5(
+    d: dict,
+) -> Top.Part.Measure.Sequence.ContentChoice5:
+    if type(d) is not dict or not _keys53.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals54:
+        raise DecodeError(v_type)
+    v_value = d["value"]
+    if type(v_value) is not str:
+        raise DecodeError(v_value)
+    v_glyph = get("glyph")
+    if v_glyph is not None:
+        if type(v_glyph) is not str:
+            raise DecodeError(v_glyph)
+    o = _new(_TopPartMeasureSequenceContentChoice5)
+    o.type = v_type
+    o.value = v_value
+    o.glyph = v_glyph
+    return o
+
+
+def decodeTopPartMeasureSequenceContentChoice2(
+    d: dict,
+) -> Top.Part.Measure.Sequence.ContentChoice2:
+    if type(d) is not dict or not _keys55.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_inner = d["inner"]
+    v_inner = decodeDefNoteValueQuantity(v_inner)
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals56:
+        raise DecodeError(v_type)
+    v_outer = d["outer"]
+    v_outer = decodeDefNoteValueQuantity(v_outer)
+    v_content = d["content"]
+    if type(v_content) is not list:
+        raise DecodeError(v_content)
+    v_content = [decodeDefEvent(e) for e in v_content]
+    v_staff = get("staff")
+    if v_staff is not None:
+        if type(v_staff) is not int:
+            raise DecodeError(v_staff)
+    v_orient = get("orient")
+    if v_orient is not None:
+        if type(v_orient) is not str:
+            raise DecodeError(v_orient)
+    v_bracket = get("bracket")
+    if v_bracket is not None:
+        if type(v_bracket) is not str or v_bracket not in _literals57:
+            raise DecodeError(v_bracket)
+    v_show_number = get("showNumber")
+    if v_show_number is not None:
+        if type(v_show_number) is not str or v_show_number not in _literals58:
+            raise DecodeError(v_show_number)
+    v_show_value = get("showValue")
+    if v_show_value is not None:
+        if type(v_show_value) is not str or v_show_value not in _literals58:
+            raise DecodeError(v_show_value)
+    o = _new(_TopPartMeasureSequenceContentChoice2)
+    o.inner = v_inner
+    o.type = v_type
+    o.outer = v_outer
+    o.content = v_content
+    o.staff = v_staff
+    o.orient = v_orient
+    o.bracket = v_bracket
+    o.show_number = v_show_number
+    o.show_value = v_show_value
+    return o
+
+
+def decodeTopPartMeasureSequenceContentChoice3(
+    d: dict,
+) -> Top.Part.Measure.Sequence.ContentChoice3:
+    if type(d) is not dict or not _keys59.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals60:
+        raise DecodeError(v_type)
+    v_value = d["value"]
+    if type(v_value) is not int:
+        raise DecodeError(v_value)
+    v_end = d["end"]
+    if type(v_end) is not str:
+        raise DecodeError(v_end)
+    v_orient = get("orient")
+    if v_orient is not None:
+        if type(v_orient) is not str:
+            raise DecodeError(v_orient)
+    v_staff = get("staff")
+    if v_staff is not None:
+        if type(v_staff) is not int:
+            raise DecodeError(v_staff)
+    o = _new(_TopPartMeasureSequenceContentChoice3)
+    o.type = v_type
+    o.value = v_value
+    o.end = v_end
+    o.orient = v_orient
+    o.staff = v_staff
+    return o
+
+
+def decodeTopPartMeasureSequenceContentChoice4(
+    d: dict,
+) -> Top.Part.Measure.Sequence.ContentChoice4:
+    if type(d) is not dict or not _keys61.issuperset(d):
+        raise DecodeError(d)
+    v_duration = d["duration"]
+    v_duration = decodeDefNoteValueQuantity(v_duration)
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals62:
+        raise DecodeError(v_type)
+    o = _new(_TopPartMeasureSequenceContentChoice4)
+    o.duration = v_duration
+    o.type = v_type
+    return o
+
+
+def decodeTopPartMeasureSequenceContentChoice1(
+    d: dict,
+) -> Top.Part.Measure.Sequence.ContentChoice1:
+    if type(d) is not dict or not _keys63.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_type = d["type"]
+    if type(v_type) is not str or v_type not in _literals64:
+        raise DecodeError(v_type)
+    v_content = d["content"]
+    if type(v_content) is not list:
+        raise DecodeError(v_content)
+    v_content = [decodeDefEvent(e) for e in v_content]
+    v_slash = get("slash")
+    if v_slash is not None:
+        if type(v_slash) is not bool:
+            raise DecodeError(v_slash)
+    v_color = get("color")
+    if v_color is not None:
+        if type(v_color) is not str:
+            raise DecodeError(v_color)
+    v_class_ = get("class")
+    if v_class_ is not None:
+        if type(v_class_) is not str:
+            raise DecodeError(v_class_)
+    v_grace_type = get("graceType")
+    if v_grace_type is not None:
+        if type(v_grace_type) is not str or v_grace_type not in _literals65:
+            raise DecodeError(v_grace_type)
+    o = _new(_TopPartMeasureSequenceContentChoice1)
+    o.type = v_type
+    o.content = v_content
+    o.slash = v_slash
+    o.color = v_color
+    o.class_ = v_class_
+    o.grace_type = v_grace_type
+    return o
+
+
+def decodeTopMnx(d: dict) -> Top.Mnx:
+    if type(d) is not dict or not _keys66.issuperset(d):
+        raise DecodeError(d)
+    v_version = d["version"]
+    if type(v_version) is not int:
+        raise DecodeError(v_version)
+    o = _new(_TopMnx)
+    o.version = v_version
+    return o
+
+
+def decodeTopScore(d: dict) -> Top.Score:
+    if type(d) is not dict or not _keys67.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_name = d["name"]
+    if type(v_name) is not str:
+        raise DecodeError(v_name)
+    v_multimeasure_rests = get("multimeasureRests")
+    if v_multimeasure_rests is not None:
+        if type(v_multimeasure_rests) is not list:
+            raise DecodeError(v_multimeasure_rests)
+        v_multimeasure_rests = [
+            decodeTopScoreMultimeasureRest(e) for e in v_multimeasure_rests
+        ]
+    v_layout = get("layout")
+    if v_layout is not None:
+        if type(v_layout) is not str:
+            raise DecodeError(v_layout)
+    v_pages = get("pages")
+    if v_pages is not None:
+        if type(v_pages) is not list:
+            raise DecodeError(v_pages)
+        v_pages = [decodeTopScorePage(e) for e in v_pages]
+    o = _new(_TopScore)
+    o.name = v_name
+    o.multimeasure_rests = v_multimeasure_rests
+    o.layout = v_layout
+    o.pages = v_pages
+    return o
+
+
+def decodeTopScoreMultimeasureRest(d: dict) -> Top.Score.MultimeasureRest:
+    if type(d) is not dict or not _keys68.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_start = d["start"]
+    if type(v_start) is not int:
+        raise DecodeError(v_start)
+    v_duration = d["duration"]
+    if type(v_duration) is not int:
+        raise DecodeError(v_duration)
+    v_label = get("label")
+    if v_label is not None:
+        if type(v_label) is not str:
+            raise DecodeError(v_label)
+    o = _new(_TopScoreMultimeasureRest)
+    o.start = v_start
+    o.duration = v_duration
+    o.label = v_label
+    return o
+
+
+def decodeTopScorePage(d: dict) -> Top.Score.Page:
+    if type(d) is not dict or not _keys69.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_systems = d["systems"]
+    if type(v_systems) is not list:
+        raise DecodeError(v_systems)
+    v_systems = [decodeTopScorePageSystem(e) for e in v_systems]
+    v_layout = get("layout")
+    if v_layout is not None:
+        if type(v_layout) is not str:
+            raise DecodeError(v_layout)
+    o = _new(_TopScorePage)
+    o.systems = v_systems
+    o.layout = v_layout
+    return o
+
+
+def decodeTopScorePageSystem(d: dict) -> Top.Score.Page.System:
+    if type(d) is not dict or not _keys70.issuperset(d):
+        raise DecodeError(d)
+    get = d.get
+    v_measure = d["measure"]
+    if type(v_measure) is not int:
+        raise DecodeError(v_measure)
+    v_layout_changes = get("layoutChanges")
+    if v_layout_changes is not None:
+        if type(v_layout_changes) is not list:
+            raise DecodeError(v_layout_changes)
+        v_layout_changes = [
+            decodeTopScorePageSystemLayoutChange(e) for e in v_layout_changes
+        ]
+    v_layout = get("layout")
+    if v_layout is not None:
+        if type(v_layout) is not str:
+            raise DecodeError(v_layout)
+    o = _new(_TopScorePageSystem)
+    o.measure = v_measure
+    o.layout_changes = v_layout_changes
+    o.layout = v_layout
+    return o
+
+
+def decodeTopScorePageSystemLayoutChange(d: dict) -> Top.Score.Page.System.LayoutChange:
+    if type(d) is not dict or not _keys71.issuperset(d):
+        raise DecodeError(d)
+    v_layout = d["layout"]
+    if type(v_layout) is not str:
+        raise DecodeError(v_layout)
+    v_location = d["location"]
+    if type(v_location) is not str:
+        raise DecodeError(v_location)
+    o = _new(_TopScorePageSystemLayoutChange)
+    o.layout = v_layout
+    o.location = v_location
+    return o
+
+
+_union44 = {
+    "group": decodeDefSystemLayoutContentChoice0,
+    "staff": decodeDefSystemLayoutContentChoice1,
+}
+_union52 = {
+    "event": decodeDefEvent,
+    "grace": decodeTopPartMeasureSequenceContentChoice1,
+    "tuplet": decodeTopPartMeasureSequenceContentChoice2,
+    "octave-shift": decodeTopPartMeasureSequenceContentChoice3,
+    "space": decodeTopPartMeasureSequenceContentChoice4,
+    "dynamic": decodeTopPartMeasureSequenceContentChoice5,
+}
+
+
+decoders: dict[type, Callable[[dict], Any]] = {
+    DefSystemLayoutContentChoice1: decodeDefSystemLayoutContentChoice1,
+    DefSystemLayoutContentChoice1.Source: decodeDefSystemLayoutContentChoice1Source,
+    DefSystemLayoutContentChoice0: decodeDefSystemLayoutContentChoice0,
+    DefNoteValue: decodeDefNoteValue,
+    DefEvent: decodeDefEvent,
+    DefEvent.Slur: decodeDefEventSlur,
+    DefEvent.Note: decodeDefEventNote,
+    DefEvent.Note.Tie: decodeDefEventNoteTie,
+    DefEvent.Note.Perform: decodeDefEventNotePerform,
+    DefEvent.Note.Pitch: decodeDefEventNotePitch,
+    DefEvent.Note.AccidentalDisplay: decodeDefEventNoteAccidentalDisplay,
+    DefEvent.Rest: decodeDefEventRest,
+    DefEvent.Markings: decodeDefEventMarkings,
+    DefEvent.Markings.Staccatissimo: decodeDefEventMarkingsStaccatissimo,
+    DefEvent.Markings.StrongAccent: decodeDefEventMarkingsStrongAccent,
+    DefEvent.Markings.SoftAccent: decodeDefEventMarkingsSoftAccent,
+    DefEvent.Markings.Tremolo: decodeDefEventMarkingsTremolo,
+    DefEvent.Markings.Tenuto: decodeDefEventMarkingsTenuto,
+    DefEvent.Markings.Stress: decodeDefEventMarkingsStress,
+    DefEvent.Markings.Accent: decodeDefEventMarkingsAccent,
+    DefEvent.Markings.Staccato: decodeDefEventMarkingsStaccato,
+    DefEvent.Markings.Breath: decodeDefEventMarkingsBreath,
+    DefEvent.Markings.Unstress: decodeDefEventMarkingsUnstress,
+    DefEvent.Markings.Spiccato: decodeDefEventMarkingsSpiccato,
+    DefBeam: decodeDefBeam,
+    DefBeam.Hook: decodeDefBeamHook,
+    DefNoteValueQuantity: decodeDefNoteValueQuantity,
+    Top: decodeTop,
+    Top.Global: decodeTopGlobal,
+    Top.Global.Style: decodeTopGlobalStyle,
+    Top.Global.Measure: decodeTopGlobalMeasure,
+    Top.Global.Measure.Segno: decodeTopGlobalMeasureSegno,
+    Top.Global.Measure.Barline: decodeTopGlobalMeasureBarline,
+    Top.Global.Measure.Time: decodeTopGlobalMeasureTime,
+    Top.Global.Measure.Tempo: decodeTopGlobalMeasureTempo,
+    Top.Global.Measure.Key: decodeTopGlobalMeasureKey,
+    Top.Global.Measure.Fine: decodeTopGlobalMeasureFine,
+    Top.Global.Measure.Ending: decodeTopGlobalMeasureEnding,
+    Top.Global.Measure.RepeatStart: decodeTopGlobalMeasureRepeatStart,
+    Top.Global.Measure.Jump: decodeTopGlobalMeasureJump,
+    Top.Global.Measure.RepeatEnd: decodeTopGlobalMeasureRepeatEnd,
+    Top.Layout: decodeTopLayout,
+    Top.Part: decodeTopPart,
+    Top.Part.Measure: decodeTopPartMeasure,
+    Top.Part.Measure.Clef: decodeTopPartMeasureClef,
+    Top.Part.Measure.Clef.Position: decodeTopPartMeasureClefPosition,
+    Top.Part.Measure.Clef.Clef: decodeTopPartMeasureClefClef,
+    Top.Part.Measure.Sequence: decodeTopPartMeasureSequence,
+    Top.Part.Measure.Sequence.ContentChoice5: decodeTopPartMeasureSequenceContentChoice5,
+    Top.Part.Measure.Sequence.ContentChoice2: decodeTopPartMeasureSequenceContentChoice2,
+    Top.Part.Measure.Sequence.ContentChoice3: decodeTopPartMeasureSequenceContentChoice3,
+    Top.Part.Measure.Sequence.ContentChoice4: decodeTopPartMeasureSequenceContentChoice4,
+    Top.Part.Measure.Sequence.ContentChoice1: decodeTopPartMeasureSequenceContentChoice1,
+    Top.Mnx: decodeTopMnx,
+    Top.Score: decodeTopScore,
+    Top.Score.MultimeasureRest: decodeTopScoreMultimeasureRest,
+    Top.Score.Page: decodeTopScorePage,
+    Top.Score.Page.System: decodeTopScorePageSystem,
+    Top.Score.Page.System.LayoutChange: decodeTopScorePageSystemLayoutChange,
+}
+
+
+def fromDict(cls: Type[T], d: dict) -> T:
+    try:
+        return decoders[cls](d)
+    except (DecodeError, KeyError, TypeError, AttributeError):
+        return cls.from_dict(d)  # type: ignore
+
+
+def topFromDict(d: dict) -> Top:
+    return fromDict(Top, d)
+
+
+def topFromJson(s: str) -> Top:
+    return topFromDict(json.loads(s))
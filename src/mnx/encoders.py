@@ -0,0 +1,1066 @@
+# This file is generated by generate-encoders.py. Do not edit by hand.
+#
+# Straight-line encoders from the dataclasses in mnx/__init__.py to JSON text,
+# with the keys from the schema and without the fields that are None.
+# Use toJson, or writeTop to write a whole document to a text file
+# one measure at a time.
+
+from json.encoder import encode_basestring_ascii as _str
+from typing import Any, Callable, Optional, TextIO
+import dataclasses
+import json
+
+from . import (
+    DefBeam,
+    DefEvent,
+    DefNoteValue,
+    DefNoteValueQuantity,
+    DefSystemLayoutContentChoice0,
+    DefSystemLayoutContentChoice1,
+    Top,
+)
+
+_int = int.__repr__
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
+
+class EncoderTable(dict):
+    # Subclasses, such as the frozen classes of topcache,
+    # use the encoder of the first class they derive from that has one.
+    def __missing__(self, cls: type) -> Callable[[Any], str]:
+        for base in cls.__mro__[1:]:
+            if base in self:
+                self[cls] = self[base]
+                return self[cls]
+        raise TypeError(f"Cannot encode {cls.__name__} as MNX.")
+
+
+def _any(o: Any) -> str:
+    if isinstance(o, (list, tuple)):
+        return "[" + ",".join([_any(e) for e in o]) + "]"
+    if dataclasses.is_dataclass(o):
+        return encoders[type(o)](o)
+    return _encoder.encode(o)
+
+
+def encodeDefSystemLayoutContentChoice1(o: DefSystemLayoutContentChoice1) -> str:
+    p = []
+    v = o.sources
+    if v is not None:
+        p.append(
+            '"sources":'
+            + "["
+            + ",".join([encodeDefSystemLayoutContentChoice1Source(e) for e in v])
+            + "]"
+        )
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    v = o.labelref
+    if v is not None:
+        p.append('"labelref":' + _str(v))
+    v = o.label
+    if v is not None:
+        p.append('"label":' + _str(v))
+    v = o.symbol
+    if v is not None:
+        p.append('"symbol":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefSystemLayoutContentChoice1Source(
+    o: DefSystemLayoutContentChoice1.Source,
+) -> str:
+    p = []
+    v = o.part
+    if v is not None:
+        p.append('"part":' + _str(v))
+    v = o.stem
+    if v is not None:
+        p.append('"stem":' + _str(v))
+    v = o.staff
+    if v is not None:
+        p.append('"staff":' + _int(v))
+    v = o.label
+    if v is not None:
+        p.append('"label":' + _str(v))
+    v = o.voice
+    if v is not None:
+        p.append('"voice":' + _str(v))
+    v = o.labelref
+    if v is not None:
+        p.append('"labelref":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefSystemLayoutContentChoice0(o: DefSystemLayoutContentChoice0) -> str:
+    p = []
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    v = o.content
+    if v is not None:
+        p.append('"content":' + _any(v))
+    v = o.label
+    if v is not None:
+        p.append('"label":' + _str(v))
+    v = o.symbol
+    if v is not None:
+        p.append('"symbol":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefNoteValue(o: DefNoteValue) -> str:
+    p = []
+    v = o.base
+    if v is not None:
+        p.append('"base":' + _str(v))
+    v = o.dots
+    if v is not None:
+        p.append('"dots":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEvent(o: DefEvent) -> str:
+    p = []
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    v = o.staff
+    if v is not None:
+        p.append('"staff":' + _int(v))
+    v = o.stem_direction
+    if v is not None:
+        p.append('"stemDirection":' + _str(v))
+    v = o.duration
+    if v is not None:
+        p.append('"duration":' + encodeDefNoteValue(v))
+    v = o.smufl_font
+    if v is not None:
+        p.append('"smuflFont":' + _str(v))
+    v = o.measure
+    if v is not None:
+        p.append('"measure":' + ("true" if v else "false"))
+    v = o.rest
+    if v is not None:
+        p.append('"rest":' + encodeDefEventRest(v))
+    v = o.orient
+    if v is not None:
+        p.append('"orient":' + _str(v))
+    v = o.id
+    if v is not None:
+        p.append('"id":' + _str(v))
+    v = o.markings
+    if v is not None:
+        p.append('"markings":' + encodeDefEventMarkings(v))
+    v = o.notes
+    if v is not None:
+        p.append('"notes":' + "[" + ",".join([encodeDefEventNote(e) for e in v]) + "]")
+    v = o.slurs
+    if v is not None:
+        p.append('"slurs":' + "[" + ",".join([encodeDefEventSlur(e) for e in v]) + "]")
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventSlur(o: DefEvent.Slur) -> str:
+    p = []
+    v = o.target
+    if v is not None:
+        p.append('"target":' + _str(v))
+    v = o.line_type
+    if v is not None:
+        p.append('"lineType":' + _str(v))
+    v = o.side_end
+    if v is not None:
+        p.append('"sideEnd":' + _str(v))
+    v = o.start_note
+    if v is not None:
+        p.append('"startNote":' + _str(v))
+    v = o.end_note
+    if v is not None:
+        p.append('"endNote":' + _str(v))
+    v = o.location
+    if v is not None:
+        p.append('"location":' + _str(v))
+    v = o.side
+    if v is not None:
+        p.append('"side":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventNote(o: DefEvent.Note) -> str:
+    p = []
+    v = o.pitch
+    if v is not None:
+        p.append('"pitch":' + encodeDefEventNotePitch(v))
+    v = o.class_
+    if v is not None:
+        p.append('"class":' + _str(v))
+    v = o.perform
+    if v is not None:
+        p.append('"perform":' + encodeDefEventNotePerform(v))
+    v = o.tie
+    if v is not None:
+        p.append('"tie":' + encodeDefEventNoteTie(v))
+    v = o.staff
+    if v is not None:
+        p.append('"staff":' + _int(v))
+    v = o.id
+    if v is not None:
+        p.append('"id":' + _str(v))
+    v = o.accidental_display
+    if v is not None:
+        p.append('"accidentalDisplay":' + encodeDefEventNoteAccidentalDisplay(v))
+    v = o.smufl_font
+    if v is not None:
+        p.append('"smuflFont":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventNoteTie(o: DefEvent.Note.Tie) -> str:
+    p = []
+    v = o.location
+    if v is not None:
+        p.append('"location":' + _str(v))
+    v = o.target
+    if v is not None:
+        p.append('"target":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventNotePerform(o: DefEvent.Note.Perform) -> str:
+    return "{}"
+
+
+def encodeDefEventNotePitch(o: DefEvent.Note.Pitch) -> str:
+    p = []
+    v = o.step
+    if v is not None:
+        p.append('"step":' + _str(v))
+    v = o.octave
+    if v is not None:
+        p.append('"octave":' + _int(v))
+    v = o.alter
+    if v is not None:
+        p.append('"alter":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventNoteAccidentalDisplay(o: DefEvent.Note.AccidentalDisplay) -> str:
+    p = []
+    v = o.show
+    if v is not None:
+        p.append('"show":' + ("true" if v else "false"))
+    v = o.editorial
+    if v is not None:
+        p.append('"editorial":' + ("true" if v else "false"))
+    v = o.cautionary
+    if v is not None:
+        p.append('"cautionary":' + ("true" if v else "false"))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventRest(o: DefEvent.Rest) -> str:
+    p = []
+    v = o.staff_position
+    if v is not None:
+        p.append('"staffPosition":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventMarkings(o: DefEvent.Markings) -> str:
+    p = []
+    v = o.soft_accent
+    if v is not None:
+        p.append('"softAccent":' + encodeDefEventMarkingsSoftAccent(v))
+    v = o.staccato
+    if v is not None:
+        p.append('"staccato":' + encodeDefEventMarkingsStaccato(v))
+    v = o.tenuto
+    if v is not None:
+        p.append('"tenuto":' + encodeDefEventMarkingsTenuto(v))
+    v = o.breath
+    if v is not None:
+        p.append('"breath":' + encodeDefEventMarkingsBreath(v))
+    v = o.unstress
+    if v is not None:
+        p.append('"unstress":' + encodeDefEventMarkingsUnstress(v))
+    v = o.strong_accent
+    if v is not None:
+        p.append('"strongAccent":' + encodeDefEventMarkingsStrongAccent(v))
+    v = o.accent
+    if v is not None:
+        p.append('"accent":' + encodeDefEventMarkingsAccent(v))
+    v = o.stress
+    if v is not None:
+        p.append('"stress":' + encodeDefEventMarkingsStress(v))
+    v = o.tremolo
+    if v is not None:
+        p.append('"tremolo":' + encodeDefEventMarkingsTremolo(v))
+    v = o.staccatissimo
+    if v is not None:
+        p.append('"staccatissimo":' + encodeDefEventMarkingsStaccatissimo(v))
+    v = o.spiccato
+    if v is not None:
+        p.append('"spiccato":' + encodeDefEventMarkingsSpiccato(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventMarkingsStaccatissimo(o: DefEvent.Markings.Staccatissimo) -> str:
+    return "{}"
+
+
+def encodeDefEventMarkingsStrongAccent(o: DefEvent.Markings.StrongAccent) -> str:
+    p = []
+    v = o.pointing
+    if v is not None:
+        p.append('"pointing":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventMarkingsSoftAccent(o: DefEvent.Markings.SoftAccent) -> str:
+    return "{}"
+
+
+def encodeDefEventMarkingsTremolo(o: DefEvent.Markings.Tremolo) -> str:
+    p = []
+    v = o.marks
+    if v is not None:
+        p.append('"marks":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventMarkingsTenuto(o: DefEvent.Markings.Tenuto) -> str:
+    return "{}"
+
+
+def encodeDefEventMarkingsStress(o: DefEvent.Markings.Stress) -> str:
+    return "{}"
+
+
+def encodeDefEventMarkingsAccent(o: DefEvent.Markings.Accent) -> str:
+    p = []
+    v = o.pointing
+    if v is not None:
+        p.append('"pointing":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventMarkingsStaccato(o: DefEvent.Markings.Staccato) -> str:
+    return "{}"
+
+
+def encodeDefEventMarkingsBreath(o: DefEvent.Markings.Breath) -> str:
+    p = []
+    v = o.symbol
+    if v is not None:
+        p.append('"symbol":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefEventMarkingsUnstress(o: DefEvent.Markings.Unstress) -> str:
+    return "{}"
+
+
+def encodeDefEventMarkingsSpiccato(o: DefEvent.Markings.Spiccato) -> str:
+    return "{}"
+
+
+def encodeDefBeam(o: DefBeam) -> str:
+    p = []
+    v = o.events
+    if v is not None:
+        p.append('"events":' + "[" + ",".join([_str(e) for e in v]) + "]")
+    v = o.hooks
+    if v is not None:
+        p.append('"hooks":' + "[" + ",".join([encodeDefBeamHook(e) for e in v]) + "]")
+    v = o.inner
+    if v is not None:
+        p.append('"inner":' + "[" + ",".join([encodeDefBeam(e) for e in v]) + "]")
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefBeamHook(o: DefBeam.Hook) -> str:
+    p = []
+    v = o.direction
+    if v is not None:
+        p.append('"direction":' + _str(v))
+    v = o.event
+    if v is not None:
+        p.append('"event":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeDefNoteValueQuantity(o: DefNoteValueQuantity) -> str:
+    p = []
+    v = o.multiple
+    if v is not None:
+        p.append('"multiple":' + _int(v))
+    v = o.duration
+    if v is not None:
+        p.append('"duration":' + encodeDefNoteValue(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTop(o: Top) -> str:
+    p = []
+    v = o.global_
+    if v is not None:
+        p.append('"global":' + encodeTopGlobal(v))
+    v = o.mnx
+    if v is not None:
+        p.append('"mnx":' + encodeTopMnx(v))
+    v = o.parts
+    if v is not None:
+        p.append('"parts":' + "[" + ",".join([encodeTopPart(e) for e in v]) + "]")
+    v = o.scores
+    if v is not None:
+        p.append('"scores":' + "[" + ",".join([encodeTopScore(e) for e in v]) + "]")
+    v = o.layouts
+    if v is not None:
+        p.append('"layouts":' + "[" + ",".join([encodeTopLayout(e) for e in v]) + "]")
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobal(o: Top.Global) -> str:
+    p = []
+    v = o.measures
+    if v is not None:
+        p.append(
+            '"measures":' + "[" + ",".join([encodeTopGlobalMeasure(e) for e in v]) + "]"
+        )
+    v = o.styles
+    if v is not None:
+        p.append(
+            '"styles":' + "[" + ",".join([encodeTopGlobalStyle(e) for e in v]) + "]"
+        )
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalStyle(o: Top.Global.Style) -> str:
+    p = []
+    v = o.selector
+    if v is not None:
+        p.append('"selector":' + _str(v))
+    v = o.color
+    if v is not None:
+        p.append('"color":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasure(o: Top.Global.Measure) -> str:
+    p = []
+    v = o.jump
+    if v is not None:
+        p.append('"jump":' + encodeTopGlobalMeasureJump(v))
+    v = o.fine
+    if v is not None:
+        p.append('"fine":' + encodeTopGlobalMeasureFine(v))
+    v = o.tempos
+    if v is not None:
+        p.append(
+            '"tempos":'
+            + "["
+            + ",".join([encodeTopGlobalMeasureTempo(e) for e in v])
+            + "]"
+        )
+    v = o.ending
+    if v is not None:
+        p.append('"ending":' + encodeTopGlobalMeasureEnding(v))
+    v = o.number
+    if v is not None:
+        p.append('"number":' + _int(v))
+    v = o.barline
+    if v is not None:
+        p.append('"barline":' + encodeTopGlobalMeasureBarline(v))
+    v = o.index
+    if v is not None:
+        p.append('"index":' + _int(v))
+    v = o.repeat_start
+    if v is not None:
+        p.append('"repeatStart":' + encodeTopGlobalMeasureRepeatStart(v))
+    v = o.time
+    if v is not None:
+        p.append('"time":' + encodeTopGlobalMeasureTime(v))
+    v = o.key
+    if v is not None:
+        p.append('"key":' + encodeTopGlobalMeasureKey(v))
+    v = o.segno
+    if v is not None:
+        p.append('"segno":' + encodeTopGlobalMeasureSegno(v))
+    v = o.repeat_end
+    if v is not None:
+        p.append('"repeatEnd":' + encodeTopGlobalMeasureRepeatEnd(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureSegno(o: Top.Global.Measure.Segno) -> str:
+    p = []
+    v = o.location
+    if v is not None:
+        p.append('"location":' + _str(v))
+    v = o.class_
+    if v is not None:
+        p.append('"class":' + _str(v))
+    v = o.color
+    if v is not None:
+        p.append('"color":' + _str(v))
+    v = o.glyph
+    if v is not None:
+        p.append('"glyph":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureBarline(o: Top.Global.Measure.Barline) -> str:
+    p = []
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureTime(o: Top.Global.Measure.Time) -> str:
+    p = []
+    v = o.unit
+    if v is not None:
+        p.append('"unit":' + _int(v))
+    v = o.count
+    if v is not None:
+        p.append('"count":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureTempo(o: Top.Global.Measure.Tempo) -> str:
+    p = []
+    v = o.bpm
+    if v is not None:
+        p.append('"bpm":' + _int(v))
+    v = o.value
+    if v is not None:
+        p.append('"value":' + encodeDefNoteValue(v))
+    v = o.location
+    if v is not None:
+        p.append('"location":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureKey(o: Top.Global.Measure.Key) -> str:
+    p = []
+    v = o.fifths
+    if v is not None:
+        p.append('"fifths":' + _int(v))
+    v = o.class_
+    if v is not None:
+        p.append('"class":' + _str(v))
+    v = o.color
+    if v is not None:
+        p.append('"color":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureFine(o: Top.Global.Measure.Fine) -> str:
+    p = []
+    v = o.location
+    if v is not None:
+        p.append('"location":' + _str(v))
+    v = o.class_
+    if v is not None:
+        p.append('"class":' + _str(v))
+    v = o.color
+    if v is not None:
+        p.append('"color":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureEnding(o: Top.Global.Measure.Ending) -> str:
+    p = []
+    v = o.duration
+    if v is not None:
+        p.append('"duration":' + _int(v))
+    v = o.numbers
+    if v is not None:
+        p.append('"numbers":' + "[" + ",".join([_int(e) for e in v]) + "]")
+    v = o.class_
+    if v is not None:
+        p.append('"class":' + _str(v))
+    v = o.open
+    if v is not None:
+        p.append('"open":' + ("true" if v else "false"))
+    v = o.color
+    if v is not None:
+        p.append('"color":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureRepeatStart(o: Top.Global.Measure.RepeatStart) -> str:
+    return "{}"
+
+
+def encodeTopGlobalMeasureJump(o: Top.Global.Measure.Jump) -> str:
+    p = []
+    v = o.location
+    if v is not None:
+        p.append('"location":' + _str(v))
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalMeasureRepeatEnd(o: Top.Global.Measure.RepeatEnd) -> str:
+    p = []
+    v = o.times
+    if v is not None:
+        p.append('"times":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopLayout(o: Top.Layout) -> str:
+    p = []
+    v = o.content
+    if v is not None:
+        p.append('"content":' + "[" + ",".join([encoders[type(e)](e) for e in v]) + "]")
+    v = o.id
+    if v is not None:
+        p.append('"id":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPart(o: Top.Part) -> str:
+    p = []
+    v = o.smufl_font
+    if v is not None:
+        p.append('"smuflFont":' + _str(v))
+    v = o.id
+    if v is not None:
+        p.append('"id":' + _str(v))
+    v = o.measures
+    if v is not None:
+        p.append(
+            '"measures":' + "[" + ",".join([encodeTopPartMeasure(e) for e in v]) + "]"
+        )
+    v = o.name
+    if v is not None:
+        p.append('"name":' + _str(v))
+    v = o.short_name
+    if v is not None:
+        p.append('"shortName":' + _str(v))
+    v = o.staves
+    if v is not None:
+        p.append('"staves":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasure(o: Top.Part.Measure) -> str:
+    p = []
+    v = o.sequences
+    if v is not None:
+        p.append(
+            '"sequences":'
+            + "["
+            + ",".join([encodeTopPartMeasureSequence(e) for e in v])
+            + "]"
+        )
+    v = o.beams
+    if v is not None:
+        p.append('"beams":' + "[" + ",".join([encodeDefBeam(e) for e in v]) + "]")
+    v = o.clefs
+    if v is not None:
+        p.append(
+            '"clefs":' + "[" + ",".join([encodeTopPartMeasureClef(e) for e in v]) + "]"
+        )
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureClef(o: Top.Part.Measure.Clef) -> str:
+    p = []
+    v = o.clef
+    if v is not None:
+        p.append('"clef":' + encodeTopPartMeasureClefClef(v))
+    v = o.position
+    if v is not None:
+        p.append('"position":' + encodeTopPartMeasureClefPosition(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureClefPosition(o: Top.Part.Measure.Clef.Position) -> str:
+    p = []
+    v = o.fraction
+    if v is not None:
+        p.append('"fraction":' + "[" + ",".join([_int(e) for e in v]) + "]")
+    v = o.grace_index
+    if v is not None:
+        p.append('"graceIndex":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureClefClef(o: Top.Part.Measure.Clef.Clef) -> str:
+    p = []
+    v = o.staff_position
+    if v is not None:
+        p.append('"staffPosition":' + _int(v))
+    v = o.sign
+    if v is not None:
+        p.append('"sign":' + _str(v))
+    v = o.color
+    if v is not None:
+        p.append('"color":' + _str(v))
+    v = o.glyph
+    if v is not None:
+        p.append('"glyph":' + _str(v))
+    v = o.class_
+    if v is not None:
+        p.append('"class":' + _str(v))
+    v = o.octave
+    if v is not None:
+        p.append('"octave":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureSequence(o: Top.Part.Measure.Sequence) -> str:
+    p = []
+    v = o.content
+    if v is not None:
+        p.append('"content":' + "[" + ",".join([encoders[type(e)](e) for e in v]) + "]")
+    v = o.staff
+    if v is not None:
+        p.append('"staff":' + _int(v))
+    v = o.voice
+    if v is not None:
+        p.append('"voice":' + _str(v))
+    v = o.orient
+    if v is not None:
+        p.append('"orient":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureSequenceContentChoice5(
+    o: Top.Part.Measure.Sequence.ContentChoice5,
+) -> str:
+    p = []
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    v = o.value
+    if v is not None:
+        p.append('"value":' + _str(v))
+    v = o.glyph
+    if v is not None:
+        p.append('"glyph":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureSequenceContentChoice2(
+    o: Top.Part.Measure.Sequence.ContentChoice2,
+) -> str:
+    p = []
+    v = o.inner
+    if v is not None:
+        p.append('"inner":' + encodeDefNoteValueQuantity(v))
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    v = o.outer
+    if v is not None:
+        p.append('"outer":' + encodeDefNoteValueQuantity(v))
+    v = o.content
+    if v is not None:
+        p.append('"content":' + "[" + ",".join([encodeDefEvent(e) for e in v]) + "]")
+    v = o.staff
+    if v is not None:
+        p.append('"staff":' + _int(v))
+    v = o.orient
+    if v is not None:
+        p.append('"orient":' + _str(v))
+    v = o.bracket
+    if v is not None:
+        p.append('"bracket":' + _str(v))
+    v = o.show_number
+    if v is not None:
+        p.append('"showNumber":' + _str(v))
+    v = o.show_value
+    if v is not None:
+        p.append('"showValue":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureSequenceContentChoice3(
+    o: Top.Part.Measure.Sequence.ContentChoice3,
+) -> str:
+    p = []
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    v = o.value
+    if v is not None:
+        p.append('"value":' + _int(v))
+    v = o.end
+    if v is not None:
+        p.append('"end":' + _str(v))
+    v = o.orient
+    if v is not None:
+        p.append('"orient":' + _str(v))
+    v = o.staff
+    if v is not None:
+        p.append('"staff":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureSequenceContentChoice4(
+    o: Top.Part.Measure.Sequence.ContentChoice4,
+) -> str:
+    p = []
+    v = o.duration
+    if v is not None:
+        p.append('"duration":' + encodeDefNoteValueQuantity(v))
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartMeasureSequenceContentChoice1(
+    o: Top.Part.Measure.Sequence.ContentChoice1,
+) -> str:
+    p = []
+    v = o.type
+    if v is not None:
+        p.append('"type":' + _str(v))
+    v = o.content
+    if v is not None:
+        p.append('"content":' + "[" + ",".join([encodeDefEvent(e) for e in v]) + "]")
+    v = o.slash
+    if v is not None:
+        p.append('"slash":' + ("true" if v else "false"))
+    v = o.color
+    if v is not None:
+        p.append('"color":' + _str(v))
+    v = o.class_
+    if v is not None:
+        p.append('"class":' + _str(v))
+    v = o.grace_type
+    if v is not None:
+        p.append('"graceType":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopMnx(o: Top.Mnx) -> str:
+    p = []
+    v = o.version
+    if v is not None:
+        p.append('"version":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopScore(o: Top.Score) -> str:
+    p = []
+    v = o.name
+    if v is not None:
+        p.append('"name":' + _str(v))
+    v = o.multimeasure_rests
+    if v is not None:
+        p.append(
+            '"multimeasureRests":'
+            + "["
+            + ",".join([encodeTopScoreMultimeasureRest(e) for e in v])
+            + "]"
+        )
+    v = o.layout
+    if v is not None:
+        p.append('"layout":' + _str(v))
+    v = o.pages
+    if v is not None:
+        p.append('"pages":' + "[" + ",".join([encodeTopScorePage(e) for e in v]) + "]")
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopScoreMultimeasureRest(o: Top.Score.MultimeasureRest) -> str:
+    p = []
+    v = o.start
+    if v is not None:
+        p.append('"start":' + _int(v))
+    v = o.duration
+    if v is not None:
+        p.append('"duration":' + _int(v))
+    v = o.label
+    if v is not None:
+        p.append('"label":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopScorePage(o: Top.Score.Page) -> str:
+    p = []
+    v = o.systems
+    if v is not None:
+        p.append(
+            '"systems":'
+            + "["
+            + ",".join([encodeTopScorePageSystem(e) for e in v])
+            + "]"
+        )
+    v = o.layout
+    if v is not None:
+        p.append('"layout":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopScorePageSystem(o: Top.Score.Page.System) -> str:
+    p = []
+    v = o.measure
+    if v is not None:
+        p.append('"measure":' + _int(v))
+    v = o.layout_changes
+    if v is not None:
+        p.append(
+            '"layoutChanges":'
+            + "["
+            + ",".join([encodeTopScorePageSystemLayoutChange(e) for e in v])
+            + "]"
+        )
+    v = o.layout
+    if v is not None:
+        p.append('"layout":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopScorePageSystemLayoutChange(o: Top.Score.Page.System.LayoutChange) -> str:
+    p = []
+    v = o.layout
+    if v is not None:
+        p.append('"layout":' + _str(v))
+    v = o.location
+    if v is not None:
+        p.append('"location":' + _str(v))
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopGlobalHead(o: Top.Global) -> str:
+    p = []
+    v = o.styles
+    if v is not None:
+        p.append(
+            '"styles":' + "[" + ",".join([encodeTopGlobalStyle(e) for e in v]) + "]"
+        )
+    return "{" + ",".join(p) + "}"
+
+
+def encodeTopPartHead(o: Top.Part) -> str:
+    p = []
+    v = o.smufl_font
+    if v is not None:
+        p.append('"smuflFont":' + _str(v))
+    v = o.id
+    if v is not None:
+        p.append('"id":' + _str(v))
+    v = o.name
+    if v is not None:
+        p.append('"name":' + _str(v))
+    v = o.short_name
+    if v is not None:
+        p.append('"shortName":' + _str(v))
+    v = o.staves
+    if v is not None:
+        p.append('"staves":' + _int(v))
+    return "{" + ",".join(p) + "}"
+
+
+encoders: dict[type, Callable[[Any], str]] = EncoderTable(
+    {
+        DefSystemLayoutContentChoice1: encodeDefSystemLayoutContentChoice1,
+        DefSystemLayoutContentChoice1.Source: encodeDefSystemLayoutContentChoice1Source,
+        DefSystemLayoutContentChoice0: encodeDefSystemLayoutContentChoice0,
+        DefNoteValue: encodeDefNoteValue,
+        DefEvent: encodeDefEvent,
+        DefEvent.Slur: encodeDefEventSlur,
+        DefEvent.Note: encodeDefEventNote,
+        DefEvent.Note.Tie: encodeDefEventNoteTie,
+        DefEvent.Note.Perform: encodeDefEventNotePerform,
+        DefEvent.Note.Pitch: encodeDefEventNotePitch,
+        DefEvent.Note.AccidentalDisplay: encodeDefEventNoteAccidentalDisplay,
+        DefEvent.Rest: encodeDefEventRest,
+        DefEvent.Markings: encodeDefEventMarkings,
+        DefEvent.Markings.Staccatissimo: encodeDefEventMarkingsStaccatissimo,
+        DefEvent.Markings.StrongAccent: encodeDefEventMarkingsStrongAccent,
+        DefEvent.Markings.SoftAccent: encodeDefEventMarkingsSoftAccent,
+        DefEvent.Markings.Tremolo: encodeDefEventMarkingsTremolo,
+        DefEvent.Markings.Tenuto: encodeDefEventMarkingsTenuto,
+        DefEvent.Markings.Stress: encodeDefEventMarkingsStress,
+        DefEvent.Markings.Accent: encodeDefEventMarkingsAccent,
+        DefEvent.Markings.Staccato: encodeDefEventMarkingsStaccato,
+        DefEvent.Markings.Breath: encodeDefEventMarkingsBreath,
+        DefEvent.Markings.Unstress: encodeDefEventMarkingsUnstress,
+        DefEvent.Markings.Spiccato: encodeDefEventMarkingsSpiccato,
+        DefBeam: encodeDefBeam,
+        DefBeam.Hook: encodeDefBeamHook,
+        DefNoteValueQuantity: encodeDefNoteValueQuantity,
+        Top: encodeTop,
+        Top.Global: encodeTopGlobal,
+        Top.Global.Style: encodeTopGlobalStyle,
+        Top.Global.Measure: encodeTopGlobalMeasure,
+        Top.Global.Measure.Segno: encodeTopGlobalMeasureSegno,
+        Top.Global.Measure.Barline: encodeTopGlobalMeasureBarline,
+        Top.Global.Measure.Time: encodeTopGlobalMeasureTime,
+        Top.Global.Measure.Tempo: encodeTopGlobalMeasureTempo,
+        Top.Global.Measure.Key: encodeTopGlobalMeasureKey,
+        Top.Global.Measure.Fine: encodeTopGlobalMeasureFine,
+        Top.Global.Measure.Ending: encodeTopGlobalMeasureEnding,
+        Top.Global.Measure.RepeatStart: encodeTopGlobalMeasureRepeatStart,
+        Top.Global.Measure.Jump: encodeTopGlobalMeasureJump,
+        Top.Global.Measure.RepeatEnd: encodeTopGlobalMeasureRepeatEnd,
+        Top.Layout: encodeTopLayout,
+        Top.Part: encodeTopPart,
+        Top.Part.Measure: encodeTopPartMeasure,
+        Top.Part.Measure.Clef: encodeTopPartMeasureClef,
+        Top.Part.Measure.Clef.Position: encodeTopPartMeasureClefPosition,
+        Top.Part.Measure.Clef.Clef: encodeTopPartMeasureClefClef,
+        Top.Part.Measure.Sequence: encodeTopPartMeasureSequence,
+        Top.Part.Measure.Sequence.ContentChoice5: encodeTopPartMeasureSequenceContentChoice5,
+        Top.Part.Measure.Sequence.ContentChoice2: encodeTopPartMeasureSequenceContentChoice2,
+        Top.Part.Measure.Sequence.ContentChoice3: encodeTopPartMeasureSequenceContentChoice3,
+        Top.Part.Measure.Sequence.ContentChoice4: encodeTopPartMeasureSequenceContentChoice4,
+        Top.Part.Measure.Sequence.ContentChoice1: encodeTopPartMeasureSequenceContentChoice1,
+        Top.Mnx: encodeTopMnx,
+        Top.Score: encodeTopScore,
+        Top.Score.MultimeasureRest: encodeTopScoreMultimeasureRest,
+        Top.Score.Page: encodeTopScorePage,
+        Top.Score.Page.System: encodeTopScorePageSystem,
+        Top.Score.Page.System.LayoutChange: encodeTopScorePageSystemLayoutChange,
+    }
+)
+
+
+def toJson(o: Any) -> str:
+    return _any(o)
+
+
+def writeTop(o: Top, f: TextIO) -> None:
+    # The same document as toJson(o), but the measures of global and of each
+    # part are written one at a time, after the other fields of their object.
+    f.write('{"global":')
+    writeObject(
+        f, encodeTopGlobalHead(o.global_), o.global_.measures, encodeTopGlobalMeasure
+    )
+    f.write(',"mnx":' + encodeTopMnx(o.mnx) + ',"parts":[')
+    for i, part in enumerate(o.parts):
+        if i:
+            f.write(",")
+        writeObject(f, encodeTopPartHead(part), part.measures, encodeTopPartMeasure)
+    f.write("]")
+    if o.scores is not None:
+        f.write(',"scores":' + _any(o.scores))
+    if o.layouts is not None:
+        f.write(',"layouts":' + _any(o.layouts))
+    f.write("}")
+
+
+def writeObject(
+    f: TextIO, head: str, measures: Optional[list], encode: Callable[[Any], str]
+) -> None:
+    # head is the text of the object without its measures, e.g. '{"id":"P1"}'.
+    if measures is None:
+        f.write(head)
+        return
+    f.write(head[:-1] + ("," if head != "{}" else "") + '"measures":[')
+    for i, m in enumerate(measures):
+        f.write("," + encode(m) if i else encode(m))
+    f.write("]}")
@@ -0,0 +1,108 @@
+# This file is generated by generate-tables.py from mnx-schema.json.
+# Do not edit by hand.
+#
+# Constant tables between MNX values and their music21 counterparts.
+# Values that music21 has no counterpart for are left out.
+
+from types import MappingProxyType
+from typing import Mapping
+
+from music21 import articulations, clef
+
+# The music21 duration type of each MNX note value base, from the longest.
+durationTypes: Mapping[str, str] = MappingProxyType(
+    {
+        "duplexMaxima": "duplex-maxima",
+        "maxima": "maxima",
+        "longa": "longa",
+        "breve": "breve",
+        "whole": "whole",
+        "half": "half",
+        "quarter": "quarter",
+        "eighth": "eighth",
+        "16th": "16th",
+        "32nd": "32nd",
+        "64th": "64th",
+        "128th": "128th",
+        "256th": "256th",
+        "512th": "512th",
+        "1024th": "1024th",
+        "2048th": "2048th",
+    }
+)
+
+# The reverse of durationTypes.
+noteValueBases: Mapping[str, str] = MappingProxyType(
+    {
+        "duplex-maxima": "duplexMaxima",
+        "maxima": "maxima",
+        "longa": "longa",
+        "breve": "breve",
+        "whole": "whole",
+        "half": "half",
+        "quarter": "quarter",
+        "eighth": "eighth",
+        "16th": "16th",
+        "32nd": "32nd",
+        "64th": "64th",
+        "128th": "128th",
+        "256th": "256th",
+        "512th": "512th",
+        "1024th": "1024th",
+        "2048th": "2048th",
+    }
+)
+
+# The music21 clef class of each MNX clef sign.
+clefClasses: Mapping[str, type[clef.Clef]] = MappingProxyType(
+    {
+        "C": clef.CClef,
+        "F": clef.FClef,
+        "G": clef.GClef,
+    }
+)
+
+# The markings that become a music21 articulation, in the order they are
+# added to a note, as (field of mnx.DefEvent.Markings, articulation class).
+# Breath marks also take the breath symbol.
+articulationFields: tuple[tuple[str, type[articulations.Articulation]], ...] = (
+    ("accent", articulations.Accent),
+    ("strong_accent", articulations.StrongAccent),
+    ("breath", articulations.BreathMark),
+    ("staccato", articulations.Staccato),
+    ("staccatissimo", articulations.Staccatissimo),
+    ("spiccato", articulations.Spiccato),
+    ("tenuto", articulations.Tenuto),
+    ("unstress", articulations.Unstress),
+    ("stress", articulations.Stress),
+)
+
+# The MNX marking of the articulations that are nothing more.
+markingNames: Mapping[type[articulations.Articulation], str] = MappingProxyType(
+    {
+        articulations.Accent: "accent",
+        articulations.StrongAccent: "strongAccent",
+        articulations.Staccato: "staccato",
+        articulations.Staccatissimo: "staccatissimo",
+        articulations.Spiccato: "spiccato",
+        articulations.Tenuto: "tenuto",
+        articulations.Unstress: "unstress",
+        articulations.Stress: "stress",
+    }
+)
+
+# The music21 placement of each MNX slur side.
+slurPlacements: Mapping[str, str] = MappingProxyType(
+    {
+        "up": "above",
+        "down": "below",
+    }
+)
+
+# The reverse of slurPlacements.
+slurSides: Mapping[str, str] = MappingProxyType(
+    {
+        "above": "up",
+        "below": "down",
+    }
+)
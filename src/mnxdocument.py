@@ -0,0 +1,137 @@
+from typing import Iterator, Optional, Tuple, Union
+import json
+
+import mnx
+import mnx.decoders
+from topcache import topCache
+
+# MNX documents as data, without music21: decoding them, whole or in part.
+#
+# None of this imports music21, which takes far longer to import than
+# a document takes to decode. The converter uses these functions, but
+# checking that a document decodes, or picking parts and measures out of it,
+# does not need the converter at all.
+
+
+def decodeDocument(
+    data: Union[str, bytes],
+    parts: Optional[list[Union[str, int]]] = None,
+    measures: Optional[Tuple[int, int]] = None,
+    cacheDecoded: bool = False,
+) -> mnx.Top:
+    """
+    Decodes an MNX document, or only the given parts and measures of it
+    (see selectDocument). With cacheDecoded, whole documents are kept in topCache.
+    """
+    if parts is not None or measures is not None:
+        return mnx.decoders.topFromDict(
+            selectDocument(json.loads(data), parts, measures)
+        )
+    if cacheDecoded:
+        return topCache.decode(data)
+    return mnx.decoders.topFromJson(data)  # type: ignore
+
+
+def measureFromDict(d: dict) -> mnx.Top.Part.Measure:
+    try:
+        return mnx.decoders.decodeTopPartMeasure(d)
+    except (mnx.decoders.DecodeError, KeyError, TypeError, AttributeError):
+        pass
+
+    # The dataclass wizard only knows how to tell apart the types in
+    # Sequence.content through the settings on mnx.Top (see README),
+    # so a lone measure is decoded by wrapping it in a minimal document.
+    top = mnx.Top.from_dict(
+        {
+            "mnx": {"version": 1},
+            "global": {"measures": []},
+            "parts": [{"measures": [d]}],
+        }
+    )
+    assert top.parts[0].measures is not None
+    return top.parts[0].measures[0]
+
+
+def selectDocument(
+    d: dict,
+    parts: Optional[list[Union[str, int]]] = None,
+    measures: Optional[Tuple[int, int]] = None,
+) -> dict:
+    """
+    Cuts an MNX document, as returned by json.load, down to the given parts (by id,
+    or by index from 0) and measures (from first to last, counting from 1), so that
+    nothing else gets decoded or converted. The first measure kept gets the key,
+    time signature and clefs in effect at that point of the whole document.
+    """
+    globalMeasures: list[dict] = d["global"]["measures"]
+    inParts: list[dict] = d["parts"]
+
+    if parts is not None:
+        byId = {p["id"]: p for p in inParts if "id" in p}
+        selected = []
+        for wanted in parts:
+            if isinstance(wanted, int) and 0 <= wanted < len(inParts):
+                selected.append(inParts[wanted])
+            elif wanted in byId:
+                selected.append(byId[wanted])
+            else:
+                raise ValueError(f"The MNX document has no part {wanted!r}.")
+        inParts = selected
+
+    start, stop = 0, len(globalMeasures)
+    if measures is not None:
+        first, last = measures
+        if not 1 <= first <= last <= len(globalMeasures):
+            raise ValueError(
+                f"Measures {first} to {last} are not in the MNX document, "
+                f"which has {len(globalMeasures)} measures."
+            )
+        start, stop = first - 1, last
+
+    def cut(inMeasures: list[dict], inherited: tuple[str, ...]) -> list[dict]:
+        kept = inMeasures[start:stop]
+        if start == 0:
+            return kept
+        # Fields that only appear when they change are copied from
+        # the last measure before the selection that has them.
+        firstMeas = dict(kept[0])
+        for field in inherited:
+            if field in firstMeas:
+                continue
+            for m in reversed(inMeasures[:start]):
+                if field in m:
+                    firstMeas[field] = m[field]
+                    break
+        return [firstMeas] + kept[1:]
+
+    outParts = []
+    for inPart in inParts:
+        outMeasures = cut(inPart["measures"], ())
+        if start > 0 and not any(
+            "position" not in c for c in outMeasures[0].get("clefs", [])
+        ):
+            # Only the last clef before the selection is still in effect.
+            for m in reversed(inPart["measures"][:start]):
+                if m.get("clefs"):
+                    clefs = [{"clef": m["clefs"][-1]["clef"]}]
+                    clefs += outMeasures[0].get("clefs", [])
+                    outMeasures[0] = {**outMeasures[0], "clefs": clefs}
+                    break
+        outParts.append({**inPart, "measures": outMeasures})
+
+    return {
+        **d,
+        "global": {**d["global"], "measures": cut(globalMeasures, ("key", "time"))},
+        "parts": outParts,
+    }
+
+
+def beamEventIds(inBeam: mnx.DefBeam) -> Iterator[str]:
+    # Every event a beam refers to, including those of its inner beams and hooks.
+    stack = [inBeam]
+    while stack:
+        inBeam = stack.pop()
+        yield from inBeam.events
+        stack += inBeam.inner or ()
+        for hook in inBeam.hooks or ():
+            yield hook.event
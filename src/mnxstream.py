@@ -0,0 +1,172 @@
+from typing import Any, Iterable, Iterator, TextIO, Tuple
+import json
+
+# Incremental reader and writer for MNX documents.
+#
+# json.load needs the whole document in memory, and mnx.Top.from_json then builds
+# the whole dataclass tree on top of it. This reader only keeps a small window of
+# the file in memory and hands out the measures one at a time, so each of them can
+# be converted and released before the next one is read.
+#
+# readEvents yields (kind, value) pairs, in the order they appear in the file:
+#   ("globalMeasure", dict)  for each element of global.measures
+#   ("global", dict)         the rest of global, without "measures"
+#   ("partStart", None)      at the start of each element of parts
+#   ("partMeasure", dict)    for each element of parts[_].measures
+#   ("partEnd", dict)        the rest of the part, without "measures"
+#   (key, value)             for every other top-level field, e.g. ("mnx", {...})
+#
+# writeDocument goes the other way: it takes the measures one at a time and
+# writes each of them out before asking for the next one.
+
+_decoder = json.JSONDecoder()
+_encoder = json.JSONEncoder(separators=(",", ":"))
+_whitespace = " \t\n\r"
+
+
+class MNXStreamReader:
+    def __init__(self, f: TextIO, chunkSize: int = 1 << 16):
+        self.f = f
+        self.chunkSize = chunkSize
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, minimum: int = 0) -> bool:
+        # Drop everything that has been consumed and read at least one more chunk.
+        if self.eof:
+            return False
+        chunk = self.f.read(max(self.chunkSize, minimum))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        # Returns the next non-whitespace character without consuming it, or "" at the end.
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _whitespace:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"Expected {ch!r} in MNX document but found {found!r}.")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number at the very end of the buffer may continue in the next chunk.
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # The value is not complete yet. Grow the window geometrically,
+            # so that decoding a big value from scratch again stays linear overall.
+            self.fill(len(self.buf) - self.pos)
+
+    def members(self) -> Iterator[str]:
+        # Yields the keys of an object. The caller has to consume each value before resuming.
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Object keys in an MNX document must be strings.")
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("}")
+                return
+
+    def elements(self) -> Iterator[None]:
+        # Yields once per array element. The caller has to consume each element before resuming.
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield None
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("]")
+                return
+
+
+def readEvents(f: TextIO, chunkSize: int = 1 << 16) -> Iterator[Tuple[str, Any]]:
+    r = MNXStreamReader(f, chunkSize)
+    for key in r.members():
+        if key == "global":
+            rest: dict[str, Any] = {}
+            for globalKey in r.members():
+                if globalKey == "measures":
+                    for _ in r.elements():
+                        yield "globalMeasure", r.value()
+                else:
+                    rest[globalKey] = r.value()
+            yield "global", rest
+        elif key == "parts":
+            for _ in r.elements():
+                yield "partStart", None
+                rest = {}
+                for partKey in r.members():
+                    if partKey == "measures":
+                        for _ in r.elements():
+                            yield "partMeasure", r.value()
+                    else:
+                        rest[partKey] = r.value()
+                yield "partEnd", rest
+        else:
+            yield key, r.value()
+
+    if r.peek() != "":
+        raise ValueError("Unexpected data after the end of the MNX document.")
+
+
+def writeDocument(
+    f: TextIO,
+    version: int,
+    globalMeasures: Iterable[dict],
+    parts: Iterable[Tuple[dict, Iterable[dict]]],
+) -> None:
+    """
+    Writes an MNX document to f. parts yields each part's fields other than
+    "measures", along with its measures. Everything may be generated on the fly:
+    each measure is written before the next one is requested.
+    Every measure is on a line of its own.
+    """
+    encode = _encoder.encode
+    f.write(f'{{"mnx":{{"version":{encode(version)}}},"global":{{"measures":[')
+    writeElements(f, globalMeasures)
+    f.write(']},"parts":[')
+    for i, (fields, measures) in enumerate(parts):
+        f.write(",\n{" if i else "\n{")
+        for name, value in fields.items():
+            f.write(f"{encode(name)}:{encode(value)},")
+        f.write('"measures":[')
+        writeElements(f, measures)
+        f.write("]}")
+    f.write("]}\n")
+
+
+def writeElements(f: TextIO, values: Iterable[Any]) -> None:
+    encode = _encoder.encode
+    for i, value in enumerate(values):
+        f.write(",\n" if i else "\n")
+        f.write(encode(value))
@@ -0,0 +1,540 @@
+from collections import Counter
+from fractions import Fraction
+from typing import Iterator, Optional, TextIO, Tuple
+import io
+import logging
+
+from music21 import (
+    articulations,
+    bar,
+    chord,
+    clef,
+    duration,
+    expressions,
+    harmony,
+    key,
+    meter,
+    note,
+    spanner,
+    stream,
+    tempo,
+)
+import music21
+import convert
+import mnx.tables
+import mnxstream
+
+log = logging.getLogger(__name__)
+
+# Writes music21 scores as MNX, see MNXConverter.write.
+#
+# This is the reverse of MNXConverter.parseData and covers the same ground:
+# what the converter reads is written back the way it would read it, and what
+# it cannot read is left out with a warning, or refused if leaving it out would
+# change the timing of the music.
+#
+# The document is written out measure by measure with mnxstream.writeDocument,
+# without building the whole of it first. Ties, slurs and beams point forward to
+# events that are not written yet, so those events get their ids assigned as
+# soon as something refers to them, and keep them until they are written.
+
+# music21 names some barlines differently from MNX.
+barlineTypes: dict[str, str] = {
+    "double": "light-light",
+    "final": "light-heavy",
+}
+
+# Where an event sits in a part: (measure index, sequence index, event index).
+Position = Tuple[int, int, int]
+
+
+class MNXWriter:
+    def __init__(self, obj: stream.Stream):
+        if isinstance(obj, stream.Score):
+            parts = list(obj.parts)
+        elif isinstance(obj, stream.Part):
+            parts = [obj]
+        else:
+            raise ValueError("Only scores and parts can be written as MNX.")
+        if not parts:
+            raise ValueError("A score needs at least one part to be written as MNX.")
+        # Parts that are only a list of notes get measures the way music21 would
+        # make them when writing MusicXML.
+        self.parts = [p if p.hasMeasures() else p.makeNotation() for p in parts]
+        self.measures = [list(p.getElementsByClass(stream.Measure)) for p in self.parts]
+        for measures in self.measures[1:]:
+            if len(measures) != len(self.measures[0]):
+                raise ValueError("All parts need the same number of measures.")
+
+        # Ids of objects referred to before they are written, keyed by (id(obj), role).
+        self.ids: dict[Tuple[int, str], str] = {}
+        self.nextId = 1
+        # Ids that the music21 objects already have, and how often each is used.
+        # Only those used once are kept, so they stay unique in the document.
+        self.ownIds: Counter[str] = Counter()
+        # id() of every event that will be written.
+        self.events: set[int] = set()
+        for part, measures in zip(self.parts, self.measures):
+            if isinstance(part.id, str):
+                self.ownIds[part.id] += 1
+            for outMeas in measures:
+                self.collectEvents(outMeas)
+
+        # Slurs by the id() of the event they start from. Their ends get an id
+        # right away, since a slur may lead into a part that is written earlier.
+        self.slurs: dict[int, list[spanner.Slur]] = {}
+        # id() of the events in the beams written so far that are not written yet.
+        self.beamed: set[int] = set()
+        # Endings by the id() of their first measure.
+        self.endings: dict[int, spanner.RepeatBracket] = {}
+        # The spanners of a score include those of its parts, unless
+        # the parts had to be copied to get measures.
+        seen: set[int] = set()
+        copied = any(p is not q for p, q in zip(parts, self.parts))
+        for part in [obj] + self.parts if copied else [obj]:
+            for sp in part.spannerBundle:
+                if id(sp) in seen:
+                    continue
+                seen.add(id(sp))
+                if isinstance(sp, spanner.Slur):
+                    self.addSlur(sp)
+                elif isinstance(sp, spanner.RepeatBracket):
+                    first = sp.getFirst()
+                    if first is not None:
+                        self.endings[id(first)] = sp
+
+    def collectEvents(self, outMeas: stream.Measure) -> None:
+        voices = [e for e in outMeas.elements if isinstance(e, stream.Voice)]
+        for container in [outMeas] + voices:
+            for n in container.elements:
+                if not isinstance(n, note.GeneralNote) or isinstance(
+                    n, harmony.Harmony
+                ):
+                    continue
+                if n.duration.isGrace:
+                    log.warning("A grace note is omitted.")
+                    continue
+                if isinstance(n.id, str):
+                    self.ownIds[n.id] += 1
+                if isinstance(n, chord.Chord):
+                    for inner in n.notes:
+                        if isinstance(inner.id, str):
+                            self.ownIds[inner.id] += 1
+                self.events.add(id(n))
+
+    def addSlur(self, sp: spanner.Slur) -> None:
+        start, end = sp.getFirst(), sp.getLast()
+        if start is end or id(start) not in self.events or id(end) not in self.events:
+            log.warning(
+                "A slur that does not lead from one event to another is omitted."
+            )
+            return
+        self.slurs.setdefault(id(start), []).append(sp)
+        self.reference(end, "event")
+
+    def write(self, f: TextIO) -> None:
+        mnxstream.writeDocument(f, 1, self.writeGlobalMeasures(), self.writeParts())
+
+    def ownId(self, obj: music21.Music21Object) -> Optional[str]:
+        ident = obj.id
+        if isinstance(ident, str) and self.ownIds[ident] == 1:
+            return ident
+        return None
+
+    def newId(self) -> str:
+        while True:
+            ident = f"e{self.nextId}"
+            self.nextId += 1
+            if ident not in self.ownIds:
+                return ident
+
+    def reference(self, obj: music21.Music21Object, role: str, own: bool = True) -> str:
+        # The id something refers to obj by, which obj will be written with.
+        # A single note is an event of its own, and only gets to keep its own id
+        # as the event: as a note (role "note", own=False) it gets a new one.
+        k = (id(obj), role)
+        ident = self.ids.get(k)
+        if ident is None:
+            ident = (self.ownId(obj) if own else None) or self.newId()
+            self.ids[k] = ident
+        return ident
+
+    def take(
+        self, obj: music21.Music21Object, role: str, own: bool = True
+    ) -> Optional[str]:
+        # The id to write obj with, if it needs one.
+        ident = self.ids.pop((id(obj), role), None)
+        if ident is None and own:
+            ident = self.ownId(obj)
+        return ident
+
+    def writeGlobalMeasures(self) -> Iterator[dict]:
+        for m, outMeas in enumerate(self.measures[0]):
+            sameIndex = [measures[m] for measures in self.measures]
+            yield self.writeGlobalMeasure(m, outMeas, sameIndex)
+
+    def writeGlobalMeasure(
+        self, m: int, outMeas: stream.Measure, sameIndex: list[stream.Measure]
+    ) -> dict:
+        # Everything that applies to all parts is read off the first one.
+        out: dict = {}
+        if outMeas.number:
+            out["number"] = outMeas.number
+
+        for k in outMeas.getElementsByClass(key.KeySignature):
+            out["key"] = {"fifths": k.sharps}
+            break
+        for t in outMeas.getElementsByClass(meter.TimeSignature):
+            out["time"] = {"count": t.numerator, "unit": t.denominator}
+            break
+
+        tempos = []
+        for mark in outMeas.getElementsByClass(tempo.MetronomeMark):
+            if mark.number is None:
+                continue
+            position = Fraction(outMeas.elementOffset(mark)) / 4
+            tempos.append(
+                {
+                    "bpm": round(mark.number),
+                    "value": self.writeNoteValue(mark.referent),
+                    "location": f"{m + 1}:{position.numerator}/{position.denominator}",
+                }
+            )
+        if tempos:
+            out["tempos"] = tempos
+
+        if isinstance(outMeas.leftBarline, bar.Repeat):
+            out["repeatStart"] = {}
+        right = outMeas.rightBarline
+        if isinstance(right, bar.Repeat):
+            out["repeatEnd"] = {} if right.times is None else {"times": right.times}
+        elif isinstance(right, bar.Barline):
+            out["barline"] = {"type": barlineTypes.get(right.type, right.type)}
+
+        for candidate in sameIndex:
+            bracket = self.endings.get(id(candidate))
+            if bracket is not None:
+                out["ending"] = {
+                    "duration": len(bracket.getSpannedElements()),
+                    "numbers": bracket.getNumberList(),
+                }
+                break
+        return out
+
+    def writeParts(self) -> Iterator[Tuple[dict, Iterator[dict]]]:
+        for part, measures in zip(self.parts, self.measures):
+            fields = {}
+            ident = self.take(part, "part")
+            if ident is not None:
+                fields["id"] = ident
+            if part.partName is not None:
+                fields["name"] = part.partName
+            if part.partAbbreviation is not None:
+                fields["shortName"] = part.partAbbreviation
+            yield fields, self.writeMeasures(measures)
+
+    def writeMeasures(self, measures: list[stream.Measure]) -> Iterator[dict]:
+        # The events of every measure, by sequence, with their offsets.
+        # Ties and beams look ahead into the following measures.
+        sequences = [self.sequences(outMeas) for outMeas in measures]
+        for m, outMeas in enumerate(measures):
+            yield self.writeMeasure(sequences, m, outMeas)
+
+    def sequences(
+        self, outMeas: stream.Measure
+    ) -> list[list[Tuple[float, note.GeneralNote]]]:
+        # Events directly in the measure make up a sequence of their own,
+        # and so does each voice.
+        # Measure.elements is much faster than music21's stream iterators.
+        found: list[list[Tuple[float, note.GeneralNote]]] = [[]]
+        for e in outMeas.elements:
+            if isinstance(e, stream.Voice):
+                found.append(
+                    [
+                        (e.elementOffset(n), n)
+                        for n in e.elements
+                        if id(n) in self.events
+                    ]
+                )
+            elif id(e) in self.events:
+                found[0].append((outMeas.elementOffset(e), e))
+        if not found[0] and len(found) > 1:
+            del found[0]
+        return found
+
+    def writeMeasure(
+        self,
+        sequences: list[list[list[Tuple[float, note.GeneralNote]]]],
+        m: int,
+        outMeas: stream.Measure,
+    ) -> dict:
+        out: dict = {}
+
+        # Beams come first, so that the events they refer to get their ids
+        # before they are written.
+        beams = []
+        for s, events in enumerate(sequences[m]):
+            for i, (_, n) in enumerate(events):
+                if not isinstance(n, note.NotRest) or 1 not in n.beams.getNumbers():
+                    continue
+                if n.beams.getByNumber(1).type == "start" and id(n) not in self.beamed:
+                    group = self.beamGroup(sequences, (m, s, i))
+                    if len(group) > 1:
+                        beams.append(self.writeBeam(group, 1))
+        if beams:
+            out["beams"] = beams
+
+        clefs = []
+        for outClef in outMeas.getElementsByClass(clef.Clef):
+            inClef = self.writeClef(outClef, outMeas.elementOffset(outClef))
+            if inClef is not None:
+                clefs.append(inClef)
+        if clefs:
+            out["clefs"] = clefs
+
+        out["sequences"] = [
+            {"content": self.writeSequence(sequences, (m, s, 0))}
+            for s in range(len(sequences[m]))
+        ]
+        return out
+
+    def writeSequence(
+        self,
+        sequences: list[list[list[Tuple[float, note.GeneralNote]]]],
+        position: Position,
+    ) -> list[dict]:
+        m, s, _ = position
+        content = []
+        offset = 0.0
+        for i, (start, n) in enumerate(sequences[m][s]):
+            if start < offset:
+                raise ValueError(
+                    f"Notes that overlap in measure {m + 1} need to be in separate voices."
+                )
+            if start > offset:
+                content.append(self.writeSpace(start - offset))
+            content.append(self.writeEvent(sequences, (m, s, i), n))
+            offset = start + n.duration.quarterLength
+        return content
+
+    def writeSpace(self, length: float) -> dict:
+        # The largest note value that the gap is a whole multiple of.
+        length = Fraction(length)
+        for base in mnx.tables.durationTypes:
+            template = convert.getDurationTemplate(base, 0)
+            multiple = length / Fraction(template.quarterLength)
+            if multiple.denominator == 1:
+                return {
+                    "type": "space",
+                    "duration": {"multiple": int(multiple), "duration": {"base": base}},
+                }
+        raise ValueError(f"A gap of {length} quarter notes cannot be written as MNX.")
+
+    def writeEvent(
+        self,
+        sequences: list[list[list[Tuple[float, note.GeneralNote]]]],
+        position: Position,
+        n: note.GeneralNote,
+    ) -> dict:
+        out: dict = {"type": "event"}
+        self.beamed.discard(id(n))
+        ident = self.take(n, "event")
+        if ident is not None:
+            out["id"] = ident
+        out["duration"] = self.writeNoteValue(n.duration)
+
+        if isinstance(n, note.Rest):
+            out["rest"] = {}
+        elif isinstance(n, chord.Chord):
+            out["notes"] = [
+                self.writeNote(sequences, position, inner, True) for inner in n.notes
+            ]
+        elif isinstance(n, note.Note):
+            out["notes"] = [self.writeNote(sequences, position, n, False)]
+        else:
+            raise ValueError(f"{type(n).__name__} cannot be written as MNX.")
+
+        markings = self.writeMarkings(n)
+        if markings:
+            out["markings"] = markings
+
+        if isinstance(n, note.NotRest) and n.stemDirection in ("up", "down"):
+            out["stemDirection"] = n.stemDirection
+
+        slurs = []
+        for sp in self.slurs.get(id(n), ()):
+            outSlur = {"target": self.reference(sp.getLast(), "event")}
+            if sp.lineType is not None:
+                outSlur["lineType"] = sp.lineType
+            if sp.placement in mnx.tables.slurSides:
+                outSlur["side"] = mnx.tables.slurSides[sp.placement]
+            slurs.append(outSlur)
+        if slurs:
+            out["slurs"] = slurs
+        return out
+
+    def writeNote(
+        self,
+        sequences: list[list[list[Tuple[float, note.GeneralNote]]]],
+        position: Position,
+        n: note.Note,
+        inChord: bool,
+    ) -> dict:
+        p = n.pitch
+        outPitch: dict = {"step": p.step, "octave": p.implicitOctave}
+        acc = p.accidental
+        if acc is not None:
+            if acc.alter % 1:
+                raise ValueError(f"{p.nameWithOctave} cannot be written as MNX.")
+            outPitch["alter"] = int(acc.alter)
+
+        out: dict = {}
+        ident = self.take(n, "note", inChord)
+        if ident is not None:
+            out["id"] = ident
+        out["pitch"] = outPitch
+        if acc is not None and acc.displayType == "always":
+            out["accidentalDisplay"] = {"show": True}
+
+        if n.tie is not None and n.tie.type in ("start", "continue"):
+            target = self.tieTarget(sequences, position, n)
+            if target is None:
+                log.warning(f"A tie from {p.nameWithOctave} to nowhere is omitted.")
+            else:
+                out["tie"] = {"target": target}
+        return out
+
+    def tieTarget(
+        self,
+        sequences: list[list[list[Tuple[float, note.GeneralNote]]]],
+        position: Position,
+        n: note.Note,
+    ) -> Optional[str]:
+        # The next note of the same pitch, further on in the same sequence,
+        # or else in the next measure (in the same sequence first).
+        m, s, i = position
+        candidates = [e for _, e in sequences[m][s][i + 1 :]]
+        if m + 1 < len(sequences):
+            following = sequences[m + 1]
+            order = sorted(range(len(following)), key=lambda t: t != s)
+            candidates += [e for t in order for _, e in following[t]]
+        for e in candidates:
+            if isinstance(e, chord.Chord):
+                for inner in e.notes:
+                    if inner.pitch.ps == n.pitch.ps:
+                        return self.reference(inner, "note", True)
+            elif isinstance(e, note.Note) and e.pitch.ps == n.pitch.ps:
+                return self.reference(e, "note", False)
+        return None
+
+    def beamGroup(
+        self,
+        sequences: list[list[list[Tuple[float, note.GeneralNote]]]],
+        position: Position,
+    ) -> list[note.NotRest]:
+        # The events of the primary beam that starts at position, which may
+        # carry on into the same sequence of the following measures.
+        # Another start before the stop is taken as part of the same beam.
+        m, s, i = position
+        group: list[note.NotRest] = []
+        while m < len(sequences) and s < len(sequences[m]):
+            for _, e in sequences[m][s][i:]:
+                if not isinstance(e, note.NotRest):
+                    continue
+                if 1 not in e.beams.getNumbers():
+                    return group
+                group.append(e)
+                self.beamed.add(id(e))
+                if e.beams.getByNumber(1).type == "stop":
+                    return group
+            m, i = m + 1, 0
+        return group
+
+    def writeBeam(self, group: list[note.NotRest], level: int) -> dict:
+        out: dict = {"events": [self.reference(e, "event") for e in group]}
+        inner = []
+        hooks = []
+        current: Optional[list[note.NotRest]] = None
+        for e in group:
+            b = (
+                e.beams.getByNumber(level + 1)
+                if level + 1 in e.beams.getNumbers()
+                else None
+            )
+            if b is not None and b.type == "partial":
+                hooks.append(
+                    {
+                        "direction": b.direction or "right",
+                        "event": self.reference(e, "event"),
+                    }
+                )
+                continue
+            if b is None or b.type == "start":
+                if current:
+                    inner.append(self.writeBeam(current, level + 1))
+                current = None if b is None else [e]
+            elif current is not None:
+                current.append(e)
+                if b.type == "stop":
+                    inner.append(self.writeBeam(current, level + 1))
+                    current = None
+        if current:
+            inner.append(self.writeBeam(current, level + 1))
+
+        # MNXConverter only reads one or the other.
+        if inner:
+            out["inner"] = inner
+            if hooks:
+                log.warning("Beam hooks next to inner beams are omitted.")
+        elif hooks:
+            out["hooks"] = hooks
+        return out
+
+    def writeClef(self, outClef: clef.Clef, offset: float) -> Optional[dict]:
+        if outClef.sign not in ("C", "F", "G") or outClef.line is None:
+            log.warning(f"{type(outClef).__name__} is omitted.")
+            return None
+        # The reverse of MNXConverter.parseClef.
+        inClef: dict = {"sign": outClef.sign, "staffPosition": (outClef.line - 3) * 2}
+        if outClef.octaveChange:
+            inClef["octave"] = outClef.octaveChange
+        out: dict = {"clef": inClef}
+        if offset:
+            fraction = Fraction(offset)
+            out["position"] = {"fraction": [fraction.numerator, fraction.denominator]}
+        return out
+
+    def writeNoteValue(self, d: duration.Duration) -> dict:
+        base = mnx.tables.noteValueBases.get(d.type)
+        if base is None or d.tuplets or not d.linked:
+            raise ValueError(
+                f"A duration of {d.quarterLength} quarter notes "
+                "cannot be written as a single MNX note value."
+            )
+        out: dict = {"base": base}
+        if d.dots:
+            out["dots"] = d.dots
+        return out
+
+    def writeMarkings(self, n: note.GeneralNote) -> dict:
+        out: dict = {}
+        for a in n.articulations:
+            name = mnx.tables.markingNames.get(type(a))
+            if name is not None:
+                out[name] = {}
+            elif isinstance(a, articulations.BreathMark):
+                out["breath"] = {} if a.symbol is None else {"symbol": a.symbol}
+        for e in n.expressions:
+            if isinstance(e, expressions.Tremolo):
+                out["tremolo"] = {"marks": e.numberOfMarks}
+        return out
+
+
+def writeScore(obj: stream.Stream, f: TextIO) -> None:
+    MNXWriter(obj).write(f)
+
+
+def toJson(obj: stream.Stream) -> str:
+    f = io.StringIO()
+    writeScore(obj, f)
+    return f.getvalue()
@@ -0,0 +1,75 @@
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable
+import functools
+import json
+import time
+
+# Call counts and timings for the methods of a converter, see
+# MNXConverter.enableProfiling. Only the methods that are wrapped pay for it.
+
+
+@dataclass
+class ProfileEntry:
+    calls: int = 0
+    # Time spent in the method, including everything it calls.
+    # Recursive calls are only counted once, like cProfile's cumtime.
+    seconds: float = 0.0
+    # Time spent in the method, minus the profiled methods it calls.
+    selfSeconds: float = 0.0
+
+
+@dataclass
+class ConversionProfile:
+    entries: dict[str, ProfileEntry] = field(default_factory=dict)
+    # Time already spent by the profiled methods currently running.
+    stack: list[float] = field(default_factory=list, repr=False)
+
+    def wrap(self, name: str, method: Callable) -> Callable:
+        entry = self.entries.setdefault(name, ProfileEntry())
+        stack = self.stack
+        perfCounter = time.perf_counter
+        depth = 0
+
+        @functools.wraps(method)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            nonlocal depth
+            entry.calls += 1
+            depth += 1
+            stack.append(0.0)
+            start = perfCounter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perfCounter() - start
+                entry.selfSeconds += elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                depth -= 1
+                if depth == 0:
+                    entry.seconds += elapsed
+
+        return profiled
+
+    def reset(self) -> None:
+        for entry in self.entries.values():
+            entry.calls = 0
+            entry.seconds = entry.selfSeconds = 0.0
+
+    def toDict(self) -> dict:
+        return {name: asdict(entry) for name, entry in self.entries.items()}
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.toDict(), f, indent=2)
+
+    def format(self) -> str:
+        lines = [f"{'method':<16}{'calls':>10}{'total ms':>12}{'self ms':>12}"]
+        for name, entry in self.entries.items():
+            lines.append(
+                f"{name:<16}{entry.calls:>10}"
+                f"{entry.seconds * 1000:>12.2f}{entry.selfSeconds * 1000:>12.2f}"
+            )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.format()
@@ -0,0 +1,257 @@
+from typing import Iterator, Optional, Union, cast
+import ast
+import contextlib
+import functools
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import time
+
+from music21 import converter, stream
+import music21
+import convert  # registers MNXConverter with music21
+from scorepickle import ScorePickler, gcPaused, restoreSites
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore
+
+# On-disk cache of converted scores, shared by any number of processes.
+#
+# Entries are keyed by a hash of the MNX document and of the converter itself,
+# and hold the pickled music21 score, so a hit skips decoding and conversion
+# altogether. music21's own freezeThaw takes longer to thaw a score than we take
+# to convert it, so the score is pickled as it is, without the elements' sites,
+# and restoreSites fixes it up after loading.
+#
+# Each entry is written to a temporary file first and renamed into place, so
+# readers never see a partial entry. Reading an entry touches its modification
+# time, and once the cache grows past maxBytes the entries used least recently
+# are removed.
+
+
+# Bump whenever the way entries are written or read changes
+# in a way the hash of the sources below cannot tell.
+formatVersion = 1
+
+sourceDirectory = os.path.dirname(os.path.abspath(__file__))
+
+
+def sourceFile(name: str) -> Optional[str]:
+    # The file of a module of this directory, or None for any other module.
+    base = os.path.join(sourceDirectory, *name.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def localImports(name: str) -> dict[str, str]:
+    # The named module and every module of this directory it imports, directly
+    # or not, by name, with their files. Found from the sources rather than
+    # sys.modules, so that every process finds the same ones.
+    found: dict[str, str] = {}
+    stack = [name]
+    while stack:
+        name = stack.pop()
+        path = sourceFile(name)
+        if name in found or path is None:
+            continue
+        found[name] = path
+        package = name if path.endswith("__init__.py") else name.rpartition(".")[0]
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    parts = alias.name.split(".")
+                    stack += [".".join(parts[:i]) for i in range(1, len(parts) + 1)]
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module or ""
+                if node.level:
+                    base = package.split(".")[
+                        : len(package.split(".")) - node.level + 1
+                    ]
+                    module = ".".join(base + ([module] if module else []))
+                stack.append(module)
+                # from package import submodule
+                stack += [f"{module}.{alias.name}" for alias in node.names]
+    return found
+
+
+@functools.cache
+def converterVersion() -> str:
+    # Changes whenever the converter, anything of this directory it imports,
+    # the format of the entries or music21 does, which invalidates every entry.
+    h = hashlib.sha256(f"{formatVersion} {music21.__version__}".encode())
+    for name, path in sorted(localImports(convert.__name__).items()):
+        h.update(name.encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+class ScoreCache:
+    suffix = ".pickle"
+    # Eviction stops once the cache is this much below maxBytes,
+    # so that not every put has to evict again.
+    evictTo = 0.9
+    # Temporary files left behind by a crashed writer are removed after this long.
+    staleSeconds = 3600.0
+    # Holds a running estimate of the total size of the entries.
+    sizeFile = ".size"
+
+    def __init__(self, directory: str, maxBytes: int = 1 << 30):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, data: bytes) -> str:
+        h = hashlib.sha256(converterVersion().encode())
+        h.update(data)
+        return h.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str) -> Optional[stream.Score]:
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f, gcPaused():
+                sc = pickle.load(f)
+                restoreSites(sc)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Unreadable, e.g. written by another version of Python.
+            self.remove(path)
+            return None
+        # Mark the entry as recently used.
+        with contextlib.suppress(OSError):
+            os.utime(path)
+        return sc
+
+    def put(self, key: str, sc: stream.Score) -> None:
+        buf = io.BytesIO()
+        ScorePickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(sc)
+        data = buf.getvalue()
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path(key))
+        except BaseException:
+            self.remove(tmp)
+            raise
+        self.added(len(data))
+
+    def parse(self, source: Union[str, bytes]) -> stream.Score:
+        """
+        Same as converter.parse(source, format="mnx"), for a file path or an MNX document,
+        but looks in the cache first.
+        """
+        isPath = isinstance(source, str) and not source.lstrip().startswith("{")
+        if isPath:
+            with open(source, "rb") as f:
+                data = f.read()
+        elif isinstance(source, str):
+            data = source.encode()
+        else:
+            data = source
+
+        key = self.key(data)
+        sc = self.get(key)
+        if sc is not None:
+            self.hits += 1
+            return sc
+        self.misses += 1
+        if isPath:
+            sc = converter.parse(source, format="mnx", forceSource=True)
+        else:
+            sc = converter.parse(data.decode(), format="mnx")
+        sc = cast(stream.Score, sc)
+        self.put(key, sc)
+        return sc
+
+    def added(self, size: int) -> None:
+        # Only scans the directory once the estimate goes over maxBytes. Replaced and
+        # unreadable entries still count until then, so the estimate can only be too
+        # high, which at worst scans sooner.
+        with self.lock():
+            total = self.readSize()
+            if total is None or total + size > self.maxBytes:
+                self.scan()
+            else:
+                self.writeSize(total + size)
+
+    def evict(self) -> None:
+        with self.lock():
+            self.scan()
+
+    def scan(self) -> None:
+        # Removes the least recently used entries until the cache fits in maxBytes,
+        # and stores the size left. Only called with the lock held.
+        entries: list[tuple[float, int, str]] = []
+        total = 0
+        now = time.time()
+        for e in os.scandir(self.directory):
+            try:
+                st = e.stat()
+            except FileNotFoundError:
+                continue
+            if e.name.endswith(self.suffix):
+                entries.append((st.st_mtime, st.st_size, e.path))
+                total += st.st_size
+            elif e.name.endswith(".tmp") and now - st.st_mtime > self.staleSeconds:
+                self.remove(e.path)
+        if total > self.maxBytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.maxBytes * self.evictTo:
+                    break
+                self.remove(path)
+                total -= size
+        self.writeSize(total)
+
+    def readSize(self) -> Optional[int]:
+        try:
+            with open(os.path.join(self.directory, self.sizeFile)) as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            # Missing, or cut short by a crash.
+            return None
+
+    def writeSize(self, total: int) -> None:
+        with open(os.path.join(self.directory, self.sizeFile), "w") as f:
+            f.write(str(total))
+
+    def clear(self) -> None:
+        with self.lock():
+            for e in os.scandir(self.directory):
+                if e.name.endswith(self.suffix) or e.name.endswith(".tmp"):
+                    self.remove(e.path)
+            self.writeSize(0)
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        # Only one process evicts or updates the size at a time. Readers never need the lock:
+        # a file removed while being read stays readable until it is closed.
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, ".lock"), "w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def remove(path: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
@@ -0,0 +1,67 @@
+from typing import Iterator
+from music21 import sites, spanner, stream
+import contextlib
+import gc
+import pickle
+
+# Pickling of converted scores, for the on-disk cache (scorecache.py) and for
+# handing parts converted in worker processes back to the parent (convert.py).
+#
+# Pickle keeps the contents of every stream, but music21 only links elements back
+# to the streams they are in through weak references, which do not survive it.
+# ScorePickler leaves those links out altogether and restoreSites puts them back.
+
+
+class ScorePickler(pickle.Pickler):
+    # Sites only hold weak references, which do not survive pickling anyway.
+    # Leaving them out makes pickles smaller and faster to load.
+    def reducer_override(self, obj):
+        if type(obj) is sites.Sites:
+            return sites.Sites, ()
+        return NotImplemented
+
+
+def restoreSites(sc: stream.Stream) -> None:
+    """
+    Pickle keeps the contents of every stream, but not the links from elements back
+    to their streams (see ScorePickler), and streams look up their elements' offsets
+    by id(). Rebuilds both.
+    """
+    storages: list[stream.Stream] = []
+    # Streams are visited in document order, so that spanners are found
+    # in the order they were created.
+    todo = [sc]
+    while todo:
+        s = todo.pop()
+        s._offsetDict = {id(e): (offset, e) for offset, e in s._offsetDict.values()}
+        s._cache = {}
+        inner = []
+        for e in s._elements + s._endElements:
+            e.sites.clear()
+            e.sites.add(s)
+            e.activeSite = s
+            if e.isStream:
+                inner.append(e)
+            elif isinstance(e, spanner.Spanner):
+                storages.append(e.spannerStorage)
+        todo += reversed(inner)
+    # Spanned elements belong to the spanner's storage as well as to their measure.
+    for storage in storages:
+        storage._offsetDict = {
+            id(e): (offset, e) for offset, e in storage._offsetDict.values()
+        }
+        for e in storage._elements:
+            e.sites.add(storage)
+
+
+@contextlib.contextmanager
+def gcPaused() -> Iterator[None]:
+    # Loading creates a lot of objects, none of which is garbage yet. With the
+    # collector running it keeps scanning them, which triples the time taken.
+    wasEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if wasEnabled:
+            gc.enable()
@@ -0,0 +1,483 @@
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import json
+import logging
+import multiprocessing
+import errno
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+
+import batch
+
+log = logging.getLogger(__name__)
+
+# A long-running conversion service, for callers that cannot afford to import
+# music21 on every conversion.
+#
+# MNX documents are POSTed over HTTP, on a local TCP port or a Unix domain socket,
+# and converted in a pool of worker processes that imported music21 and converted
+# a small document when they started. At most jobs documents are converted at once
+# and at most queue more wait for a worker; anything beyond that is turned away
+# with 503 rather than piling up. Each request has a deadline, which the worker
+# enforces itself with a timer, so a conversion that runs over frees its worker
+# (or, failing that, ends it, and the pool is replaced).
+#
+#   POST /convert?format=musicxml|midi|pickle&parts=P1,2&measures=9-16&timeout=5
+#   GET  /health
+#   GET  /metrics
+#
+# This process itself never imports music21.
+
+contentTypes: dict[str, str] = {
+    "musicxml": "application/vnd.recordare.musicxml+xml",
+    "midi": "audio/midi",
+    "pickle": "application/octet-stream",
+}
+
+# Converted by every worker when it starts.
+warmUpDocument = {
+    "mnx": {"version": 1},
+    "global": {"measures": [{"time": {"count": 4, "unit": 4}}]},
+    "parts": [
+        {
+            "measures": [
+                {
+                    "clefs": [{"clef": {"sign": "G", "staffPosition": -2}}],
+                    "sequences": [
+                        {
+                            "content": [
+                                {
+                                    "type": "event",
+                                    "duration": {"base": "whole"},
+                                    "notes": [{"pitch": {"octave": 4, "step": "C"}}],
+                                }
+                            ]
+                        }
+                    ],
+                }
+            ]
+        }
+    ],
+}
+
+# How much longer than its deadline a conversion may run once told to stop,
+# before its worker exits.
+gracePeriod = 5.0
+
+
+class ConversionTimeout(BaseException):
+    # Not an Exception, so that the except Exception blocks in music21
+    # and the converter do not catch it.
+    pass
+
+
+def warmUp() -> None:
+    from music21 import converter
+    import convert  # registers MNXConverter with music21
+
+    sc = converter.parse(json.dumps(warmUpDocument), format="mnx")
+    for outputFormat in batch.outputExtensions:
+        batch.scoreBytes(sc, outputFormat)
+
+
+def ping() -> int:
+    return os.getpid()
+
+
+def onAlarm(signum: int, frame: Any) -> None:
+    # Should the conversion go on regardless, e.g. by catching everything,
+    # the worker exits at the end of the grace period. The service sees
+    # a broken pool and replaces it.
+    signal.signal(signal.SIGALRM, onGraceOver)
+    signal.setitimer(signal.ITIMER_REAL, gracePeriod)
+    raise ConversionTimeout()
+
+
+def onGraceOver(signum: int, frame: Any) -> None:
+    os._exit(1)
+
+
+def convertInWorker(
+    data: bytes, outputFormat: str, keywords: dict, submitted: float, deadline: float
+) -> tuple:
+    """
+    Converts an MNX document in a worker process, by the wall clock deadline.
+    Returns ("ok", output, queue seconds, conversion seconds),
+    ("timeout", message) or ("error", exception type, message).
+    """
+    from music21 import converter
+
+    start = time.time()
+    if start >= deadline:
+        return ("timeout", "The request timed out while waiting for a worker.")
+    # Tasks run in the worker's main thread, so the alarm interrupts the conversion.
+    signal.signal(signal.SIGALRM, onAlarm)
+    signal.setitimer(signal.ITIMER_REAL, deadline - start)
+    try:
+        sc = converter.parse(data.decode(), format="mnx", **keywords)
+        output = batch.scoreBytes(sc, outputFormat)
+    except ConversionTimeout:
+        return ("timeout", "The conversion did not finish in time.")
+    except Exception as ex:
+        return ("error", type(ex).__name__, str(ex))
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+    return ("ok", output, start - submitted, time.time() - start)
+
+
+@dataclass
+class ServiceMetrics:
+    requests: int = 0
+    converted: int = 0
+    failed: int = 0
+    timedOut: int = 0
+    # Turned away because jobs + queue requests were in flight already.
+    rejected: int = 0
+    inFlight: int = 0
+    # Of the requests that were converted.
+    queueSeconds: float = 0.0
+    conversionSeconds: float = 0.0
+    maxConversionSeconds: float = 0.0
+    inputBytes: int = 0
+    outputBytes: int = 0
+
+    def toDict(self) -> dict:
+        d = asdict(self)
+        d["meanConversionSeconds"] = (
+            self.conversionSeconds / self.converted if self.converted else 0.0
+        )
+        return d
+
+
+class ConversionService:
+    def __init__(
+        self,
+        jobs: int = 1,
+        queue: int = 16,
+        timeout: float = 30.0,
+        maxBytes: int = 64 << 20,
+    ):
+        self.jobs = jobs
+        self.queue = queue
+        self.timeout = timeout
+        self.maxBytes = maxBytes
+        self.metrics = ServiceMetrics()
+        self.started = time.time()
+        # Held by every request from admission until its response is ready.
+        self.slots = threading.BoundedSemaphore(jobs + queue)
+        self.lock = threading.Lock()
+        self.poolLock = threading.Lock()
+        self.restarts = 0
+        self.pool = self.startPool()
+
+    def startPool(self) -> ProcessPoolExecutor:
+        # The server runs a thread per connection, and forking a process with
+        # threads can leave it with locks that nobody will release.
+        pool = ProcessPoolExecutor(
+            self.jobs,
+            mp_context=multiprocessing.get_context("forkserver"),
+            initializer=warmUp,
+        )
+        # Start every worker now, rather than on the first requests.
+        for future in [pool.submit(ping) for _ in range(self.jobs)]:
+            future.result()
+        return pool
+
+    def restartPool(
+        self, old: ProcessPoolExecutor, reason: str, terminate: bool = False
+    ) -> None:
+        with self.poolLock:
+            if self.pool is not old:
+                # Another request did it already.
+                return
+            log.warning(f"{reason}, restarting the pool.")
+            if terminate:
+                # Workers still converting would otherwise keep running on their own.
+                for process in list((old._processes or {}).values()):
+                    process.terminate()
+            old.shutdown(wait=False, cancel_futures=True)
+            self.pool = self.startPool()
+            self.restarts += 1
+
+    def count(self, **changes: Union[int, float]) -> None:
+        with self.lock:
+            for name, change in changes.items():
+                setattr(self.metrics, name, getattr(self.metrics, name) + change)
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "pid": os.getpid(),
+            "jobs": self.jobs,
+            "queue": self.queue,
+            "inFlight": self.metrics.inFlight,
+            "restarts": self.restarts,
+            "uptimeSeconds": time.time() - self.started,
+        }
+
+    def convert(
+        self,
+        data: bytes,
+        outputFormat: str,
+        keywords: dict,
+        timeout: float,
+    ) -> Tuple[int, Union[bytes, dict]]:
+        # Returns an HTTP status, with the output or a JSON error.
+        self.count(requests=1, inputBytes=len(data))
+        if not self.slots.acquire(blocking=False):
+            self.count(rejected=1)
+            return 503, {"error": "Busy", "message": "Too many requests queued."}
+        self.count(inFlight=1)
+        try:
+            submitted = time.time()
+            pool = self.pool
+            try:
+                future = pool.submit(
+                    convertInWorker,
+                    data,
+                    outputFormat,
+                    keywords,
+                    submitted,
+                    submitted + timeout,
+                )
+                # By then the worker has either answered or exited,
+                # unless it is stuck where no signal gets through.
+                result = future.result(timeout=timeout + 2 * gracePeriod)
+            except FutureTimeout:
+                if not future.cancel():
+                    self.restartPool(pool, "A worker did not stop", terminate=True)
+                result = ("timeout", "The worker did not respond in time.")
+            except BrokenProcessPool:
+                self.restartPool(pool, "A worker died")
+                self.count(failed=1)
+                return 500, {"error": "WorkerDied", "message": "Please try again."}
+        finally:
+            self.count(inFlight=-1)
+            self.slots.release()
+
+        if result[0] == "timeout":
+            self.count(timedOut=1)
+            return 504, {"error": "Timeout", "message": result[1]}
+        if result[0] == "error":
+            self.count(failed=1)
+            return 422, {"error": result[1], "message": result[2]}
+        _, output, queueSeconds, seconds = result
+        with self.lock:
+            m = self.metrics
+            m.converted += 1
+            m.queueSeconds += queueSeconds
+            m.conversionSeconds += seconds
+            m.maxConversionSeconds = max(m.maxConversionSeconds, seconds)
+            m.outputBytes += len(output)
+        return 200, output
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def parseOptions(query: dict[str, list[str]], maxTimeout: float) -> tuple:
+    # Returns (format, converter keywords, timeout) for the query of a /convert request.
+    def get(name: str) -> Optional[str]:
+        values = query.get(name)
+        return values[-1] if values else None
+
+    outputFormat = get("format") or "musicxml"
+    if outputFormat not in batch.outputExtensions:
+        raise ValueError(f"Unknown format {outputFormat!r}.")
+    keywords: dict = {}
+    parts = get("parts")
+    if parts is not None:
+        keywords["parts"] = [int(p) if p.isdigit() else p for p in parts.split(",")]
+    measures = get("measures")
+    if measures is not None:
+        first, _, last = measures.partition("-")
+        keywords["measures"] = (int(first), int(last or first))
+    timeout = maxTimeout
+    value = get("timeout")
+    if value is not None:
+        timeout = float(value)
+        if not timeout > 0:
+            raise ValueError("The timeout must be positive.")
+        timeout = min(timeout, maxTimeout)
+    return outputFormat, keywords, timeout
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    server_version = "mnx-convert"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> ConversionService:
+        return self.server.service  # type: ignore
+
+    def address_string(self) -> str:
+        # Unix domain sockets have no client address.
+        return self.client_address[0] if self.client_address else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        log.info(f"{self.address_string()} {format % args}")
+
+    def send(self, status: int, body: Union[bytes, dict], contentType: str) -> None:
+        if isinstance(body, dict):
+            body = json.dumps(body).encode()
+            contentType = "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self.send(200, self.service.health(), "")
+        elif path == "/metrics":
+            self.send(200, self.service.metrics.toDict(), "")
+        else:
+            self.send(404, {"error": "NotFound", "message": path}, "")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/convert":
+            self.send(404, {"error": "NotFound", "message": url.path}, "")
+            return
+        length = self.headers.get("Content-Length")
+        if length is None:
+            self.close_connection = True
+            self.send(411, {"error": "LengthRequired", "message": ""}, "")
+            return
+        length = length.strip()
+        if not (length.isascii() and length.isdigit()):
+            # Without a length, there is no telling where the body ends.
+            self.close_connection = True
+            message = f"Invalid Content-Length {length!r}."
+            self.send(400, {"error": "BadRequest", "message": message}, "")
+            return
+        if int(length) > self.service.maxBytes:
+            # The body is not read, so the connection cannot be reused.
+            self.close_connection = True
+            message = f"Documents are limited to {self.service.maxBytes} bytes."
+            self.send(413, {"error": "TooLarge", "message": message}, "")
+            return
+        data = self.rfile.read(int(length))
+        try:
+            outputFormat, keywords, timeout = parseOptions(
+                parse_qs(url.query), self.service.timeout
+            )
+        except ValueError as ex:
+            self.send(400, {"error": "BadRequest", "message": str(ex)}, "")
+            return
+        status, body = self.service.convert(data, outputFormat, keywords, timeout)
+        self.send(status, body, contentTypes[outputFormat])
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def removeStaleSocket(path: str) -> None:
+    # Removes a socket left behind by a server that did not shut down cleanly.
+    # Anything else at that path, including a live server's socket, is left alone.
+    if not stat.S_ISSOCK(os.lstat(path).st_mode):
+        raise FileExistsError(errno.EEXIST, "Not a socket", path)
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except ConnectionRefusedError:
+        os.remove(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(errno.EADDRINUSE, "Another server is listening on", path)
+
+
+def makeServer(
+    service: ConversionService,
+    socketPath: Optional[str] = None,
+    host: str = "127.0.0.1",
+    port: int = 8421,
+) -> socketserver.BaseServer:
+    server: socketserver.BaseServer
+    if socketPath is not None:
+        if os.path.lexists(socketPath):
+            removeStaleSocket(socketPath)
+        server = UnixHTTPServer(socketPath, RequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), RequestHandler)
+        server.daemon_threads = True
+    server.service = service  # type: ignore
+    return server
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve MNX conversions over HTTP from warm worker processes."
+    )
+    parser.add_argument("--socket", default=None, help="listen on this Unix socket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--port", type=int, default=8421, help="TCP port, 0 for any free one"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes"
+    )
+    parser.add_argument(
+        "--queue", type=int, default=16, help="requests that may wait for a worker"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="longest a request may take, in s"
+    )
+    parser.add_argument(
+        "--max-size", type=int, default=64, help="largest document accepted, in MB"
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not log requests"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(asctime)s %(message)s",
+    )
+
+    service = ConversionService(
+        args.jobs, args.queue, args.timeout, args.max_size << 20
+    )
+    try:
+        server = makeServer(service, args.socket, args.host, args.port)
+    except OSError as ex:
+        service.close()
+        parser.error(str(ex))
+    address = args.socket or "http://%s:%d" % server.server_address[:2]  # type: ignore
+    print(f"Serving on {address} with {args.jobs} workers", file=sys.stderr, flush=True)
+
+    def stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.socket is not None and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import batch
+import os
+import shutil
+import tempfile
+
+# Files of the same name in sibling directories must each get their own output,
+# and inputs that would still be written to the same file are refused up front.
+
+example_path = "../examples/example_hello_world.json"
+
+with tempfile.TemporaryDirectory() as tmp:
+    inputDir = os.path.join(tmp, "in")
+    for sub in ("a", "b"):
+        os.makedirs(os.path.join(inputDir, sub))
+        shutil.copy(example_path, os.path.join(inputDir, sub, "x.json"))
+
+    outputDir = os.path.join(tmp, "out")
+    report = batch.convertAll([inputDir], jobs=2, outputDir=outputDir)
+    assert not report.failures, report.toDict()
+    outputs = sorted(r.outputPath for r in report.results)
+    assert outputs == [
+        os.path.join(outputDir, "a", "x.musicxml"),
+        os.path.join(outputDir, "b", "x.musicxml"),
+    ], outputs
+    for path in outputs:
+        assert os.path.getsize(path) > 0, path
+
+    sameNames = [os.path.join(inputDir, sub, "x.json") for sub in ("a", "b")]
+    otherDir = os.path.join(tmp, "other")
+    try:
+        batch.convertAll(sameNames, jobs=1, outputDir=otherDir)
+    except ValueError as ex:
+        print(f"Refused as expected: {ex}")
+    else:
+        raise AssertionError("Two inputs were written to the same output file.")
+    assert not os.path.exists(otherDir), "Nothing should be written when refused."
+
+print("OK")
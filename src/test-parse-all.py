@@ -1,4 +1,5 @@
 import mnx
+import mnx.encoders
 import json
 import os
 import sys
@@ -15,7 +16,7 @@ for filename in filenames:
         out = mnx.Top.from_json(inp)
         outfilepath = os.path.join(output_path, filename)
         with open(outfilepath, "w") as f:
-            f.write(out.to_json(indent=2))
+            mnx.encoders.writeTop(out, f)
     except BaseException as ex:
         print(f"Error parsing file {infilepath}", file=sys.stderr)
         print(ex, file=sys.stderr)
@@ -0,0 +1,212 @@
+from collections import OrderedDict
+from dataclasses import FrozenInstanceError
+from typing import Any, Optional, Union
+import dataclasses
+import gc
+import hashlib
+import sys
+import threading
+
+import mnx
+import mnx.decoders
+
+# In-memory cache of decoded MNX documents, shared by everything in the process
+# that needs an mnx.Top: MNXConverter.parseData (with cacheDecoded=True, it is
+# not used otherwise) and the metadata helpers.
+#
+# Entries are keyed by a hash of the document, so the same text decoded twice
+# is only decoded once, wherever it comes from. Once the entries take more than
+# maxBytes, the ones used least recently are dropped.
+#
+# Every caller gets the same objects, so the cached trees are frozen: each
+# object's class is swapped for a subclass that refuses assignments, and lists
+# become tuples. Reading a frozen tree costs exactly as much as reading a normal
+# one, and isinstance still works. Callers that want to change the tree ask for
+# their own copy with thaw (or TopCache.decode(..., writable=True)).
+
+frozenClasses: dict[type, type] = {}
+frozenTypes: set[type] = set()
+
+
+def refuseAssignment(self, name: str, value: Any) -> None:
+    raise FrozenInstanceError(
+        f"cannot assign to field {name!r} of a cached {type(self).__name__}, "
+        "use topcache.thaw to get a copy that can be changed"
+    )
+
+
+def refuseDeletion(self, name: str) -> None:
+    raise FrozenInstanceError(
+        f"cannot delete field {name!r} of a cached {type(self).__name__}"
+    )
+
+
+def frozenClass(cls: type) -> type:
+    if cls not in frozenClasses:
+        # No new slots, so that existing objects can be switched to it.
+        frozen = type(
+            "Frozen" + cls.__name__,
+            (cls,),
+            {
+                "__slots__": (),
+                "__module__": __name__,
+                "__setattr__": refuseAssignment,
+                "__delattr__": refuseDeletion,
+            },
+        )
+        frozen.thawed = cls  # type: ignore
+        frozenClasses[cls] = frozen
+        frozenTypes.add(frozen)
+    return frozenClasses[cls]
+
+
+def isFrozen(o: Any) -> bool:
+    return type(o) in frozenTypes
+
+
+# Field names of every dataclass seen by freeze and thaw.
+fieldNames: dict[type, tuple[str, ...]] = {}
+
+
+def getFieldNames(cls: type) -> tuple[str, ...]:
+    if cls not in fieldNames:
+        fieldNames[cls] = tuple(f.name for f in dataclasses.fields(cls))
+    return fieldNames[cls]
+
+
+def freeze(o: Any) -> tuple[Any, int]:
+    """
+    Freezes a decoded tree in place (lists are replaced by tuples, so the result
+    has to be used instead of o). Also returns an estimate of the bytes it takes.
+    """
+    cls = type(o)
+    if cls is list:
+        items = []
+        size = sys.getsizeof(o)
+        for e in o:
+            if type(e) in leafTypes:
+                size += leafSize(e)
+            else:
+                e, n = freeze(e)
+                size += n
+            items.append(e)
+        return tuple(items), size
+    names = fieldNames.get(cls)
+    if names is None:
+        if not dataclasses.is_dataclass(cls):
+            return o, leafSize(o)
+        names = getFieldNames(cls)
+    size = sys.getsizeof(o)
+    for name in names:
+        value = getattr(o, name)
+        # Most fields are unset, or plain values that need no freezing.
+        if value is None:
+            continue
+        if type(value) in leafTypes:
+            size += leafSize(value)
+        else:
+            value, n = freeze(value)
+            object.__setattr__(o, name, value)
+            size += n
+    if cls not in frozenTypes:
+        o.__class__ = frozenClass(cls)
+    return o, size
+
+
+leafTypes = {str, int, float, bool}
+
+
+def leafSize(o: Any) -> int:
+    # Small ints and the like are shared, strings usually are not.
+    return sys.getsizeof(o) if type(o) is str else 0
+
+
+def thaw(o: Any) -> Any:
+    # Returns a copy of a frozen tree made of the original classes and lists.
+    cls = type(o)
+    if cls is tuple or cls is list:
+        return [e if type(e) in leafTypes else thaw(e) for e in o]
+    names = fieldNames.get(cls)
+    if names is None:
+        if not dataclasses.is_dataclass(cls):
+            return o
+        names = getFieldNames(cls)
+    copy = object.__new__(getattr(cls, "thawed", cls))
+    for name in names:
+        value = getattr(o, name)
+        if value is not None and type(value) not in leafTypes:
+            value = thaw(value)
+        object.__setattr__(copy, name, value)
+    return copy
+
+
+class TopCache:
+    def __init__(self, maxBytes: int = 64 << 20):
+        self.maxBytes = maxBytes
+        self.totalBytes = 0
+        self.hits = 0
+        self.misses = 0
+        # key -> (top, bytes), least recently used first.
+        self.entries: OrderedDict[str, tuple[mnx.Top, int]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def key(self, data: Union[str, bytes]) -> str:
+        if isinstance(data, str):
+            data = data.encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, key: str) -> Optional[mnx.Top]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, top: mnx.Top) -> mnx.Top:
+        # Takes over top, which must not be used afterwards: use the frozen tree returned.
+        top, size = freeze(top)
+        with self.lock:
+            if key in self.entries or size > self.maxBytes:
+                return top
+            self.entries[key] = (top, size)
+            self.totalBytes += size
+            while self.totalBytes > self.maxBytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.totalBytes -= evicted
+        return top
+
+    def decode(self, data: Union[str, bytes], writable: bool = False) -> mnx.Top:
+        """
+        Same as mnx.decoders.topFromJson(data), but only decodes each document once.
+        The result is frozen, unless writable is set.
+        """
+        key = self.key(data)
+        top = self.get(key)
+        if top is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            # Decoding creates a lot of objects, none of which is garbage.
+            # With the collector running it keeps scanning them, which more than
+            # doubles the time taken on large documents.
+            gcWasEnabled = gc.isenabled()
+            gc.disable()
+            try:
+                top = self.put(key, mnx.decoders.topFromJson(data))
+            finally:
+                if gcWasEnabled:
+                    gc.enable()
+        return thaw(top) if writable else top
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.totalBytes = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+# The cache shared by the converter and the metadata helpers, 64 MB at most.
+topCache = TopCache()